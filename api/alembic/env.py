@@ -10,7 +10,9 @@ from alembic import context
 from app.core.config import settings
 from app.db.session import Base
 from app.models.activity import Activity, Category, Group  # noqa
+from app.models.insights import CategoryWeekMinutes, WeeklyComparisonSnapshot  # noqa
 from app.models.refresh_token import RefreshToken  # noqa
+from app.models.sync import SyncTombstone  # noqa
 from app.models.task import Task, TaskActivity, TaskList  # noqa
 from app.models.user import User  # noqa
 
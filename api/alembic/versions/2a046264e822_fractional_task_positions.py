@@ -0,0 +1,45 @@
+"""fractional task positions
+
+Revision ID: 2a046264e822
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2a046264e822"
+down_revision: str | Sequence[str] | None = "a1b2c3d4e5f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ("task_lists", "tasks"):
+        op.alter_column(
+            table,
+            "position",
+            existing_type=sa.Integer(),
+            type_=sa.Float(),
+            existing_nullable=False,
+            postgresql_using="position::double precision",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ("task_lists", "tasks"):
+        op.alter_column(
+            table,
+            "position",
+            existing_type=sa.Float(),
+            type_=sa.Integer(),
+            existing_nullable=False,
+            postgresql_using="round(position)::integer",
+        )
@@ -0,0 +1,133 @@
+"""stamp synced rows with change versions and record tombstones
+
+Revision ID: 8f2d6b1c4a93
+Revises: 3c9e1f7a5b20
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f2d6b1c4a93"
+down_revision: str | Sequence[str] | None = "3c9e1f7a5b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SYNCED_TABLES = (
+    "groups",
+    "categories",
+    "activities",
+    "task_lists",
+    "tasks",
+    "task_activities",
+)
+
+OWNER = """
+        IF TG_TABLE_NAME = 'task_activities' THEN
+            owner := COALESCE(
+                (SELECT user_id FROM tasks WHERE id = rec.task_id),
+                (SELECT user_id FROM activities WHERE id = rec.activity_id)
+            );
+        ELSE
+            owner := rec.user_id;
+        END IF;"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sync_tombstones",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity", sa.String(), nullable=False),
+        sa.Column("entity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("change_version", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_sync_tombstones_user_id_change_version",
+        "sync_tombstones",
+        ["user_id", "change_version"],
+        unique=False,
+    )
+    for table in SYNCED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "change_version", sa.BigInteger(), server_default="0", nullable=False
+            ),
+        )
+        if table != "task_activities":
+            op.create_index(
+                f"ix_{table}_user_id_change_version",
+                table,
+                ["user_id", "change_version"],
+                unique=False,
+            )
+
+    op.execute(f"""
+CREATE OR REPLACE FUNCTION stamp_change_version() RETURNS trigger AS $$
+    DECLARE
+        rec RECORD := NEW;
+        owner uuid;
+    BEGIN{OWNER}
+        NEW.change_version := COALESCE(
+            (SELECT change_version FROM users WHERE id = owner), 0
+        );
+        RETURN NEW;
+    END
+$$ LANGUAGE plpgsql
+""")
+    op.execute(f"""
+CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+    DECLARE
+        rec RECORD := OLD;
+        owner uuid;
+    BEGIN{OWNER}
+        INSERT INTO sync_tombstones (user_id, entity, entity_id, change_version)
+        SELECT id, TG_TABLE_NAME, OLD.id, change_version
+        FROM users WHERE id = owner;
+        RETURN OLD;
+    END
+$$ LANGUAGE plpgsql
+""")
+    for table in SYNCED_TABLES:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_stamp_change_version "
+            f"BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION stamp_change_version()"
+        )
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER {table}_record_sync_tombstone "
+            f"AFTER DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SYNCED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_record_sync_tombstone ON {table}")
+        op.execute(f"DROP TRIGGER {table}_stamp_change_version ON {table}")
+        if table != "task_activities":
+            op.drop_index(f"ix_{table}_user_id_change_version", table_name=table)
+        op.drop_column(table, "change_version")
+    op.execute("DROP FUNCTION record_sync_tombstone()")
+    op.execute("DROP FUNCTION stamp_change_version()")
+    op.drop_index(
+        "ix_sync_tombstones_user_id_change_version", table_name="sync_tombstones"
+    )
+    op.drop_table("sync_tombstones")
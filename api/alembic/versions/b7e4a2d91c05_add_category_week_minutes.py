@@ -0,0 +1,97 @@
+"""add category_week_minutes rollup for goal history
+
+Revision ID: b7e4a2d91c05
+Revises: 8f2d6b1c4a93
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4a2d91c05"
+down_revision: str | Sequence[str] | None = "8f2d6b1c4a93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "category_week_minutes",
+        sa.Column("category_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("minutes", sa.Float(), nullable=False),
+        sa.Column("activities_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["category_id"], ["categories.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("category_id", "week_start"),
+    )
+    op.create_index(
+        "ix_category_week_minutes_user_id_week_start",
+        "category_week_minutes",
+        ["user_id", "week_start"],
+        unique=False,
+    )
+    op.execute("""
+CREATE OR REPLACE FUNCTION record_category_week_minutes() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_time IS NOT NULL THEN
+            UPDATE category_week_minutes
+            SET minutes = minutes
+                    - EXTRACT(epoch FROM OLD.end_time - OLD.start_time) / 60,
+                activities_count = activities_count - 1
+            WHERE category_id = OLD.category_id
+                AND week_start = date_trunc('week', OLD.date)::date;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.end_time IS NOT NULL THEN
+            INSERT INTO category_week_minutes
+                (category_id, week_start, user_id, minutes, activities_count)
+            VALUES (
+                NEW.category_id,
+                date_trunc('week', NEW.date)::date,
+                NEW.user_id,
+                EXTRACT(epoch FROM NEW.end_time - NEW.start_time) / 60,
+                1
+            )
+            ON CONFLICT (category_id, week_start) DO UPDATE
+            SET minutes = category_week_minutes.minutes + EXCLUDED.minutes,
+                activities_count = category_week_minutes.activities_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+$$ LANGUAGE plpgsql
+""")
+    # Lock out writers between the backfill and the trigger taking over.
+    op.execute("LOCK TABLE activities IN SHARE MODE")
+    op.execute("""
+INSERT INTO category_week_minutes
+    (category_id, week_start, user_id, minutes, activities_count)
+SELECT category_id, date_trunc('week', date)::date, user_id,
+    SUM(EXTRACT(epoch FROM end_time - start_time) / 60), COUNT(*)
+FROM activities
+WHERE end_time IS NOT NULL
+GROUP BY category_id, date_trunc('week', date)::date, user_id
+""")
+    op.execute(
+        "CREATE OR REPLACE TRIGGER activities_record_category_week_minutes "
+        "AFTER INSERT OR UPDATE OR DELETE ON activities "
+        "FOR EACH ROW EXECUTE FUNCTION record_category_week_minutes()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER activities_record_category_week_minutes ON activities")
+    op.execute("DROP FUNCTION record_category_week_minutes()")
+    op.drop_index(
+        "ix_category_week_minutes_user_id_week_start",
+        table_name="category_week_minutes",
+    )
+    op.drop_table("category_week_minutes")
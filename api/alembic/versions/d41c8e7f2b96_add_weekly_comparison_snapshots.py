@@ -0,0 +1,78 @@
+"""add weekly_comparison_snapshots for ended weeks
+
+Revision ID: d41c8e7f2b96
+Revises: b7e4a2d91c05
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41c8e7f2b96"
+down_revision: str | Sequence[str] | None = "b7e4a2d91c05"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "weekly_comparison_snapshots",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("week_start", sa.Date(), nullable=False),
+        sa.Column("format_version", sa.Integer(), nullable=False),
+        sa.Column("change_version", sa.BigInteger(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "week_start"),
+    )
+    op.execute("""
+CREATE OR REPLACE FUNCTION invalidate_weekly_comparison_snapshots()
+RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            DELETE FROM weekly_comparison_snapshots
+            WHERE user_id = OLD.user_id
+                AND week_start IN (
+                    date_trunc('week', OLD.date)::date,
+                    date_trunc('week', OLD.date)::date + 7
+                );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            DELETE FROM weekly_comparison_snapshots
+            WHERE user_id = NEW.user_id
+                AND week_start IN (
+                    date_trunc('week', NEW.date)::date,
+                    date_trunc('week', NEW.date)::date + 7
+                );
+        END IF;
+        RETURN NULL;
+    END
+$$ LANGUAGE plpgsql
+""")
+    op.execute(
+        "CREATE OR REPLACE TRIGGER activities_invalidate_weekly_comparison_snapshots "
+        "AFTER INSERT OR UPDATE OR DELETE ON activities "
+        "FOR EACH ROW EXECUTE FUNCTION invalidate_weekly_comparison_snapshots()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "DROP TRIGGER activities_invalidate_weekly_comparison_snapshots ON activities"
+    )
+    op.execute("DROP FUNCTION invalidate_weekly_comparison_snapshots()")
+    op.drop_table("weekly_comparison_snapshots")
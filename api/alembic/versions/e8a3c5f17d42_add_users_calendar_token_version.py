@@ -0,0 +1,34 @@
+"""add users.calendar_token_version to revoke calendar feed links
+
+Revision ID: e8a3c5f17d42
+Revises: d41c8e7f2b96
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a3c5f17d42"
+down_revision: str | Sequence[str] | None = "d41c8e7f2b96"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "calendar_token_version", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "calendar_token_version")
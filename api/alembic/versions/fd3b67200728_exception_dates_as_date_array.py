@@ -0,0 +1,117 @@
+"""store task exception_dates as date[] with a GIN index
+
+Revision ID: fd3b67200728
+Revises: 2a046264e822
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+import logging
+import uuid
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "fd3b67200728"
+down_revision: str | Sequence[str] | None = "2a046264e822"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 1000
+
+# ISO dates Postgres accepts; 2024-02-30 matches the pattern but is not a date.
+VALID_DATE = "value ~ '^\\d{4}-\\d{2}-\\d{2}$' AND pg_input_is_valid(value, 'date')"
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _copy_in_batches(statement: str) -> None:
+    """Run ``statement`` over keyset batches of task ids.
+
+    Bounds the size of each UPDATE so memory stays flat on large tables.
+    """
+    bind = op.get_bind()
+    last_id = uuid.UUID(int=0)
+    while True:
+        ids = (
+            bind.execute(
+                sa.text(
+                    "SELECT id FROM tasks "
+                    "WHERE exception_dates IS NOT NULL "
+                    "AND id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": BATCH_SIZE},
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+        bind.execute(
+            sa.text(statement).bindparams(
+                sa.bindparam("ids", type_=postgresql.ARRAY(postgresql.UUID))
+            ),
+            {"ids": ids},
+        )
+        last_id = ids[-1]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "tasks",
+        sa.Column("exception_dates_new", postgresql.ARRAY(sa.Date()), nullable=True),
+    )
+    # Entries that are not valid ISO dates were never honoured by the expansion
+    # and would abort the cast, so they are logged and dropped.
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT id, value FROM tasks, json_array_elements_text("
+            "  CASE WHEN json_typeof(exception_dates) = 'array'"
+            "  THEN exception_dates ELSE '[]'::json END"
+            ") AS value "
+            f"WHERE NOT ({VALID_DATE})"
+        )
+    )
+    for task_id, value in invalid:
+        logger.warning(f"Dropping invalid exception date {value!r} of task {task_id}")
+    _copy_in_batches(
+        "UPDATE tasks SET exception_dates_new = ARRAY("
+        "  SELECT DISTINCT value::date"
+        "  FROM json_array_elements_text(exception_dates) AS value"
+        f"  WHERE {VALID_DATE}"
+        "  ORDER BY 1"
+        ") "
+        "WHERE id = ANY(:ids) AND json_typeof(exception_dates) = 'array'"
+    )
+    op.drop_column("tasks", "exception_dates")
+    op.alter_column("tasks", "exception_dates_new", new_column_name="exception_dates")
+    op.create_index(
+        "ix_tasks_exception_dates",
+        "tasks",
+        ["exception_dates"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_tasks_exception_dates", table_name="tasks", postgresql_using="gin"
+    )
+    op.add_column("tasks", sa.Column("exception_dates_old", sa.JSON(), nullable=True))
+    _copy_in_batches(
+        "UPDATE tasks SET exception_dates_old = ("
+        "  SELECT COALESCE(json_agg(to_char(value, 'YYYY-MM-DD')), '[]'::json)"
+        "  FROM unnest(exception_dates) AS value"
+        ") "
+        "WHERE id = ANY(:ids)"
+    )
+    op.drop_column("tasks", "exception_dates")
+    op.alter_column("tasks", "exception_dates_old", new_column_name="exception_dates")
@@ -1,19 +1,27 @@
+import hashlib
+from datetime import date
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Header, Query, Response
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import get_db
-from app.exceptions import AuthenticationError
+from app.core.metrics import record_cache_lookup
+from app.core.tokens import decode_calendar_token
+from app.db.session import get_db, get_read_db
+from app.exceptions import AuthenticationError, NotModified
 from app.models.user import User
 from app.repositories.user_repository import UserRepository
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/login/google")
 
+# Bump when the body of an endpoint behind ``conditional_get`` changes shape so
+# existing ETags stop matching.
+RESPONSE_FORMAT_VERSION = "1"
+
 
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
@@ -29,7 +37,8 @@ async def get_current_user(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id_str: str | None = payload.get("sub")
-        if user_id_str is None:
+        if user_id_str is None or payload.get("scope") is not None:
+            # Scoped tokens (e.g. calendar feeds) never grant API access.
             raise credentials_exception
         user_id = UUID(user_id_str)
     except (JWTError, ValueError) as e:
@@ -40,3 +49,73 @@ async def get_current_user(
     if user is None:
         raise credentials_exception
     return user
+
+
+async def get_calendar_user_id(
+    token: Annotated[str, Query()],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> UUID:
+    """Resolve the owner of a calendar feed URL.
+
+    The token must carry the user's current calendar token version, so
+    rotating it revokes every link issued before. The version is read from the
+    primary: a lagging replica would reject a fresh link or accept a revoked
+    one.
+    """
+    credentials_exception = AuthenticationError(
+        code="AUTH_001",
+        message="Could not validate credentials",
+        detail="Invalid calendar feed token",
+    )
+    claims = decode_calendar_token(token)
+    if claims is None:
+        raise credentials_exception
+    user_id, version = claims
+    if await UserRepository(db).get_calendar_token_version(user_id) != version:
+        raise credentials_exception
+    return user_id
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison (RFC 9110 section 13.1.2).
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+async def conditional_get(
+    response: Response,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> None:
+    """Answer 304 when nothing the user owns changed since the client's ETag.
+
+    The ETag is derived from the user's change version, which every write
+    advances, so an unchanged version means an unchanged body and the endpoint
+    does not run. It also covers the current date because endpoints default
+    their date to today. A replica may lag behind the primary, so when the
+    data comes from the replica the version is read from there too.
+    """
+    version = current_user.change_version
+    if read_db is not db:
+        version = await UserRepository(read_db).get_change_version(current_user.id)
+
+    digest = hashlib.sha256(
+        f"{RESPONSE_FORMAT_VERSION}:{current_user.id}:{version}:{date.today()}".encode()
+    ).hexdigest()
+    headers = {
+        "ETag": f'W/"{digest[:32]}"',
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        record_cache_lookup("conditional_get", hit=True)
+        raise NotModified(headers)
+
+    record_cache_lookup("conditional_get", hit=False)
+    response.headers.update(headers)
@@ -1,6 +1,15 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import activity, auth, import_, insights, task, timer
+from app.api.v1.endpoints import (
+    activity,
+    auth,
+    bootstrap,
+    import_,
+    insights,
+    sync,
+    task,
+    timer,
+)
 
 api_router = APIRouter()
 api_router.include_router(auth.router, tags=["login"])
@@ -9,3 +18,5 @@ api_router.include_router(task.router, tags=["tasks"])
 api_router.include_router(import_.router, prefix="/import", tags=["import"])
 api_router.include_router(insights.router, prefix="/insights", tags=["insights"])
 api_router.include_router(timer.router, prefix="/timer", tags=["timer"])
+api_router.include_router(sync.router, tags=["sync"])
+api_router.include_router(bootstrap.router, tags=["bootstrap"])
@@ -7,8 +7,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import conditional_get, get_current_user
+from app.db.session import get_db, get_read_db
 from app.models.activity import Activity
 from app.models.task import Task, TaskActivity
 from app.models.user import User
@@ -33,9 +33,7 @@ from app.services.activity_service import ActivityService
 router = APIRouter()
 
 
-async def get_activity_service(
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> ActivityService:
+def _activity_service(db: AsyncSession) -> ActivityService:
     return ActivityService(
         group_repo=GroupRepository(db),
         category_repo=CategoryRepository(db),
@@ -43,6 +41,19 @@ async def get_activity_service(
     )
 
 
+async def get_activity_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> ActivityService:
+    return _activity_service(db)
+
+
+async def get_read_activity_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> ActivityService:
+    """For list endpoints that never write; may be served by the replica."""
+    return _activity_service(db)
+
+
 async def _enrich_with_task_info(
     activities: list[Activity], db: AsyncSession
 ) -> list[ActivityResponse]:
@@ -85,9 +96,13 @@ async def _enrich_with_task_info(
     return enriched
 
 
-@router.get("/groups", response_model=list[GroupResponse])
+@router.get(
+    "/groups",
+    response_model=list[GroupResponse],
+    dependencies=[Depends(conditional_get)],
+)
 async def list_groups(
-    service: Annotated[ActivityService, Depends(get_activity_service)],
+    service: Annotated[ActivityService, Depends(get_read_activity_service)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     return await service.get_groups(current_user.id)
@@ -132,9 +147,13 @@ async def delete_group(
     await service.delete_group(id, current_user.id)
 
 
-@router.get("/categories", response_model=list[CategoryResponse])
+@router.get(
+    "/categories",
+    response_model=list[CategoryResponse],
+    dependencies=[Depends(conditional_get)],
+)
 async def list_categories(
-    service: Annotated[ActivityService, Depends(get_activity_service)],
+    service: Annotated[ActivityService, Depends(get_read_activity_service)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     return await service.get_categories(current_user.id)
@@ -179,21 +198,29 @@ async def delete_category(
     await service.delete_category(id, current_user.id)
 
 
-@router.get("/activities", response_model=list[ActivityResponse])
+@router.get(
+    "/activities",
+    response_model=list[ActivityResponse],
+    dependencies=[Depends(conditional_get)],
+)
 async def list_activities(
-    service: Annotated[ActivityService, Depends(get_activity_service)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    service: Annotated[ActivityService, Depends(get_read_activity_service)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     activities = await service.get_activities(current_user.id)
     return await _enrich_with_task_info(activities, db)
 
 
-@router.get("/activities/date/{date}", response_model=list[ActivityResponse])
+@router.get(
+    "/activities/date/{date}",
+    response_model=list[ActivityResponse],
+    dependencies=[Depends(conditional_get)],
+)
 async def list_activities_by_date(
     date: date_type,
-    service: Annotated[ActivityService, Depends(get_activity_service)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    service: Annotated[ActivityService, Depends(get_read_activity_service)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     activities = await service.get_activities_by_date(current_user.id, date)
@@ -0,0 +1,164 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import date as date_type
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Query
+from loguru import logger
+from pydantic.alias_generators import to_camel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.deps import conditional_get, get_current_user
+from app.api.v1.endpoints.activity import (
+    get_read_activity_service,
+    list_activities_by_date,
+    list_categories,
+    list_groups,
+)
+from app.api.v1.endpoints.auth import MeResponse, get_me
+from app.api.v1.endpoints.insights import get_daily_comparison, get_insights_service
+from app.api.v1.endpoints.task import get_read_task_service, list_task_lists, list_tasks
+from app.api.v1.endpoints.timer import get_active_timer
+from app.core.config import settings
+from app.db.session import get_read_session_factory
+from app.exceptions import AppException, NotFoundError
+from app.models.user import User
+from app.schemas.activity import ActivityResponse, CategoryResponse, GroupResponse
+from app.schemas.base import CamelModel
+from app.schemas.insights import DailyComparisonResponse
+from app.schemas.task import TaskListResponse, TaskResponse
+
+router = APIRouter()
+
+
+class BootstrapSectionError(CamelModel):
+    code: str
+    message: str
+
+
+class BootstrapResponse(CamelModel):
+    me: MeResponse
+    groups: list[GroupResponse] | None
+    categories: list[CategoryResponse] | None
+    activities: list[ActivityResponse] | None
+    active_timer: ActivityResponse | None
+    task_lists: list[TaskListResponse] | None
+    tasks: list[TaskResponse] | None
+    daily_comparison: DailyComparisonResponse | None
+    errors: dict[str, BootstrapSectionError]
+
+
+Section = Callable[[AsyncSession, User, date_type], Awaitable[Any]]
+
+
+async def _groups(db: AsyncSession, user: User, today: date_type):
+    return await list_groups(await get_read_activity_service(db), user)
+
+
+async def _categories(db: AsyncSession, user: User, today: date_type):
+    return await list_categories(await get_read_activity_service(db), user)
+
+
+async def _activities(db: AsyncSession, user: User, today: date_type):
+    service = await get_read_activity_service(db)
+    return await list_activities_by_date(today, service, db, user)
+
+
+async def _active_timer(db: AsyncSession, user: User, today: date_type):
+    try:
+        return await get_active_timer(user, db)
+    except NotFoundError:
+        return None
+
+
+async def _task_lists(db: AsyncSession, user: User, today: date_type):
+    return await list_task_lists(await get_read_task_service(db), user)
+
+
+async def _tasks(db: AsyncSession, user: User, today: date_type):
+    return await list_tasks(await get_read_task_service(db), user)
+
+
+async def _daily_comparison(db: AsyncSession, user: User, today: date_type):
+    return await get_daily_comparison(await get_insights_service(db), user, today)
+
+
+# The reads the dashboard makes on first load, keyed by response field.
+SECTIONS: dict[str, Section] = {
+    "groups": _groups,
+    "categories": _categories,
+    "activities": _activities,
+    "active_timer": _active_timer,
+    "task_lists": _task_lists,
+    "tasks": _tasks,
+    "daily_comparison": _daily_comparison,
+}
+
+
+async def _run_section(
+    name: str,
+    section: Section,
+    session_factory: async_sessionmaker[AsyncSession],
+    limit: asyncio.Semaphore,
+    user: User,
+    today: date_type,
+    errors: dict[str, BootstrapSectionError],
+) -> Any:
+    """Run one section on its own session; a failure only empties that section."""
+    try:
+        async with limit, session_factory() as db:
+            return await section(db, user, today)
+    except AppException as exc:
+        logger.bind(section=name, error_code=exc.code).warning(
+            f"Bootstrap section failed\n"
+            f"  Section: {name}\n"
+            f"  Code: {exc.code}\n"
+            f"  Message: {exc.message}"
+        )
+        errors[name] = BootstrapSectionError(code=exc.code, message=exc.message)
+    except Exception as exc:
+        logger.bind(section=name, error_type=type(exc).__name__).exception(
+            f"Bootstrap section failed\n"
+            f"  Section: {name}\n"
+            f"  Error: {type(exc).__name__}: {exc}"
+        )
+        errors[name] = BootstrapSectionError(
+            code="SERVER_001", message="Internal server error"
+        )
+    return None
+
+
+@router.get(
+    "/bootstrap",
+    response_model=BootstrapResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def bootstrap(
+    current_user: Annotated[User, Depends(get_current_user)],
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_read_session_factory)
+    ],
+    date: Annotated[date_type | None, Query()] = None,
+):
+    """Everything the dashboard reads on first load, in one response.
+
+    Sections run concurrently, at most ``BOOTSTRAP_CONCURRENCY`` at a time, each
+    on its own session. A failing section is null and listed in ``errors``;
+    the rest of the payload is still returned.
+    """
+    today = date if date else date_type.today()
+    limit = asyncio.Semaphore(settings.BOOTSTRAP_CONCURRENCY)
+    errors: dict[str, BootstrapSectionError] = {}
+    results = await asyncio.gather(
+        *(
+            _run_section(
+                name, section, session_factory, limit, current_user, today, errors
+            )
+            for name, section in SECTIONS.items()
+        )
+    )
+    return {
+        "me": await get_me(current_user),
+        **dict(zip(SECTIONS, results, strict=True)),
+        "errors": {to_camel(name): error for name, error in errors.items()},
+    }
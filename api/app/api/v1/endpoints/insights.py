@@ -1,28 +1,55 @@
 from datetime import date as date_type
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import conditional_get, get_current_user
+from app.db.session import get_db, get_read_db
 from app.models.user import User
-from app.repositories.insights_repository import InsightsRepository
-from app.schemas.insights import DailyComparisonResponse, WeeklyComparisonResponse
+from app.repositories.insights_repository import Granularity, InsightsRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.weekly_snapshot_repository import WeeklySnapshotRepository
+from app.schemas.insights import (
+    CategoryInsightsResponse,
+    DailyComparisonResponse,
+    DurationStatsResponse,
+    GoalHistoryResponse,
+    HeatmapResponse,
+    RangeInsightsResponse,
+    TrendsResponse,
+    WeeklyComparisonResponse,
+)
 from app.services.insights_service import InsightsService
 
 router = APIRouter()
 
 
 async def get_insights_service(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ) -> InsightsService:
     return InsightsService(insights_repo=InsightsRepository(db))
 
 
-@router.get("/weekly-comparison", response_model=WeeklyComparisonResponse)
+async def get_weekly_insights_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    primary_db: Annotated[AsyncSession, Depends(get_db)],
+) -> InsightsService:
+    return InsightsService(
+        insights_repo=InsightsRepository(db),
+        snapshot_repo=WeeklySnapshotRepository(primary_db),
+        user_repo=UserRepository(db),
+    )
+
+
+@router.get(
+    "/weekly-comparison",
+    response_model=WeeklyComparisonResponse,
+    dependencies=[Depends(conditional_get)],
+)
 async def get_weekly_comparison(
-    service: Annotated[InsightsService, Depends(get_insights_service)],
+    service: Annotated[InsightsService, Depends(get_weekly_insights_service)],
     current_user: Annotated[User, Depends(get_current_user)],
     date: Annotated[date_type | None, Query()] = None,
 ):
@@ -31,7 +58,11 @@ async def get_weekly_comparison(
     return result
 
 
-@router.get("/daily-comparison", response_model=DailyComparisonResponse)
+@router.get(
+    "/daily-comparison",
+    response_model=DailyComparisonResponse,
+    dependencies=[Depends(conditional_get)],
+)
 async def get_daily_comparison(
     service: Annotated[InsightsService, Depends(get_insights_service)],
     current_user: Annotated[User, Depends(get_current_user)],
@@ -40,3 +71,99 @@ async def get_daily_comparison(
     target_date = date if date else date_type.today()
     result = await service.get_daily_comparison(current_user.id, target_date)
     return result
+
+
+@router.get(
+    "/range",
+    response_model=RangeInsightsResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_range_insights(
+    service: Annotated[InsightsService, Depends(get_insights_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    start: Annotated[date_type, Query(alias="from")],
+    end: Annotated[date_type, Query(alias="to")],
+    granularity: Annotated[Granularity, Query()] = "day",
+):
+    """Totals, breakdowns and a time series for any range, e.g. a whole year."""
+    return await service.get_range_insights(current_user.id, start, end, granularity)
+
+
+@router.get(
+    "/trends",
+    response_model=TrendsResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_trends(
+    service: Annotated[InsightsService, Depends(get_insights_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    weeks: Annotated[int, Query(ge=1, le=260)] = 12,
+    window: Annotated[int, Query(ge=1, le=52)] = 4,
+    date: Annotated[date_type | None, Query()] = None,
+):
+    """The last ``weeks`` weeks up to the week of ``date``, one point per week."""
+    target_date = date if date else date_type.today()
+    return await service.get_trends(current_user.id, target_date, weeks, window)
+
+
+@router.get(
+    "/heatmap",
+    response_model=HeatmapResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_heatmap(
+    service: Annotated[InsightsService, Depends(get_insights_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    start: Annotated[date_type, Query(alias="from")],
+    end: Annotated[date_type, Query(alias="to")],
+    bucket_minutes: Annotated[int, Query()] = 60,
+):
+    """Minutes per weekday and time of day, as a 7 x (1440 / bucket_minutes) grid."""
+    return await service.get_heatmap(current_user.id, start, end, bucket_minutes)
+
+
+@router.get(
+    "/goals",
+    response_model=GoalHistoryResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_goal_history(
+    service: Annotated[InsightsService, Depends(get_insights_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    weeks: Annotated[int, Query(ge=1, le=260)] = 12,
+    date: Annotated[date_type | None, Query()] = None,
+):
+    """Goal streaks and attainment over the last ``weeks`` weeks up to ``date``."""
+    target_date = date if date else date_type.today()
+    return await service.get_goal_history(current_user.id, target_date, weeks)
+
+
+@router.get(
+    "/durations",
+    response_model=DurationStatsResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_duration_stats(
+    service: Annotated[InsightsService, Depends(get_insights_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    start: Annotated[date_type, Query(alias="from")],
+    end: Annotated[date_type, Query(alias="to")],
+):
+    """Median, p90 and a histogram of activity durations over a range."""
+    return await service.get_duration_stats(current_user.id, start, end)
+
+
+@router.get(
+    "/categories/{id}",
+    response_model=CategoryInsightsResponse,
+    dependencies=[Depends(conditional_get)],
+)
+async def get_category_insights(
+    id: UUID,
+    service: Annotated[InsightsService, Depends(get_insights_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    start: Annotated[date_type, Query(alias="from")],
+    end: Annotated[date_type, Query(alias="to")],
+):
+    """One category over a range, for drilling down from the top categories."""
+    return await service.get_category_insights(current_user.id, id, start, end)
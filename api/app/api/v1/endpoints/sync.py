@@ -0,0 +1,32 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user
+from app.db.session import get_read_db
+from app.models.user import User
+from app.repositories.sync_repository import SyncRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+
+router = APIRouter()
+
+
+async def get_sync_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> SyncService:
+    return SyncService(sync_repo=SyncRepository(db), user_repo=UserRepository(db))
+
+
+@router.get("/sync", response_model=SyncResponse)
+async def sync_changes(
+    service: Annotated[SyncService, Depends(get_sync_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    since: Annotated[
+        int | None,
+        Query(ge=0, description="Cursor from the previous response; omit for all"),
+    ] = None,
+):
+    return await service.get_changes(current_user.id, since)
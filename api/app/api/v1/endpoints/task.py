@@ -1,11 +1,20 @@
+from datetime import date as date_type
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.db.session import get_db
+from app.api.deps import (
+    conditional_get,
+    etag_matches,
+    get_calendar_user_id,
+    get_current_user,
+)
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.core.tokens import create_calendar_token
+from app.db.session import get_db, get_read_db
 from app.models.user import User
 from app.repositories.activity_repository import (
     ActivityRepository,
@@ -17,8 +26,11 @@ from app.repositories.task_repository import (
     TaskListRepository,
     TaskRepository,
 )
+from app.repositories.user_repository import UserRepository
 from app.schemas.task import (
+    CalendarTokenResponse,
     ConvertToActivityRequest,
+    ReorderRequest,
     TaskActivityResponse,
     TaskCompleteRequest,
     TaskCreate,
@@ -29,6 +41,7 @@ from app.schemas.task import (
     TaskUpdate,
 )
 from app.services.activity_service import ActivityService
+from app.services.calendar_service import CalendarService
 from app.services.task_service import TaskService
 
 router = APIRouter()
@@ -40,9 +53,7 @@ def _to_task_response(task) -> TaskResponse:
     return task_response
 
 
-async def get_task_service(
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> TaskService:
+def _task_service(db: AsyncSession) -> TaskService:
     activity_service = ActivityService(
         group_repo=GroupRepository(db),
         category_repo=CategoryRepository(db),
@@ -56,9 +67,32 @@ async def get_task_service(
     )
 
 
-@router.get("/task-lists", response_model=list[TaskListResponse])
+async def get_task_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> TaskService:
+    return _task_service(db)
+
+
+async def get_read_task_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> TaskService:
+    """For list endpoints that never write; may be served by the replica."""
+    return _task_service(db)
+
+
+async def get_calendar_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> CalendarService:
+    return CalendarService(task_repo=TaskRepository(db))
+
+
+@router.get(
+    "/task-lists",
+    response_model=list[TaskListResponse],
+    dependencies=[Depends(conditional_get)],
+)
 async def list_task_lists(
-    service: Annotated[TaskService, Depends(get_task_service)],
+    service: Annotated[TaskService, Depends(get_read_task_service)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     return await service.get_task_lists(current_user.id)
@@ -75,6 +109,15 @@ async def create_task_list(
     return await service.create_task_list(data, current_user.id)
 
 
+@router.post("/task-lists/reorder", status_code=status.HTTP_204_NO_CONTENT)
+async def reorder_task_lists(
+    data: ReorderRequest,
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+):
+    await service.reorder_task_lists(data, current_user.id)
+
+
 @router.put("/task-lists/{id}", response_model=TaskListResponse)
 async def update_task_list(
     id: UUID,
@@ -94,9 +137,11 @@ async def delete_task_list(
     await service.delete_task_list(id, current_user.id)
 
 
-@router.get("/tasks", response_model=list[TaskResponse])
+@router.get(
+    "/tasks", response_model=list[TaskResponse], dependencies=[Depends(conditional_get)]
+)
 async def list_tasks(
-    service: Annotated[TaskService, Depends(get_task_service)],
+    service: Annotated[TaskService, Depends(get_read_task_service)],
     current_user: Annotated[User, Depends(get_current_user)],
     list_id: UUID | None = None,
     status: str | None = None,
@@ -115,6 +160,70 @@ async def create_task(
     return _to_task_response(task)
 
 
+@router.post("/tasks/reorder", status_code=status.HTTP_204_NO_CONTENT)
+async def reorder_tasks(
+    data: ReorderRequest,
+    service: Annotated[TaskService, Depends(get_task_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+):
+    await service.reorder_tasks(data, current_user.id)
+
+
+@router.post("/tasks/calendar-token", response_model=CalendarTokenResponse)
+async def create_calendar_feed_token(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Issue a new feed URL; links issued before stop working."""
+    version = await UserRepository(db).rotate_calendar_token_version(current_user.id)
+    token = create_calendar_token(current_user.id, version)
+    return CalendarTokenResponse(
+        token=token,
+        feed_path=f"{settings.API_V1_STR}/tasks/calendar.ics?token={token}",
+    )
+
+
+@router.get(
+    "/tasks/calendar.ics",
+    response_class=Response,
+    responses={
+        200: {"content": {"text/calendar": {}}},
+        304: {"description": "Feed unchanged since the given ETag"},
+    },
+)
+async def get_calendar_feed(
+    service: Annotated[CalendarService, Depends(get_calendar_service)],
+    user_id: Annotated[UUID, Depends(get_calendar_user_id)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    etag = await service.get_feed_etag(user_id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        record_cache_lookup("calendar_feed", hit=True)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    record_cache_lookup("calendar_feed", hit=False)
+
+    feed = await service.render_feed(user_id)
+    return Response(
+        content=feed, media_type="text/calendar; charset=utf-8", headers=headers
+    )
+
+
+@router.get(
+    "/tasks/skipped-on/{date}",
+    response_model=list[TaskResponse],
+    dependencies=[Depends(conditional_get)],
+)
+async def list_tasks_skipped_on(
+    date: date_type,
+    service: Annotated[TaskService, Depends(get_read_task_service)],
+    current_user: Annotated[User, Depends(get_current_user)],
+):
+    tasks = await service.get_tasks_skipped_on(current_user.id, date)
+    return [_to_task_response(task) for task in tasks]
+
+
 @router.get("/tasks/{id}", response_model=TaskResponse)
 async def get_task(
     id: UUID,
@@ -14,6 +14,7 @@ from app.db.session import get_db
 from app.exceptions import ConflictError, NotFoundError
 from app.models.activity import Activity, Category
 from app.models.user import User
+from app.repositories.user_repository import UserRepository
 from app.schemas.activity import ActivityResponse
 from app.schemas.base import CamelModel
 
@@ -85,6 +86,7 @@ async def start_timer(
             resource_id=str(data.category_id),
         )
 
+    await UserRepository(db).bump_change_version(current_user.id)
     now_time = datetime.now().time().replace(second=0, microsecond=0)
     activity = Activity(
         user_id=current_user.id,
@@ -117,6 +119,7 @@ async def stop_timer(
             detail="No active timer found",
         )
 
+    await UserRepository(db).bump_change_version(current_user.id)
     activity.end_time = datetime.now().time().replace(second=0, microsecond=0)
     await db.commit()
     await db.refresh(activity)
@@ -141,6 +144,7 @@ async def stop_timer_at(
             detail="No active timer found",
         )
 
+    await UserRepository(db).bump_change_version(current_user.id)
     activity.end_time = data.end_time
     await db.commit()
     await db.refresh(activity)
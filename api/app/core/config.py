@@ -9,6 +9,26 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
 
     DATABASE_URL: str = "postgresql+asyncpg://postgres:postgres@db:5432/app"
+    # Per worker process: budget WEB_CONCURRENCY * (DB_POOL_SIZE +
+    # DB_MAX_OVERFLOW) against Postgres max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WARMUP: bool = True
+    # asyncpg prepared statement caches; set to 0 behind PgBouncer.
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Server-side limit for every statement; 0 disables it.
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+    READINESS_TIMEOUT: float = 2.0
+    # Optional streaming replica for read-only endpoints. After a successful
+    # write a client reads from the primary for READ_YOUR_WRITES_SECONDS.
+    DATABASE_READ_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+    # Sections of GET /bootstrap read concurrently, each on its own pooled
+    # connection; this caps how many one request holds at once.
+    BOOTSTRAP_CONCURRENCY: int = 3
 
     SECRET_KEY: str = "CHANGEME"
     ALGORITHM: str = "HS256"
@@ -20,9 +40,42 @@ class Settings(BaseSettings):
 
     FRONTEND_URL: str = "http://localhost:5173"
 
+    # Set by app.server when it runs several workers; /metrics then merges the
+    # snapshots every worker writes there each METRICS_SNAPSHOT_INTERVAL.
+    METRICS_MULTIPROC_DIR: str | None = None
+    METRICS_SNAPSHOT_INTERVAL: float = 1.0
+
+    LOG_LEVEL: str | None = None
+    LOG_JSON: bool | None = None
+    # Rotating files under logs/; app.server turns them off for several workers.
+    LOG_FILES: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int | None = None
+    # Longer than Traefik's 90s backend idle timeout, so the proxy always
+    # closes idle keep-alive connections first and never reuses a dead one.
+    KEEP_ALIVE_TIMEOUT: int = 95
+    BACKLOG: int = 2048
+    GRACEFUL_SHUTDOWN_TIMEOUT: int = 25
+    FORWARDED_ALLOW_IPS: str = "*"
+
     @property
     def is_production(self) -> bool:
         return self.ENVIRONMENT == "production"
 
+    @property
+    def log_level(self) -> str:
+        if self.LOG_LEVEL:
+            return self.LOG_LEVEL.upper()
+        return "INFO" if self.is_production else "DEBUG"
+
+    @property
+    def log_json(self) -> bool:
+        if self.LOG_JSON is not None:
+            return self.LOG_JSON
+        return self.is_production
+
 
 settings = Settings()
@@ -4,12 +4,13 @@ from typing import Any
 
 from fastapi import HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from loguru import logger
 from pydantic import ValidationError
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import DBAPIError, IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
-from app.exceptions import AppException
+from app.exceptions import AppException, NotModified
 from app.schemas.error import ErrorDetail, ErrorResponse
 
 
@@ -60,6 +61,10 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     )
 
 
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=exc.headers)
+
+
 async def validation_exception_handler(
     request: Request, exc: RequestValidationError
 ) -> JSONResponse:
@@ -181,9 +186,25 @@ async def integrity_error_handler(
     )
 
 
+# SQLSTATE 57014: statement cancelled, here by statement_timeout.
+QUERY_CANCELED = "57014"
+
+
+def _is_database_timeout(exc: SQLAlchemyError) -> bool:
+    if isinstance(exc, PoolTimeoutError):
+        return True
+    return (
+        isinstance(exc, DBAPIError)
+        and getattr(exc.orig, "sqlstate", None) == QUERY_CANCELED
+    )
+
+
 async def sqlalchemy_exception_handler(
     request: Request, exc: SQLAlchemyError
 ) -> JSONResponse:
+    if _is_database_timeout(exc):
+        return await database_timeout_handler(request, exc)
+
     logger.bind(
         error_code="SERVER_001",
         status_code=500,
@@ -212,6 +233,39 @@ async def sqlalchemy_exception_handler(
     )
 
 
+async def database_timeout_handler(
+    request: Request, exc: SQLAlchemyError
+) -> JSONResponse:
+    logger.bind(
+        error_code="SERVER_002",
+        status_code=503,
+        path=request.url.path,
+        method=request.method,
+        client_ip=request.client.host if request.client else "Unknown",
+        error_type=type(exc).__name__,
+    ).error(
+        f"Database Timeout\n"
+        f"  Path: {request.method} {request.url.path}\n"
+        f"  Client: {request.client.host if request.client else 'Unknown'}\n"
+        f"  Error Type: {type(exc).__name__}\n"
+        f"  Error: {str(exc)}"
+    )
+
+    error_response = ErrorResponse(
+        code="SERVER_002",
+        message="Service temporarily unavailable",
+        detail="The database did not respond in time. Please try again shortly.",
+        timestamp=datetime.utcnow(),
+        path=str(request.url.path),
+    )
+
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=error_response.model_dump(mode="json", exclude_none=True),
+        headers={"Retry-After": "1"},
+    )
+
+
 async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     tb = traceback.format_exception(type(exc), exc, exc.__traceback__)
     tb_str = "".join(tb)
@@ -248,6 +302,7 @@ async def generic_exception_handler(request: Request, exc: Exception) -> JSONRes
 
 def register_exception_handlers(app: Any) -> None:
     app.add_exception_handler(AppException, app_exception_handler)
+    app.add_exception_handler(NotModified, not_modified_handler)
     app.add_exception_handler(HTTPException, http_exception_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(ValidationError, pydantic_validation_exception_handler)
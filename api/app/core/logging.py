@@ -1,58 +1,102 @@
+import json
 import sys
+import traceback
 from pathlib import Path
 
 from loguru import logger
 
+from app.core.config import settings
+from app.core.middleware import get_request_id
+
+TEXT_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {extra[request_id]} | "
+    "{name}:{function}:{line} | {message}"
+)
+COLOR_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<magenta>{extra[request_id]}</magenta> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "<level>{message}</level>"
+)
+
+
+def _add_request_id(record) -> None:
+    record["extra"].setdefault("request_id", get_request_id() or "-")
+
+
+def _json_format(record) -> str:
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": f"{record['name']}:{record['function']}:{record['line']}",
+        **{key: value for key, value in record["extra"].items() if key != "json"},
+    }
+    if record["exception"] is not None:
+        exc_type, exc_value, exc_traceback = record["exception"]
+        payload["exception"] = "".join(
+            traceback.format_exception(exc_type, exc_value, exc_traceback)
+        )
+    record["extra"]["json"] = json.dumps(payload, default=str, ensure_ascii=False)
+    return "{extra[json]}\n"
+
 
 class LoggerConfig:
     @staticmethod
     def setup():
         logger.remove()
+        logger.configure(patcher=_add_request_id)
+
+        # Sinks write from a background thread so request handlers never block
+        # on stdout or disk; variable values are only dumped outside production.
+        json_output = settings.log_json
+        common = {
+            "enqueue": True,
+            "backtrace": not settings.is_production,
+            "diagnose": not settings.is_production,
+        }
 
         logger.add(
             sys.stdout,
-            format=(
-                "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-                "<level>{level: <8}</level> | "
-                "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-                "<level>{message}</level>"
-            ),
-            level="DEBUG",
-            colorize=True,
-            backtrace=True,
-            diagnose=True,
+            format=_json_format if json_output else COLOR_FORMAT,
+            level=settings.log_level,
+            colorize=not json_output,
+            **common,
+        )
+
+        if settings.LOG_FILES:
+            LoggerConfig._add_file_sinks(json_output, common)
+
+        logger.info(
+            f"🚀 Loguru logging configured (level={settings.log_level}, "
+            f"json={json_output}, files={settings.LOG_FILES})"
         )
 
+    @staticmethod
+    def _add_file_sinks(json_output: bool, common: dict) -> None:
+        # Rotation is not coordinated across processes, so these sinks are
+        # only safe with a single worker writing to logs/.
         logger.add(
             Path("logs") / "app_{time:YYYY-MM-DD}.log",
-            format=(
-                "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
-                "{name}:{function}:{line} | {message}"
-            ),
-            level="INFO",
+            format=_json_format if json_output else TEXT_FORMAT,
+            level=settings.log_level,
             rotation="00:00",
             retention="30 days",
             compression="zip",
-            backtrace=True,
-            diagnose=True,
+            **common,
         )
 
         logger.add(
             Path("logs") / "error_{time:YYYY-MM-DD}.log",
-            format=(
-                "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | "
-                "{name}:{function}:{line} | {message}\n{exception}"
-            ),
+            format=_json_format if json_output else TEXT_FORMAT + "\n{exception}",
             level="ERROR",
             rotation="00:00",
             retention="90 days",
             compression="zip",
-            backtrace=True,
-            diagnose=True,
+            **common,
         )
 
-        logger.info("🚀 Loguru logging configured successfully")
-
 
 def get_logger(name: str):
     return logger.bind(name=name)
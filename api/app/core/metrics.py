@@ -0,0 +1,419 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Updates are plain dict operations without locks: they all happen on the event
+loop thread (SQLAlchemy's cursor events run in a greenlet on that same
+thread), so no two updates interleave.
+
+Each worker process keeps its own registry, and a scrape reaches whichever
+worker accepted the connection. With several workers, ``METRICS_MULTIPROC_DIR``
+names a directory where every worker regularly writes a snapshot of its values
+and ``/metrics`` renders the merge of all of them.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import secrets
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+repository_method_ctx: ContextVar[str | None] = ContextVar(
+    "repository_method", default=None
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: Iterable[str]) -> str:
+    pairs = [
+        f'{name}="{_escape(str(value))}"'
+        for name, value in zip(names, values, strict=True)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+type Values = dict[tuple[str, ...], Any]
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    @abstractmethod
+    def collect(self) -> Values:
+        """Current value of every label set, as plain JSON-serialisable data."""
+
+    @abstractmethod
+    def combine(self, left: Any, right: Any) -> Any:
+        """Merge the values two processes hold for the same label set."""
+
+    @abstractmethod
+    def samples(self, values: Values | None = None) -> list[str]:
+        """Exposition lines for ``values``, this process's own by default."""
+
+    def _simple_samples(self, values: Values) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} "
+            f"{_format_value(value)}"
+            for labels, value in values.items()
+        ]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def collect(self) -> Values:
+        return dict(self._values)
+
+    def combine(self, left: float, right: float) -> float:
+        return left + right
+
+    def samples(self, values: Values | None = None) -> list[str]:
+        return self._simple_samples(self.collect() if values is None else values)
+
+
+class Gauge(_Metric):
+    """A settable value, or per label set a callback read at scrape time.
+
+    Across worker processes the values of live workers are summed.
+    """
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def set_function(self, function: Callable[[], float], *labels: str) -> None:
+        self._functions[labels] = function
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels: str) -> float:
+        if labels in self._functions:
+            return self._functions[labels]()
+        return self._values.get(labels, 0)
+
+    def collect(self) -> Values:
+        return {
+            **self._values,
+            **{labels: function() for labels, function in self._functions.items()},
+        }
+
+    def combine(self, left: float, right: float) -> float:
+        return left + right
+
+    def samples(self, values: Values | None = None) -> list[str]:
+        return self._simple_samples(self.collect() if values is None else values)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one non-cumulative count per bucket plus the +Inf
+        # overflow slot, then the running sum.
+        self._series: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def collect(self) -> Values:
+        return {labels: list(series) for labels, series in self._series.items()}
+
+    def combine(self, left: list[float], right: list[float]) -> list[float]:
+        return [a + b for a, b in zip(left, right, strict=True)]
+
+    def samples(self, values: Values | None = None) -> list[str]:
+        names = (*self.labelnames, "le")
+        lines: list[str] = []
+        for labels, series in (self.collect() if values is None else values).items():
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*self.buckets, float("inf")), series[:-1], strict=True
+            ):
+                cumulative += bucket_count
+                le = _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(names, (*labels, le))} "
+                    f"{cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register[M: _Metric](self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def render(self) -> str:
+        """This process's metrics in the text exposition format."""
+        return self._render(
+            {name: metric.collect() for name, metric in list(self._metrics.items())}
+        )
+
+    def _render(self, collected: dict[str, Values]) -> str:
+        lines: list[str] = []
+        for name, metric in list(self._metrics.items()):
+            samples = metric.samples(collected.get(name, {}))
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, directory: Path) -> None:
+        """Publish this process's values for ``render_multiprocess``.
+
+        The file is replaced atomically, so readers never see a partial one.
+        """
+        snapshot = {
+            name: [[list(labels), value] for labels, value in metric.collect().items()]
+            for name, metric in list(self._metrics.items())
+        }
+        path = directory / f"{os.getpid()}-{_PROCESS_TOKEN}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(snapshot))
+        os.replace(tmp_path, path)
+
+    def render_multiprocess(self, directory: Path) -> str:
+        """Merge the snapshots every worker wrote to ``directory``.
+
+        Counters and histograms add up across all files, those of exited
+        workers included, so totals never go backwards when a worker is
+        replaced. Gauges describe current state and only count live workers.
+        """
+        self.write_snapshot(directory)
+        merged: dict[str, Values] = {}
+        for path in directory.glob("*.json"):
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            alive = _process_alive(int(path.name.partition("-")[0]))
+            for name, entries in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None or (isinstance(metric, Gauge) and not alive):
+                    continue
+                values = merged.setdefault(name, {})
+                for labels, value in entries:
+                    key = tuple(labels)
+                    values[key] = (
+                        metric.combine(values[key], value) if key in values else value
+                    )
+        return self._render(merged)
+
+
+# Snapshot files are named "<pid>-<token>.json": the pid tells readers whether
+# the worker is still alive, the token keeps a recycled pid from overwriting an
+# exited worker's counters.
+_PROCESS_TOKEN = secrets.token_hex(4)
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ("method", "route", "status"),
+    )
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.register(
+    Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+)
+HTTP_RESPONSE_SIZE = registry.register(
+    Histogram(
+        "http_response_size_bytes",
+        "HTTP response body size by route template.",
+        ("method", "route"),
+        buckets=SIZE_BUCKETS,
+    )
+)
+REPOSITORY_CALL_DURATION = registry.register(
+    Histogram(
+        "repository_call_duration_seconds",
+        "Wall time spent in repository methods, database round-trips included.",
+        ("method",),
+    )
+)
+DB_QUERIES = registry.register(
+    Counter(
+        "db_queries_total",
+        "SQL statements executed, by calling repository method.",
+        ("method",),
+    )
+)
+DB_QUERY_DURATION = registry.register(
+    Histogram(
+        "db_query_duration_seconds",
+        "Statement execution time, by calling repository method.",
+        ("method",),
+    )
+)
+CACHE_REQUESTS = registry.register(
+    Counter(
+        "cache_requests_total",
+        "Cache lookups by cache name and result (hit or miss).",
+        ("cache", "result"),
+    )
+)
+
+
+async def write_snapshots(directory: Path, interval: float) -> None:
+    """Keep this worker's snapshot in ``directory`` fresh until cancelled."""
+    while True:
+        registry.write_snapshot(directory)
+        await asyncio.sleep(interval)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+def _timed(method_name: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        label = f"{type(self).__name__}.{method_name}"
+        token = repository_method_ctx.set(label)
+        start_time = time.perf_counter()
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            REPOSITORY_CALL_DURATION.observe(time.perf_counter() - start_time, label)
+            repository_method_ctx.reset(token)
+
+    return wrapper
+
+
+def instrument_repository[T: type](cls: T) -> T:
+    """Time the public coroutine methods defined on ``cls``.
+
+    The running method is published in ``repository_method_ctx`` so statements
+    executed underneath can be attributed to it.
+    """
+    for name, attr in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.iscoroutinefunction(attr):
+            setattr(cls, name, _timed(name, attr))
+    return cls
+
+
+DB_POOL_SIZE = registry.register(
+    Gauge("db_pool_size", "Configured size of the connection pool.", ("pool",))
+)
+DB_POOL_CHECKED_OUT = registry.register(
+    Gauge("db_pool_checked_out", "Connections currently checked out.", ("pool",))
+)
+DB_POOL_OVERFLOW = registry.register(
+    Gauge("db_pool_overflow", "Connections opened beyond the pool size.", ("pool",))
+)
+
+
+def register_pool_metrics(engine: AsyncEngine, pool_name: str) -> None:
+    """Expose the engine's connection pool usage, read at scrape time."""
+    pool = engine.sync_engine.pool
+    if not hasattr(pool, "overflow"):
+        return
+    DB_POOL_SIZE.set_function(pool.size, pool_name)
+    DB_POOL_CHECKED_OUT.set_function(pool.checkedout, pool_name)
+    # QueuePool.overflow() counts down from -pool_size until the pool is full;
+    # clamped like pool_status() in app.db.health.
+    DB_POOL_OVERFLOW.set_function(lambda: max(pool.overflow(), 0), pool_name)
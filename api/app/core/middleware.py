@@ -1,67 +1,202 @@
 import time
-from collections.abc import Callable
+import uuid
+from contextvars import ContextVar
 
-from fastapi import Request, Response
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
-
-
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = id(request)
-        start_time = time.time()
-
-        client_host = request.client.host if request.client else "Unknown"
-        method = request.method
-        path = request.url.path
-        query_params = dict(request.query_params) if request.query_params else {}
-
-        logger.info(
-            f"🔵 Incoming Request\n"
-            f"  ID: {request_id}\n"
-            f"  Method: {method}\n"
-            f"  Path: {path}\n"
-            f"  Client: {client_host}\n"
-            f"  Query Params: {query_params if query_params else 'None'}"
-        )
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_RESPONSE_SIZE,
+)
+from app.db.instrumentation import QueryStats, query_stats_ctx
+from app.db.session import PRIMARY_UNTIL_COOKIE
+
+REQUEST_ID_HEADER = "x-request-id"
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+_MAX_REQUEST_ID_LENGTH = 128
+
+request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> str | None:
+    return request_id_ctx.get()
+
+
+def _incoming_request_id(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER.encode():
+            candidate = value.decode("latin-1")
+            if 0 < len(candidate) <= _MAX_REQUEST_ID_LENGTH and candidate.isprintable():
+                return candidate
+            return None
+    return None
+
+
+class LoggingMiddleware:
+    """Pure ASGI access log: one structured record per HTTP request.
+
+    Reuses a sane ``X-Request-ID`` from the caller or generates one, exposes it
+    through ``request_id_ctx`` for the rest of the request and echoes it back
+    on the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+        token = request_id_ctx.set(request_id)
+        query_stats = QueryStats()
+        stats_token = query_stats_ctx.set(query_stats)
+        start_time = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode(), request_id.encode()))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_with_request_id)
         except Exception as e:
-            process_time = (time.time() - start_time) * 1000
-            logger.error(
-                f"🔴 Request Failed\n"
-                f"  ID: {request_id}\n"
-                f"  Method: {method}\n"
-                f"  Path: {path}\n"
-                f"  Client: {client_host}\n"
-                f"  Duration: {process_time:.2f}ms\n"
-                f"  Exception: {type(e).__name__}: {str(e)}"
-            )
+            self._log(scope, 500, start_time, response_size, query_stats, error=e)
             raise
+        else:
+            self._log(scope, status_code, start_time, response_size, query_stats)
+        finally:
+            query_stats_ctx.reset(stats_token)
+            request_id_ctx.reset(token)
 
-        process_time = (time.time() - start_time) * 1000
-        status_code = response.status_code
+    @staticmethod
+    def _log(
+        scope: Scope,
+        status_code: int,
+        start_time: float,
+        response_size: int,
+        query_stats: QueryStats,
+        error: Exception | None = None,
+    ) -> None:
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        client = scope.get("client")
+        method = scope["method"]
+        # The query string is left out on purpose: it can carry feed tokens.
+        path = scope["path"]
 
         if status_code < 400:
-            log_level = "success"
-            emoji = "🟢"
+            level = "INFO"
         elif status_code < 500:
-            log_level = "warning"
-            emoji = "🟡"
+            level = "WARNING"
         else:
-            log_level = "error"
-            emoji = "🔴"
-
-        logger.log(
-            log_level.upper(),
-            f"{emoji} Request Completed\n"
-            f"  ID: {request_id}\n"
-            f"  Method: {method}\n"
-            f"  Path: {path}\n"
-            f"  Status: {status_code}\n"
-            f"  Duration: {process_time:.2f}ms\n"
-            f"  Client: {client_host}",
+            level = "ERROR"
+
+        fields = {
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": duration_ms,
+            "response_bytes": response_size,
+            "db_queries": query_stats.count,
+            "db_time_ms": query_stats.total_ms,
+            "client": client[0] if client else None,
+        }
+        if error is not None:
+            fields["error"] = f"{type(error).__name__}: {error}"
+
+        logger.bind(**fields).log(
+            level,
+            f"{method} {path} {status_code} {duration_ms}ms "
+            f"({query_stats.count} queries, {query_stats.total_ms}ms db)",
         )
 
-        return response
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners cannot blow up cardinality.
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware feeding the HTTP metrics in ``app.core.metrics``."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        response_size = 0
+
+        async def send_and_measure(message: Message) -> None:
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_and_measure)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            method = scope["method"]
+            route = _route_template(scope)
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start_time, method, route, str(status_code)
+            )
+            HTTP_RESPONSE_SIZE.observe(response_size, method, route)
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary database for a while after it writes.
+
+    Any successful non-GET request sets a short-lived cookie that
+    ``get_read_db`` checks, so the reads that follow a write (the dashboard
+    right after logging an activity) never hit a replica that is still behind.
+    A cookie rather than per-process state keeps this correct across workers.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: int, secure: bool = False):
+        self.app = app
+        self.window_seconds = window_seconds
+        self.secure = secure
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in _SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", self._cookie().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    def _cookie(self) -> str:
+        until = int(time.time()) + self.window_seconds
+        cookie = (
+            f"{PRIMARY_UNTIL_COOKIE}={until}; Max-Age={self.window_seconds}; "
+            f"Path={settings.API_V1_STR}; HttpOnly; SameSite=Lax"
+        )
+        return f"{cookie}; Secure" if self.secure else cookie
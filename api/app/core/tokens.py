@@ -30,6 +30,40 @@ def decode_access_token(token: str) -> dict | None:
         return None
 
 
+CALENDAR_TOKEN_SCOPE = "calendar"
+
+
+def create_calendar_token(user_id: UUID, version: int) -> str:
+    """Long-lived, read-only token embedded in calendar feed URLs.
+
+    Calendar apps cannot send Authorization headers, so the token travels in
+    the query string and is only accepted by the feed endpoint. ``version`` is
+    the user's ``calendar_token_version``; the token stops working once it is
+    rotated.
+    """
+    to_encode = {
+        "sub": str(user_id),
+        "scope": CALENDAR_TOKEN_SCOPE,
+        "ver": version,
+        "iat": datetime.utcnow(),
+    }
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
+
+def decode_calendar_token(token: str) -> tuple[UUID, int] | None:
+    """Return the (user id, token version) a calendar token was issued for."""
+    payload = decode_access_token(token)
+    if not payload or payload.get("scope") != CALENDAR_TOKEN_SCOPE:
+        return None
+    version = payload.get("ver")
+    if not isinstance(version, int):
+        return None
+    try:
+        return UUID(payload["sub"]), version
+    except (KeyError, ValueError):
+        return None
+
+
 def generate_refresh_token() -> str:
     return secrets.token_urlsafe(64)
 
@@ -0,0 +1,45 @@
+"""Database readiness: pool utilization and a timed round trip."""
+
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import Pool
+
+_SERVER_CONNECTIONS = text(
+    "SELECT current_setting('max_connections')::int AS max_connections, "
+    "(SELECT count(*) FROM pg_stat_activity) AS connections"
+)
+
+
+def pool_status(pool: Pool) -> dict:
+    """Checked-out connections against what this process's pool can hold."""
+    size = pool.size()
+    capacity = size + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "size": size,
+        "max_overflow": pool._max_overflow,
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "idle": pool.checkedin(),
+        "utilization": round(checked_out / capacity, 3) if capacity else None,
+    }
+
+
+async def check_database(engine: AsyncEngine) -> dict:
+    """Run one query on a pooled connection and report how long it took.
+
+    The query also reads the server's ``max_connections`` and its current
+    connection count, which is what pool sizes across workers must fit in.
+    """
+    started = time.perf_counter()
+    async with engine.connect() as conn:
+        row = (await conn.execute(_SERVER_CONNECTIONS)).one()
+    round_trip_ms = (time.perf_counter() - started) * 1000
+    return {
+        "round_trip_ms": round(round_trip_ms, 2),
+        "max_connections": row.max_connections,
+        "connections": row.connections,
+        "pool": pool_status(engine.sync_engine.pool),
+    }
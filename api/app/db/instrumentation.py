@@ -0,0 +1,88 @@
+"""Statement timing, slow-query logging and per-request query accounting."""
+
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.metrics import DB_QUERIES, DB_QUERY_DURATION, repository_method_ctx
+
+_MAX_LOGGED_STATEMENT_LENGTH = 2000
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total_seconds * 1000, 2)
+
+
+query_stats_ctx: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _describe_value(value) -> str:
+    if isinstance(value, str | bytes | list | tuple | dict):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    """Describe bound parameters by type and size, never by value."""
+    if executemany:
+        rows = list(parameters or [])
+        first = parameter_shape(rows[0], False) if rows else "()"
+        return f"{len(rows)} x {first}"
+    if isinstance(parameters, dict):
+        items = ", ".join(
+            f"{key}: {_describe_value(value)}" for key, value in parameters.items()
+        )
+        return f"{{{items}}}"
+    return f"({', '.join(_describe_value(value) for value in parameters or ())})"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's execution context, which is discarded with it:
+    # a failed statement never reaches after_cursor_execute and must not leave
+    # a start time behind on the pooled connection.
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_start_time
+    method = repository_method_ctx.get() or "-"
+
+    DB_QUERIES.inc(method)
+    DB_QUERY_DURATION.observe(elapsed, method)
+
+    stats = query_stats_ctx.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_seconds += elapsed
+
+    duration_ms = round(elapsed * 1000, 2)
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.bind(
+            repository_method=method,
+            duration_ms=duration_ms,
+            statement=_WHITESPACE.sub(" ", statement)[:_MAX_LOGGED_STATEMENT_LENGTH],
+            parameters=parameter_shape(parameters, executemany),
+        ).warning(f"🐢 Slow query: {duration_ms}ms in {method}")
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """Time every statement run through ``engine``.
+
+    Statements are attributed to the repository method found in
+    ``repository_method_ctx``; the request id is added by the log patcher.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
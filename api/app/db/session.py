@@ -1,9 +1,53 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+import time
+from typing import Annotated
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.core.metrics import register_pool_metrics
+from app.db.instrumentation import instrument_queries
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """An engine with the pool, statement cache and timeout from settings."""
+    connect_args: dict = {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    return create_async_engine(
+        url,
+        echo=False,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+async def warm_up_pool(engine: AsyncEngine) -> None:
+    """Open ``pool_size`` connections up front so first requests skip connecting."""
+    connections = [engine.connect() for _ in range(engine.sync_engine.pool.size())]
+    await asyncio.gather(*(connection.start() for connection in connections))
+    await asyncio.gather(*(connection.close() for connection in connections))
+
+
+engine = build_engine(settings.DATABASE_URL)
+instrument_queries(engine)
+register_pool_metrics(engine, "primary")
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
@@ -11,6 +55,23 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+read_engine = (
+    build_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else None
+)
+if read_engine is not None:
+    instrument_queries(read_engine)
+    register_pool_metrics(read_engine, "replica")
+AsyncReadSessionLocal = (
+    async_sessionmaker(bind=read_engine, class_=AsyncSession, expire_on_commit=False)
+    if read_engine is not None
+    else None
+)
+
+# Set by ReadYourWritesMiddleware after a successful write; holds the unix time
+# until which this client's reads must go to the primary.
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -18,3 +79,35 @@ class Base(DeclarativeBase):
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def reads_from_primary(request: Request) -> bool:
+    """True while the client is inside its read-your-writes window."""
+    try:
+        until = int(request.cookies.get(PRIMARY_UNTIL_COOKIE, "0"))
+    except ValueError:
+        return False
+    return until > time.time()
+
+
+def get_read_session_factory(
+    request: Request,
+) -> async_sessionmaker[AsyncSession]:
+    """For read-only endpoints that open sessions of their own: the replica's
+    sessionmaker, or the primary's inside the client's read-your-writes
+    window."""
+    if AsyncReadSessionLocal is None or reads_from_primary(request):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+async def get_read_db(request: Request, db: Annotated[AsyncSession, Depends(get_db)]):
+    """A session on the replica, or the request's primary session when there is
+    no replica or the client wrote recently. Only for endpoints that never
+    write. The primary session is the one ``get_current_user`` already uses, so
+    it costs no extra connection."""
+    if AsyncReadSessionLocal is None or reads_from_primary(request):
+        yield db
+        return
+    async with AsyncReadSessionLocal() as session:
+        yield session
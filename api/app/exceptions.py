@@ -266,6 +266,23 @@ class BadRequestError(AppException):
         )
 
 
+# ============================================================================
+# Conditional Requests (304)
+# ============================================================================
+
+
+class NotModified(Exception):
+    """304 - The client's cached representation is still current.
+
+    Not an error: raised by conditional GET dependencies so the endpoint, its
+    repository queries and serialization are skipped.
+    """
+
+    def __init__(self, headers: dict[str, str]):
+        super().__init__()
+        self.headers = headers
+
+
 # ============================================================================
 # Server Errors (500)
 # ============================================================================
@@ -1,26 +1,61 @@
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.v1.api import api_router
 from app.core.config import settings
 from app.core.exception_handlers import register_exception_handlers
 from app.core.logging import LoggerConfig
-from app.core.middleware import LoggingMiddleware
+from app.core.metrics import CONTENT_TYPE, registry, write_snapshots
+from app.core.middleware import (
+    LoggingMiddleware,
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from app.db.health import check_database, pool_status
+from app.db.session import engine, read_engine, warm_up_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Path("logs").mkdir(exist_ok=True)
+    if settings.LOG_FILES:
+        Path("logs").mkdir(exist_ok=True)
     LoggerConfig.setup()
     logger.info(f"🚀 Starting {settings.PROJECT_NAME}")
     logger.info(f"📍 Environment: {settings.ENVIRONMENT}")
     logger.info(f"🌐 API Prefix: {settings.API_V1_STR}")
+    engines = {"primary": engine}
+    if read_engine is not None:
+        engines["replica"] = read_engine
+    if settings.DB_POOL_WARMUP:
+        for name, pool_engine in engines.items():
+            try:
+                await warm_up_pool(pool_engine)
+                logger.info(
+                    f"🔌 Database pool warmed up ({name}, {settings.DB_POOL_SIZE})"
+                )
+            except (SQLAlchemyError, OSError) as exc:
+                logger.warning(f"Database pool warm-up failed ({name}): {exc}")
+    metrics_dir = settings.METRICS_MULTIPROC_DIR
+    if metrics_dir:
+        snapshots = asyncio.create_task(
+            write_snapshots(Path(metrics_dir), settings.METRICS_SNAPSHOT_INTERVAL)
+        )
     yield
     logger.info(f"🛑 Shutting down {settings.PROJECT_NAME}")
+    if metrics_dir:
+        snapshots.cancel()
+        # Counters of an exited worker still count towards the totals.
+        registry.write_snapshot(Path(metrics_dir))
+    for pool_engine in engines.values():
+        await pool_engine.dispose()
+    await logger.complete()
 
 
 app = FastAPI(
@@ -32,6 +67,15 @@ app = FastAPI(
 register_exception_handlers(app)
 
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+if settings.DATABASE_READ_URL:
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+        secure=settings.is_production,
+    )
+    logger.info("✅ Read-only endpoints routed to the read replica")
 
 if settings.FRONTEND_URL:
     app.add_middleware(
@@ -49,3 +93,34 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "project": settings.PROJECT_NAME}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    try:
+        database = await asyncio.wait_for(
+            check_database(engine), timeout=settings.READINESS_TIMEOUT
+        )
+        if read_engine is not None:
+            database["replica"] = await asyncio.wait_for(
+                check_database(read_engine), timeout=settings.READINESS_TIMEOUT
+            )
+    except (SQLAlchemyError, OSError, TimeoutError) as exc:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={
+                "status": "unavailable",
+                "error": type(exc).__name__,
+                "database": {"pool": pool_status(engine.sync_engine.pool)},
+            },
+        )
+    return {"status": "ok", "database": database}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if settings.METRICS_MULTIPROC_DIR:
+        content = registry.render_multiprocess(Path(settings.METRICS_MULTIPROC_DIR))
+    else:
+        content = registry.render()
+    return Response(content=content, media_type=CONTENT_TYPE)
@@ -0,0 +1,161 @@
+"""Rollups read by the insights endpoints.
+
+``category_week_minutes`` holds the finished activity minutes of each
+category per Monday-based week. A trigger on ``activities`` keeps it current
+on every insert, update and delete, so goal history is one indexed read
+instead of a scan of every activity.
+
+``weekly_comparison_snapshots`` keeps the weekly comparison of weeks that
+have ended. Another trigger on ``activities`` deletes the snapshots an
+activity write affects: the activity's own week and the week after it, which
+compares against it.
+
+The migrations that introduced them repeat the same SQL;
+``Base.metadata.create_all`` runs it from here.
+"""
+
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    event,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+
+class CategoryWeekMinutes(Base):
+    __tablename__ = "category_week_minutes"
+    __table_args__ = (
+        Index("ix_category_week_minutes_user_id_week_start", "user_id", "week_start"),
+    )
+
+    category_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    minutes: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    activities_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class WeeklyComparisonSnapshot(Base):
+    __tablename__ = "weekly_comparison_snapshots"
+
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Snapshots with another format version are recomputed, see
+    # app.services.insights_service.WEEKLY_SNAPSHOT_FORMAT.
+    format_version: Mapped[int] = mapped_column(Integer, nullable=False)
+    # users.change_version the payload was computed at.
+    change_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+# Running timers (end_time IS NULL) count once they are stopped, which is an
+# UPDATE that adds them here.
+RECORD_CATEGORY_WEEK_MINUTES = """
+CREATE OR REPLACE FUNCTION record_category_week_minutes() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.end_time IS NOT NULL THEN
+            UPDATE category_week_minutes
+            SET minutes = minutes
+                    - EXTRACT(epoch FROM OLD.end_time - OLD.start_time) / 60,
+                activities_count = activities_count - 1
+            WHERE category_id = OLD.category_id
+                AND week_start = date_trunc('week', OLD.date)::date;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.end_time IS NOT NULL THEN
+            INSERT INTO category_week_minutes
+                (category_id, week_start, user_id, minutes, activities_count)
+            VALUES (
+                NEW.category_id,
+                date_trunc('week', NEW.date)::date,
+                NEW.user_id,
+                EXTRACT(epoch FROM NEW.end_time - NEW.start_time) / 60,
+                1
+            )
+            ON CONFLICT (category_id, week_start) DO UPDATE
+            SET minutes = category_week_minutes.minutes + EXCLUDED.minutes,
+                activities_count = category_week_minutes.activities_count + 1;
+        END IF;
+        RETURN NULL;
+    END
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_CATEGORY_WEEK_MINUTES_TRIGGER = (
+    "CREATE OR REPLACE TRIGGER activities_record_category_week_minutes "
+    "AFTER INSERT OR UPDATE OR DELETE ON activities "
+    "FOR EACH ROW EXECUTE FUNCTION record_category_week_minutes()"
+)
+
+INVALIDATE_WEEKLY_COMPARISON_SNAPSHOTS = """
+CREATE OR REPLACE FUNCTION invalidate_weekly_comparison_snapshots()
+RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            DELETE FROM weekly_comparison_snapshots
+            WHERE user_id = OLD.user_id
+                AND week_start IN (
+                    date_trunc('week', OLD.date)::date,
+                    date_trunc('week', OLD.date)::date + 7
+                );
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            DELETE FROM weekly_comparison_snapshots
+            WHERE user_id = NEW.user_id
+                AND week_start IN (
+                    date_trunc('week', NEW.date)::date,
+                    date_trunc('week', NEW.date)::date + 7
+                );
+        END IF;
+        RETURN NULL;
+    END
+$$ LANGUAGE plpgsql
+"""
+
+CREATE_WEEKLY_COMPARISON_SNAPSHOTS_TRIGGER = (
+    "CREATE OR REPLACE TRIGGER activities_invalidate_weekly_comparison_snapshots "
+    "AFTER INSERT OR UPDATE OR DELETE ON activities "
+    "FOR EACH ROW EXECUTE FUNCTION invalidate_weekly_comparison_snapshots()"
+)
+
+
+for _statement in (
+    RECORD_CATEGORY_WEEK_MINUTES,
+    CREATE_CATEGORY_WEEK_MINUTES_TRIGGER,
+    INVALIDATE_WEEKLY_COMPARISON_SNAPSHOTS,
+    CREATE_WEEKLY_COMPARISON_SNAPSHOTS_TRIGGER,
+):
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,113 @@
+"""Change tracking for ``GET /sync``.
+
+Triggers stamp every inserted or updated row of the synced tables with its
+owner's ``users.change_version``, which the service layer bumps at the start
+of each write transaction, and record deleted rows in ``sync_tombstones``.
+Running in the database, they also cover bulk UPDATE/DELETE statements and
+``ON DELETE CASCADE``. The migration that introduced them repeats the same
+SQL; ``Base.metadata.create_all`` runs it from here.
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DDL, BigInteger, DateTime, ForeignKey, Index, String, event
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.db.session import Base
+
+SYNCED_TABLES = (
+    "groups",
+    "categories",
+    "activities",
+    "task_lists",
+    "tasks",
+    "task_activities",
+)
+
+
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_change_version", "user_id", "change_version"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    entity: Mapped[str] = mapped_column(String, nullable=False)
+    entity_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
+    change_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+# task_activities has no user_id; either side of the link names the owner, and
+# during a cascade from one side the other one still exists.
+_OWNER = """
+        IF TG_TABLE_NAME = 'task_activities' THEN
+            owner := COALESCE(
+                (SELECT user_id FROM tasks WHERE id = rec.task_id),
+                (SELECT user_id FROM activities WHERE id = rec.activity_id)
+            );
+        ELSE
+            owner := rec.user_id;
+        END IF;"""
+
+STAMP_CHANGE_VERSION = f"""
+CREATE OR REPLACE FUNCTION stamp_change_version() RETURNS trigger AS $$
+    DECLARE
+        rec RECORD := NEW;
+        owner uuid;
+    BEGIN{_OWNER}
+        NEW.change_version := COALESCE(
+            (SELECT change_version FROM users WHERE id = owner), 0
+        );
+        RETURN NEW;
+    END
+$$ LANGUAGE plpgsql
+"""
+
+RECORD_SYNC_TOMBSTONE = f"""
+CREATE OR REPLACE FUNCTION record_sync_tombstone() RETURNS trigger AS $$
+    DECLARE
+        rec RECORD := OLD;
+        owner uuid;
+    BEGIN{_OWNER}
+        -- Nothing to record when the owner itself is being deleted.
+        INSERT INTO sync_tombstones (user_id, entity, entity_id, change_version)
+        SELECT id, TG_TABLE_NAME, OLD.id, change_version
+        FROM users WHERE id = owner;
+        RETURN OLD;
+    END
+$$ LANGUAGE plpgsql
+"""
+
+
+def create_triggers_sql(table: str) -> list[str]:
+    return [
+        f"CREATE OR REPLACE TRIGGER {table}_stamp_change_version "
+        f"BEFORE INSERT OR UPDATE ON {table} "
+        "FOR EACH ROW EXECUTE FUNCTION stamp_change_version()",
+        f"CREATE OR REPLACE TRIGGER {table}_record_sync_tombstone "
+        f"AFTER DELETE ON {table} "
+        "FOR EACH ROW EXECUTE FUNCTION record_sync_tombstone()",
+    ]
+
+
+for _statement in (
+    STAMP_CHANGE_VERSION,
+    RECORD_SYNC_TOMBSTONE,
+    *(sql for table in SYNCED_TABLES for sql in create_triggers_sql(table)),
+):
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(_statement).execute_if(dialect="postgresql"),
+    )
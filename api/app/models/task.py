@@ -5,18 +5,21 @@ from datetime import date, datetime, time
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
-    JSON,
+    BigInteger,
     Date,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     Time,
+    literal,
 )
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 from sqlalchemy.sql import func
 
 from app.db.session import Base
@@ -28,6 +31,9 @@ if TYPE_CHECKING:
 
 class TaskList(Base):
     __tablename__ = "task_lists"
+    __table_args__ = (
+        Index("ix_task_lists_user_id_change_version", "user_id", "change_version"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -41,8 +47,12 @@ class TaskList(Base):
     name: Mapped[str] = mapped_column(String, nullable=False)
     color: Mapped[str | None] = mapped_column(String, nullable=True)
     icon: Mapped[str | None] = mapped_column(String, nullable=True)
-    position: Mapped[int] = mapped_column(Integer, default=0)
+    position: Mapped[float] = mapped_column(Float, default=0.0)
 
+    # Set by the stamp_change_version trigger, see app.models.sync.
+    change_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -50,6 +60,12 @@ class TaskList(Base):
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    # Populated by TaskListRepository via with_expression(); 0 otherwise.
+    task_count: Mapped[int] = query_expression(default_expr=literal(0))
+    todo_count: Mapped[int] = query_expression(default_expr=literal(0))
+    in_progress_count: Mapped[int] = query_expression(default_expr=literal(0))
+    done_count: Mapped[int] = query_expression(default_expr=literal(0))
+
     user: Mapped[User] = relationship()
     tasks: Mapped[list[Task]] = relationship(
         back_populates="task_list",
@@ -60,6 +76,11 @@ class TaskList(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_exception_dates", "exception_dates", postgresql_using="gin"),
+        Index("ix_tasks_user_id_change_version", "user_id", "change_version"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -103,13 +124,17 @@ class Task(Base):
         Integer, nullable=True
     )
     recurrence_rule: Mapped[str | None] = mapped_column(String, nullable=True)
-    exception_dates: Mapped[list[str] | None] = mapped_column(
-        JSON,
+    exception_dates: Mapped[list[date] | None] = mapped_column(
+        ARRAY(Date),
         nullable=True,
         default=list,
     )
-    position: Mapped[int] = mapped_column(Integer, default=0)
+    position: Mapped[float] = mapped_column(Float, default=0.0)
 
+    # Set by the stamp_change_version trigger, see app.models.sync.
+    change_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -144,6 +169,10 @@ class TaskActivity(Base):
         index=True,
     )
 
+    # Set by the stamp_change_version trigger, see app.models.sync.
+    change_version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
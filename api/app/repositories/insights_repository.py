@@ -1,14 +1,34 @@
 from datetime import date, timedelta
+from typing import Literal
 from uuid import UUID
 
 from loguru import logger
-from sqlalchemy import cast, func, select
+from sqlalchemy import (
+    Date,
+    Integer,
+    cast,
+    func,
+    literal_column,
+    select,
+    true,
+    tuple_,
+)
 from sqlalchemy.dialects.postgresql import INTERVAL
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import instrument_repository
 from app.models.activity import Activity, Category, Group
+from app.models.insights import CategoryWeekMinutes
+from app.models.task import Task, TaskActivity
 
+Granularity = Literal["day", "week", "month"]
 
+# Upper bounds, in minutes, of the duration histogram bins; the last bin is
+# open-ended.
+DURATION_HISTOGRAM_EDGES = (15, 30, 60, 120, 240)
+
+
+@instrument_repository
 class InsightsRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -21,6 +41,32 @@ class InsightsRepository:
         week_end = week_start + timedelta(days=6)
         return week_start, week_end
 
+    @staticmethod
+    def _get_goal_status(
+        minutes: float, min_minutes: float, target_minutes: float, max_minutes: float
+    ) -> str:
+        """Classify a week's minutes against a category's weekly goal."""
+        if minutes < min_minutes:
+            return "under"
+        if minutes < target_minutes:
+            return "on_track"
+        if minutes <= max_minutes:
+            return "target_met"
+        return "over"
+
+    async def get_goal_categories(self, user_id: UUID) -> list:
+        """Get categories with goals defined (target_weekly_hours > 0)."""
+        result = await self.session.execute(
+            select(
+                Category.id,
+                Category.name,
+                Category.min_weekly_hours,
+                Category.target_weekly_hours,
+                Category.max_weekly_hours,
+            ).where(Category.user_id == user_id, Category.target_weekly_hours > 0)
+        )
+        return list(result.all())
+
     async def get_week_total_minutes(
         self, user_id: UUID, week_start: date, week_end: date
     ) -> float:
@@ -411,75 +457,85 @@ class InsightsRepository:
         logger.debug(f"Longest activity: {longest}")
         return longest
 
-    async def get_week_goals_progress(
-        self, user_id: UUID, week_start: date, week_end: date
-    ) -> list[dict] | None:
-        """Get goal progress for categories with defined goals."""
-        logger.debug(
-            f"Fetching goals progress for user {user_id} "
-            f"between {week_start} and {week_end}"
-        )
+    async def get_goal_history(
+        self, user_id: UUID, first_week_start: date, last_week_start: date
+    ) -> list[dict]:
+        """Get categories with goals and their minutes per week, from the rollup.
 
-        duration_expr = (
-            func.extract(
-                "epoch",
-                cast(Activity.end_time, INTERVAL) - cast(Activity.start_time, INTERVAL),
-            )
-            / 60
+        One query: the goal categories left-joined to ``category_week_minutes``
+        on its primary key. ``weeks`` maps week start to minutes and leaves
+        out weeks without activities.
+        """
+        logger.debug(
+            f"Fetching goal history for user {user_id} "
+            f"between {first_week_start} and {last_week_start}"
         )
 
-        # First, get all categories with goals defined (target_weekly_hours > 0)
-        categories_result = await self.session.execute(
+        result = await self.session.execute(
             select(
                 Category.id,
                 Category.name,
                 Category.min_weekly_hours,
                 Category.target_weekly_hours,
                 Category.max_weekly_hours,
-            ).where(Category.user_id == user_id, Category.target_weekly_hours > 0)
+                CategoryWeekMinutes.week_start,
+                CategoryWeekMinutes.minutes,
+            )
+            .outerjoin(
+                CategoryWeekMinutes,
+                (CategoryWeekMinutes.category_id == Category.id)
+                & (CategoryWeekMinutes.week_start >= first_week_start)
+                & (CategoryWeekMinutes.week_start <= last_week_start),
+            )
+            .where(Category.user_id == user_id, Category.target_weekly_hours > 0)
+            .order_by(Category.name, Category.id)
         )
 
-        categories_with_goals = categories_result.all()
+        history: dict[UUID, dict] = {}
+        for row in result.all():
+            category = history.setdefault(
+                row.id,
+                {
+                    "category_id": str(row.id),
+                    "category_name": row.name,
+                    "min_weekly_minutes": row.min_weekly_hours * 60,
+                    "target_weekly_minutes": row.target_weekly_hours * 60,
+                    "max_weekly_minutes": row.max_weekly_hours * 60,
+                    "weeks": {},
+                },
+            )
+            if row.week_start is not None:
+                category["weeks"][row.week_start] = float(row.minutes)
 
-        if not categories_with_goals:
-            logger.debug("No categories with goals found")
-            return None
+        logger.debug(f"Goal history: {len(history)} categories with goals")
+        return list(history.values())
 
-        # Get actual time spent per category
-        activities_result = await self.session.execute(
-            select(
-                Activity.category_id,
-                func.sum(duration_expr).label("minutes"),
-            )
-            .where(
-                Activity.user_id == user_id,
-                Activity.date >= week_start,
-                Activity.date <= week_end,
-            )
-            .group_by(Activity.category_id)
+    async def get_week_goals_progress(
+        self, user_id: UUID, week_start: date, week_end: date
+    ) -> list[dict] | None:
+        """Get goal progress for categories with defined goals."""
+        logger.debug(
+            f"Fetching goals progress for user {user_id} "
+            f"between {week_start} and {week_end}"
         )
 
-        time_by_category = {
-            row.category_id: float(row.minutes) for row in activities_result.all()
-        }
+        history = await self.get_goal_history(user_id, week_start, week_start)
+
+        if not history:
+            logger.debug("No categories with goals found")
+            return None
 
         # Build goal progress list
         goals_progress = []
-        for cat in categories_with_goals:
-            current_minutes = time_by_category.get(cat.id, 0.0)
-            min_minutes = cat.min_weekly_hours * 60
-            target_minutes = cat.target_weekly_hours * 60
-            max_minutes = cat.max_weekly_hours * 60
-
-            # Calculate status
-            if current_minutes < min_minutes:
-                status = "under"
-            elif current_minutes < target_minutes:
-                status = "on_track"
-            elif current_minutes <= max_minutes:
-                status = "target_met"
-            else:
-                status = "over"
+        for cat in history:
+            current_minutes = cat["weeks"].get(week_start, 0.0)
+            min_minutes = cat["min_weekly_minutes"]
+            target_minutes = cat["target_weekly_minutes"]
+            max_minutes = cat["max_weekly_minutes"]
+
+            status = self._get_goal_status(
+                current_minutes, min_minutes, target_minutes, max_minutes
+            )
 
             progress_percent = (
                 (current_minutes / target_minutes * 100) if target_minutes > 0 else 0.0
@@ -487,8 +543,8 @@ class InsightsRepository:
 
             goals_progress.append(
                 {
-                    "category_id": str(cat.id),
-                    "category_name": cat.name,
+                    "category_id": cat["category_id"],
+                    "category_name": cat["category_name"],
                     "current_week_minutes": int(current_minutes),
                     "min_weekly_minutes": int(min_minutes),
                     "target_weekly_minutes": int(target_minutes),
@@ -720,3 +776,338 @@ class InsightsRepository:
         total = result.scalar_one()
         logger.debug(f"Mandatory minutes: {total}")
         return float(total)
+
+    async def get_range_rollup(
+        self,
+        user_id: UUID,
+        start: date,
+        end: date,
+        granularity: Granularity,
+        category_id: UUID | None = None,
+    ) -> list[dict]:
+        """Get minutes per category and period between two dates.
+
+        One ``date_trunc`` grouped query; totals, breakdowns and the series are
+        all sums of these rows. Weeks start on Monday, like ``_get_week_bounds``.
+        With ``category_id`` only that category's rows are returned.
+        """
+        logger.debug(
+            f"Fetching {granularity} rollup for user {user_id} "
+            f"between {start} and {end}"
+        )
+
+        duration_expr = (
+            func.extract(
+                "epoch",
+                cast(Activity.end_time, INTERVAL) - cast(Activity.start_time, INTERVAL),
+            )
+            / 60
+        )
+        # Inlined rather than bound: Postgres only matches the GROUP BY
+        # expression to the selected one when both use the same literal.
+        period_expr = cast(
+            func.date_trunc(literal_column(f"'{granularity}'"), Activity.date), Date
+        )
+        conditions = [
+            Activity.user_id == user_id,
+            Activity.date >= start,
+            Activity.date <= end,
+        ]
+        if category_id is not None:
+            conditions.append(Activity.category_id == category_id)
+
+        result = await self.session.execute(
+            select(
+                period_expr.label("period_start"),
+                Category.id.label("category_id"),
+                Category.name.label("category_name"),
+                Group.id.label("group_id"),
+                Group.name.label("group_name"),
+                Group.color.label("group_color"),
+                func.sum(duration_expr).label("minutes"),
+                func.count(Activity.id).label("activities_count"),
+            )
+            .join(Category, Activity.category_id == Category.id)
+            .join(Group, Category.group_id == Group.id)
+            .where(*conditions)
+            .group_by(
+                period_expr,
+                Category.id,
+                Category.name,
+                Group.id,
+                Group.name,
+                Group.color,
+            )
+            .order_by(period_expr)
+        )
+
+        rollup = [
+            {
+                "period_start": row.period_start,
+                "category_id": str(row.category_id),
+                "category_name": row.category_name,
+                "group_id": str(row.group_id),
+                "group_name": row.group_name,
+                "group_color": row.group_color,
+                "minutes": float(row.minutes),
+                "activities_count": row.activities_count,
+            }
+            for row in result.all()
+        ]
+        logger.debug(f"Range rollup: {len(rollup)} rows")
+        return rollup
+
+    async def get_time_of_day_minutes(
+        self,
+        user_id: UUID,
+        start: date,
+        end: date,
+        bucket_minutes: int,
+        category_id: UUID | None = None,
+    ) -> list[dict]:
+        """Get minutes per (weekday, time-of-day bucket) between two dates.
+
+        Each activity is expanded with ``generate_series`` into the buckets it
+        touches and only its overlap with each bucket is counted, so a 9:50 to
+        10:20 activity adds 10 minutes to the 9:00 bucket and 20 to 10:00.
+        Weekday is 0 for Monday. With ``category_id`` only that category counts.
+        """
+        logger.debug(
+            f"Fetching time-of-day minutes for user {user_id} "
+            f"between {start} and {end} in {bucket_minutes} minute buckets"
+        )
+
+        size = bucket_minutes * 60
+        start_seconds = func.extract("epoch", cast(Activity.start_time, INTERVAL))
+        end_seconds = func.extract("epoch", cast(Activity.end_time, INTERVAL))
+        buckets = (
+            func.generate_series(
+                cast(func.floor(start_seconds / size), Integer),
+                cast(func.ceil(end_seconds / size), Integer) - 1,
+            )
+            .table_valued("bucket")
+            .render_derived()
+            .lateral("buckets")
+        )
+        overlap_expr = func.least(end_seconds, (buckets.c.bucket + 1) * size) - (
+            func.greatest(start_seconds, buckets.c.bucket * size)
+        )
+        isodow_expr = cast(func.extract("isodow", Activity.date), Integer)
+        conditions = [
+            Activity.user_id == user_id,
+            Activity.date >= start,
+            Activity.date <= end,
+            Activity.end_time.is_not(None),
+        ]
+        if category_id is not None:
+            conditions.append(Activity.category_id == category_id)
+
+        result = await self.session.execute(
+            select(
+                isodow_expr.label("isodow"),
+                buckets.c.bucket,
+                (func.sum(overlap_expr) / 60).label("minutes"),
+            )
+            .select_from(Activity)
+            .join(buckets, true())
+            .where(*conditions)
+            .group_by(isodow_expr, buckets.c.bucket)
+        )
+
+        cells = [
+            {
+                "weekday": row.isodow - 1,
+                "bucket": row.bucket,
+                "minutes": float(row.minutes),
+            }
+            for row in result.all()
+        ]
+        logger.debug(f"Time-of-day minutes: {len(cells)} non-empty buckets")
+        return cells
+
+    async def get_duration_distribution(
+        self, user_id: UUID, start: date, end: date
+    ) -> list[dict]:
+        """Get activity duration statistics per category, per group and overall.
+
+        One ``GROUPING SETS`` query with exact ``percentile_cont`` medians and
+        p90s; ``level`` is ``category``, ``group`` or ``overall``. Histogram
+        counts follow ``DURATION_HISTOGRAM_EDGES``.
+        """
+        logger.debug(
+            f"Fetching duration distribution for user {user_id} "
+            f"between {start} and {end}"
+        )
+
+        duration_expr = (
+            func.extract(
+                "epoch",
+                cast(Activity.end_time, INTERVAL) - cast(Activity.start_time, INTERVAL),
+            )
+            / 60
+        )
+        lower_edges = (None, *DURATION_HISTOGRAM_EDGES)
+        upper_edges = (*DURATION_HISTOGRAM_EDGES, None)
+        bins = []
+        for lower, upper in zip(lower_edges, upper_edges, strict=True):
+            conditions = []
+            if lower is not None:
+                conditions.append(duration_expr >= lower)
+            if upper is not None:
+                conditions.append(duration_expr < upper)
+            bins.append(func.count().filter(*conditions))
+
+        group_columns = (Group.id, Group.name, Group.color)
+        category_columns = (Category.id, Category.name)
+        result = await self.session.execute(
+            select(
+                Category.id.label("category_id"),
+                Category.name.label("category_name"),
+                Group.id.label("group_id"),
+                Group.name.label("group_name"),
+                Group.color.label("group_color"),
+                func.grouping(Category.id, Group.id).label("grouping"),
+                func.count().label("activities_count"),
+                func.avg(duration_expr).label("average"),
+                func.percentile_cont(0.5).within_group(duration_expr).label("median"),
+                func.percentile_cont(0.9).within_group(duration_expr).label("p90"),
+                func.max(duration_expr).label("longest"),
+                *(count.label(f"bin_{index}") for index, count in enumerate(bins)),
+            )
+            .join(Category, Activity.category_id == Category.id)
+            .join(Group, Category.group_id == Group.id)
+            .where(
+                Activity.user_id == user_id,
+                Activity.date >= start,
+                Activity.date <= end,
+                Activity.end_time.is_not(None),
+            )
+            .group_by(
+                func.grouping_sets(
+                    tuple_(*group_columns, *category_columns),
+                    tuple_(*group_columns),
+                    tuple_(),
+                )
+            )
+        )
+
+        # grouping() sets a bit per rolled-up column: 2 for the category, 1 for
+        # the group. The overall row is there even when nothing matched.
+        levels = {0: "category", 2: "group", 3: "overall"}
+        distribution = [
+            {
+                "level": levels[row.grouping],
+                "category_id": str(row.category_id) if row.category_id else None,
+                "category_name": row.category_name,
+                "group_id": str(row.group_id) if row.group_id else None,
+                "group_name": row.group_name,
+                "group_color": row.group_color,
+                "activities_count": row.activities_count,
+                "average_minutes": float(row.average or 0.0),
+                "median_minutes": float(row.median or 0.0),
+                "p90_minutes": float(row.p90 or 0.0),
+                "longest_minutes": float(row.longest or 0.0),
+                "histogram": [
+                    getattr(row, f"bin_{index}") for index in range(len(bins))
+                ],
+            }
+            for row in result.all()
+        ]
+        logger.debug(f"Duration distribution: {len(distribution)} rows")
+        return distribution
+
+    async def get_category_overview(
+        self,
+        user_id: UUID,
+        category_id: UUID,
+        first_week_start: date,
+        last_week_start: date,
+    ) -> dict | None:
+        """Get a category, its group and goals, and its weekly minutes.
+
+        Weekly minutes come from ``category_week_minutes``; weeks without
+        activities are left out. None when the user has no such category.
+        """
+        logger.debug(
+            f"Fetching overview of category {category_id} for user {user_id} "
+            f"between {first_week_start} and {last_week_start}"
+        )
+
+        result = await self.session.execute(
+            select(
+                Category.id,
+                Category.name,
+                Category.min_weekly_hours,
+                Category.target_weekly_hours,
+                Category.max_weekly_hours,
+                Group.id.label("group_id"),
+                Group.name.label("group_name"),
+                Group.color.label("group_color"),
+                CategoryWeekMinutes.week_start,
+                CategoryWeekMinutes.minutes,
+            )
+            .join(Group, Category.group_id == Group.id)
+            .outerjoin(
+                CategoryWeekMinutes,
+                (CategoryWeekMinutes.category_id == Category.id)
+                & (CategoryWeekMinutes.week_start >= first_week_start)
+                & (CategoryWeekMinutes.week_start <= last_week_start),
+            )
+            .where(Category.id == category_id, Category.user_id == user_id)
+        )
+
+        rows = result.all()
+        if not rows:
+            logger.debug(f"Category {category_id} not found")
+            return None
+
+        row = rows[0]
+        overview = {
+            "category_id": str(row.id),
+            "category_name": row.name,
+            "group_id": str(row.group_id),
+            "group_name": row.group_name,
+            "group_color": row.group_color,
+            "min_weekly_minutes": row.min_weekly_hours * 60,
+            "target_weekly_minutes": row.target_weekly_hours * 60,
+            "max_weekly_minutes": row.max_weekly_hours * 60,
+            "weeks": {
+                week.week_start: float(week.minutes)
+                for week in rows
+                if week.week_start is not None
+            },
+        }
+        logger.debug(f"Category overview: {len(overview['weeks'])} weeks")
+        return overview
+
+    async def get_category_task_counts(
+        self, user_id: UUID, category_id: UUID, start: date, end: date
+    ) -> dict:
+        """Count the tasks linked to a category's activities between two dates."""
+        logger.debug(
+            f"Fetching task counts of category {category_id} for user {user_id} "
+            f"between {start} and {end}"
+        )
+
+        result = await self.session.execute(
+            select(
+                func.count(func.distinct(Task.id)).label("linked"),
+                func.count(func.distinct(Task.id))
+                .filter(Task.status == "done")
+                .label("completed"),
+            )
+            .select_from(Activity)
+            .join(TaskActivity, TaskActivity.activity_id == Activity.id)
+            .join(Task, TaskActivity.task_id == Task.id)
+            .where(
+                Activity.user_id == user_id,
+                Activity.category_id == category_id,
+                Activity.date >= start,
+                Activity.date <= end,
+            )
+        )
+
+        row = result.one()
+        counts = {"linked_tasks": row.linked, "completed_tasks": row.completed}
+        logger.debug(f"Category task counts: {counts}")
+        return counts
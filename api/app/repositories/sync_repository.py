@@ -0,0 +1,91 @@
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.metrics import instrument_repository
+from app.models.activity import Activity, Category, Group
+from app.models.sync import SyncTombstone
+from app.models.task import Task, TaskActivity, TaskList
+from app.repositories.task_repository import TaskListRepository
+
+
+def _in_window(stmt: Select, column, since: int | None, until: int) -> Select:
+    """Rows written after ``since`` (everything when None) and up to ``until``."""
+    stmt = stmt.where(column <= until)
+    if since is not None:
+        stmt = stmt.where(column > since)
+    return stmt
+
+
+@instrument_repository
+class SyncRepository:
+    """Rows whose ``change_version`` falls in a sync window, per synced table.
+
+    Each query is served by the table's ``(user_id, change_version)`` index.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_changed(
+        self,
+        model: type[Group] | type[Category] | type[Activity],
+        user_id: UUID,
+        since: int | None,
+        until: int,
+    ) -> list:
+        stmt = select(model).where(model.user_id == user_id)
+        result = await self.session.execute(
+            _in_window(stmt, model.change_version, since, until)
+        )
+        return list(result.scalars().all())
+
+    async def get_changed_task_lists(
+        self, user_id: UUID, since: int | None, until: int
+    ) -> list[TaskList]:
+        stmt = TaskListRepository._with_task_counts(select(TaskList)).where(
+            TaskList.user_id == user_id
+        )
+        result = await self.session.execute(
+            _in_window(stmt, TaskList.change_version, since, until)
+        )
+        return list(result.scalars().all())
+
+    async def get_changed_tasks(
+        self, user_id: UUID, since: int | None, until: int
+    ) -> list[Task]:
+        stmt = (
+            select(Task)
+            .options(selectinload(Task.task_activities))
+            .where(Task.user_id == user_id)
+        )
+        result = await self.session.execute(
+            _in_window(stmt, Task.change_version, since, until)
+        )
+        return list(result.scalars().all())
+
+    async def get_changed_task_activities(
+        self, user_id: UUID, since: int | None, until: int
+    ) -> list[TaskActivity]:
+        stmt = (
+            select(TaskActivity)
+            .join(Task, Task.id == TaskActivity.task_id)
+            .where(Task.user_id == user_id)
+        )
+        result = await self.session.execute(
+            _in_window(stmt, TaskActivity.change_version, since, until)
+        )
+        return list(result.scalars().all())
+
+    async def get_tombstones(
+        self, user_id: UUID, since: int, until: int
+    ) -> list[SyncTombstone]:
+        stmt = select(SyncTombstone).where(SyncTombstone.user_id == user_id)
+        result = await self.session.execute(
+            _in_window(stmt, SyncTombstone.change_version, since, until).order_by(
+                SyncTombstone.id
+            )
+        )
+        return list(result.scalars().all())
@@ -1,23 +1,92 @@
+from datetime import date, datetime
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import (
+    Float,
+    Select,
+    column,
+    delete,
+    func,
+    or_,
+    select,
+    union,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, with_expression
 
 from app.models.task import Task, TaskActivity, TaskList
 from app.repositories.user_repository import BaseRepository
 
 
+async def _update_positions(
+    session: AsyncSession,
+    model: type[Task] | type[TaskList],
+    user_id: UUID,
+    moves: dict[UUID, float],
+) -> set[UUID]:
+    """Apply all moves with a single UPDATE ... FROM (VALUES ...).
+
+    The batch is committed only when every id belongs to the user; otherwise
+    it is rolled back and the ids that did match are returned so the caller
+    can report the missing ones.
+    """
+    moves_table = values(
+        column("id", PGUUID(as_uuid=True)),
+        column("position", Float),
+        name="moves",
+    ).data(list(moves.items()))
+    result = await session.execute(
+        update(model)
+        .where(model.id == moves_table.c.id, model.user_id == user_id)
+        .values(position=moves_table.c.position, updated_at=func.now())
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    updated_ids = set(result.scalars().all())
+    if len(updated_ids) == len(moves):
+        await session.commit()
+    else:
+        await session.rollback()
+    return updated_ids
+
+
 class TaskListRepository(BaseRepository[TaskList]):
     def __init__(self, session: AsyncSession):
         super().__init__(TaskList, session)
 
+    @staticmethod
+    def _with_task_counts(stmt: Select) -> Select:
+        """Load per-status task counts with a single grouped LEFT JOIN."""
+        task_count = func.count(Task.id)
+        return (
+            stmt.outerjoin(Task, Task.task_list_id == TaskList.id)
+            .options(
+                with_expression(TaskList.task_count, task_count),
+                with_expression(
+                    TaskList.todo_count, task_count.filter(Task.status == "todo")
+                ),
+                with_expression(
+                    TaskList.in_progress_count,
+                    task_count.filter(Task.status == "in_progress"),
+                ),
+                with_expression(
+                    TaskList.done_count, task_count.filter(Task.status == "done")
+                ),
+            )
+            .group_by(TaskList.id)
+            .execution_options(populate_existing=True)
+        )
+
     async def get_by_user(
         self, user_id: UUID, skip: int = 0, limit: int = 100
     ) -> list[TaskList]:
         result = await self.session.execute(
-            select(TaskList)
+            self._with_task_counts(select(TaskList))
             .where(TaskList.user_id == user_id)
+            .order_by(TaskList.position, TaskList.created_at)
             .offset(skip)
             .limit(limit)
         )
@@ -25,17 +94,37 @@ class TaskListRepository(BaseRepository[TaskList]):
 
     async def get_by_id_and_user(self, id: UUID, user_id: UUID) -> TaskList | None:
         result = await self.session.execute(
-            select(TaskList).where(TaskList.id == id, TaskList.user_id == user_id)
+            self._with_task_counts(select(TaskList)).where(
+                TaskList.id == id, TaskList.user_id == user_id
+            )
         )
         return result.scalars().first()
 
+    async def _reload(self, db_obj: TaskList) -> TaskList:
+        # Takes the place of session.refresh(), which would reset the counts.
+        result = await self.session.execute(
+            self._with_task_counts(select(TaskList)).where(TaskList.id == db_obj.id)
+        )
+        return result.scalars().one()
+
+    async def create(self, commit: bool = True, **kwargs) -> TaskList:
+        db_obj = TaskList(**kwargs)
+        self.session.add(db_obj)
+        if not commit:
+            await self.session.flush()
+            return db_obj
+        await self.session.commit()
+        return await self._reload(db_obj)
+
     async def update(self, db_obj: TaskList, obj_in_data: dict) -> TaskList:
         for field, value in obj_in_data.items():
             setattr(db_obj, field, value)
         self.session.add(db_obj)
         await self.session.commit()
-        await self.session.refresh(db_obj)
-        return db_obj
+        return await self._reload(db_obj)
+
+    async def reorder(self, user_id: UUID, moves: dict[UUID, float]) -> set[UUID]:
+        return await _update_positions(self.session, TaskList, user_id, moves)
 
     async def delete(self, id: UUID) -> None:
         await self.session.execute(delete(TaskList).where(TaskList.id == id))
@@ -87,28 +176,95 @@ class TaskRepository(BaseRepository[Task]):
         )
         return result.scalars().first()
 
-    async def update(self, db_obj: Task, obj_in_data: dict) -> Task:
-        for field, value in obj_in_data.items():
-            setattr(db_obj, field, value)
-        self.session.add(db_obj)
-        await self.session.commit()
-        result = await self.session.execute(
+    async def get_excluded_dates(self, task: Task) -> set[date]:
+        """Dates a recurring task must not produce an occurrence on.
+
+        The union of its stored exception dates and the dates already
+        materialised as one-off copies, both resolved in one query.
+        """
+        materialised = select(Task.scheduled_date.label("day")).where(
+            Task.user_id == task.user_id,
+            Task.task_list_id == task.task_list_id,
+            Task.title == task.title,
+            Task.id != task.id,
+            Task.scheduled_date.is_not(None),
+            Task.recurrence_rule.is_(None),
+        )
+        skipped = select(func.unnest(Task.exception_dates).label("day")).where(
+            Task.id == task.id
+        )
+        result = await self.session.execute(union(materialised, skipped))
+        return set(result.scalars().all())
+
+    async def get_skipped_on(
+        self, day: date, user_id: UUID | None = None
+    ) -> list[Task]:
+        """Recurring tasks with ``day`` in their exception dates.
+
+        The ``@>`` containment test is served by the GIN index on
+        ``exception_dates``, so omitting ``user_id`` stays cheap.
+        """
+        stmt = (
             select(Task)
             .options(selectinload(Task.task_activities))
-            .where(Task.id == db_obj.id)
+            .where(
+                Task.recurrence_rule.is_not(None),
+                Task.exception_dates.contains([day]),
+            )
         )
-        return result.scalars().one()
+        if user_id is not None:
+            stmt = stmt.where(Task.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
 
-    async def create(self, **kwargs) -> Task:
-        db_obj = Task(**kwargs)
-        self.session.add(db_obj)
-        await self.session.commit()
+    async def get_calendar_version(self, user_id: UUID) -> tuple[int, datetime | None]:
+        """Cheap change marker for the user's tasks: (row count, last update)."""
+        result = await self.session.execute(
+            select(func.count(Task.id), func.max(Task.updated_at)).where(
+                Task.user_id == user_id
+            )
+        )
+        count, last_updated_at = result.one()
+        return count, last_updated_at
+
+    async def get_calendar_tasks(self, user_id: UUID) -> list[Task]:
         result = await self.session.execute(
             select(Task)
-            .options(selectinload(Task.task_activities))
-            .where(Task.id == db_obj.id)
+            .where(
+                Task.user_id == user_id,
+                or_(
+                    Task.scheduled_date.is_not(None),
+                    Task.recurrence_rule.is_not(None),
+                ),
+            )
+            .order_by(Task.scheduled_date, Task.scheduled_start_time, Task.id)
         )
-        return result.scalars().one()
+        return list(result.scalars().all())
+
+    async def _save(self, db_obj: Task, commit: bool) -> Task:
+        # Task uses eager_defaults, so the INSERT/UPDATE itself returns the
+        # server-generated timestamps and no re-select is needed.
+        self.session.add(db_obj)
+        if commit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+        return db_obj
+
+    async def update(
+        self, db_obj: Task, obj_in_data: dict, commit: bool = True
+    ) -> Task:
+        for field, value in obj_in_data.items():
+            setattr(db_obj, field, value)
+        return await self._save(db_obj, commit)
+
+    async def create(self, commit: bool = True, **kwargs) -> Task:
+        # A new task has no links yet; marking the collection as loaded keeps
+        # activity_ids serialisable without a selectinload round trip.
+        return await self._save(Task(**kwargs, task_activities=[]), commit)
+
+    async def reorder(self, user_id: UUID, moves: dict[UUID, float]) -> set[UUID]:
+        return await _update_positions(self.session, Task, user_id, moves)
 
     async def delete(self, id: UUID) -> None:
         await self.session.execute(delete(Task).where(Task.id == id))
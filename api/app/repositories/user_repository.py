@@ -1,15 +1,30 @@
 from typing import Any, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import event, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.core.metrics import instrument_repository
 from app.db.session import Base
 from app.models.user import User
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+_CHANGE_VERSION_BUMPED = "change_version_bumped"
 
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_change_version_bumps(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_CHANGE_VERSION_BUMPED, None)
+
+
+@instrument_repository
 class BaseRepository[ModelType: Base]:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_repository(cls)
+
     def __init__(self, model: type[ModelType], session: AsyncSession):
         self.model = model
         self.session = session
@@ -26,13 +41,37 @@ class BaseRepository[ModelType: Base]:
         )
         return list(result.scalars().all())
 
-    async def create(self, **kwargs) -> ModelType:
+    async def create(self, commit: bool = True, **kwargs) -> ModelType:
         db_obj = self.model(**kwargs)
         self.session.add(db_obj)
+        if not commit:
+            # Server defaults come back through INSERT ... RETURNING.
+            await self.session.flush()
+            return db_obj
         await self.session.commit()
         await self.session.refresh(db_obj)
         return db_obj
 
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def bump_change_version(self, user_id: Any) -> None:
+        """Advance the user's change version inside the current transaction.
+
+        Call it before the write it accounts for, on the same session, so both
+        commit or roll back together. Repeated calls in one transaction issue
+        a single UPDATE.
+        """
+        bumped = self.session.info.setdefault(_CHANGE_VERSION_BUMPED, set())
+        if user_id in bumped:
+            return
+        await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(change_version=User.change_version + 1)
+        )
+        bumped.add(user_id)
+
 
 class UserRepository(BaseRepository[User]):
     def __init__(self, session: AsyncSession):
@@ -41,3 +80,29 @@ class UserRepository(BaseRepository[User]):
     async def get_by_email(self, email: str) -> User | None:
         result = await self.session.execute(select(User).where(User.email == email))
         return result.scalars().first()
+
+    async def get_change_version(self, user_id: Any) -> int | None:
+        result = await self.session.execute(
+            select(User.change_version).where(User.id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_calendar_token_version(self, user_id: Any) -> int | None:
+        result = await self.session.execute(
+            select(User.calendar_token_version).where(
+                User.id == user_id, User.is_active.is_(True)
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def rotate_calendar_token_version(self, user_id: Any) -> int:
+        """Advance the calendar token version, revoking every issued feed link."""
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(calendar_token_version=User.calendar_token_version + 1)
+            .returning(User.calendar_token_version)
+        )
+        version = result.scalar_one()
+        await self.session.commit()
+        return version
@@ -0,0 +1,85 @@
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from loguru import logger
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import instrument_repository
+from app.models.insights import WeeklyComparisonSnapshot
+from app.models.user import User
+
+
+@instrument_repository
+class WeeklySnapshotRepository:
+    """Weekly comparison payloads of ended weeks, keyed by (user, week start).
+
+    Writes must go to the primary; a trigger on ``activities`` deletes the
+    snapshots an activity write makes stale (see ``app.models.insights``).
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(
+        self, user_id: UUID, week_start: date, format_version: int
+    ) -> dict[str, Any] | None:
+        result = await self.session.execute(
+            select(WeeklyComparisonSnapshot.payload).where(
+                WeeklyComparisonSnapshot.user_id == user_id,
+                WeeklyComparisonSnapshot.week_start == week_start,
+                WeeklyComparisonSnapshot.format_version == format_version,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def save(
+        self,
+        user_id: UUID,
+        week_start: date,
+        format_version: int,
+        payload: dict[str, Any],
+        change_version: int,
+    ) -> bool:
+        """Store a payload computed at ``change_version``; False when stale.
+
+        The row is only written while the user is still at that version. The
+        version check holds a share lock on the user row. Writers take that
+        row's lock to bump the version before their first write, so a write
+        either commits first and fails the check, or waits and then deletes
+        the snapshot through the trigger.
+        """
+        columns = {
+            "user_id": User.id,
+            "week_start": literal(week_start),
+            "format_version": literal(format_version),
+            "change_version": User.change_version,
+            "payload": literal(payload, JSONB),
+        }
+        stmt = insert(WeeklyComparisonSnapshot).from_select(
+            list(columns),
+            select(*columns.values())
+            .where(User.id == user_id, User.change_version == change_version)
+            .with_for_update(read=True),
+        )
+        result = await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "week_start"],
+                set_={
+                    "format_version": stmt.excluded.format_version,
+                    "change_version": stmt.excluded.change_version,
+                    "payload": stmt.excluded.payload,
+                },
+            )
+        )
+        await self.session.commit()
+
+        saved = result.rowcount == 1
+        if not saved:
+            logger.debug(
+                f"Weekly snapshot for user {user_id} week {week_start} not saved: "
+                f"data changed after version {change_version}"
+            )
+        return saved
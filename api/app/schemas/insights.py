@@ -1,3 +1,5 @@
+from typing import Literal
+
 from app.schemas.base import CamelModel
 
 
@@ -125,3 +127,190 @@ class DailyComparisonResponse(CamelModel):
     top_categories: list[TopCategoryItem]
     stats: DailyStats
     productivity: ProductivityBreakdown | None
+
+
+class RangeGroupItem(CamelModel):
+    group_id: str
+    group_name: str
+    group_color: str | None
+    minutes: int
+    percent_of_total: float
+
+
+class RangeCategoryItem(CamelModel):
+    category_id: str
+    category_name: str
+    group_id: str
+    group_name: str
+    group_color: str | None
+    minutes: int
+    activities_count: int
+    percent_of_total: float
+
+
+class RangeSeriesPoint(CamelModel):
+    period_start: str
+    period_end: str
+    minutes: int
+    activities_count: int
+    group_minutes: dict[str, int]
+
+
+class RangeInsightsResponse(CamelModel):
+    start_date: str
+    end_date: str
+    granularity: Literal["day", "week", "month"]
+    total_minutes: int
+    activities_count: int
+    categories_used: int
+    average_daily_minutes: float
+    group_breakdown: list[RangeGroupItem]
+    category_breakdown: list[RangeCategoryItem]
+    series: list[RangeSeriesPoint]
+
+
+class TrendGroupItem(CamelModel):
+    group_id: str
+    group_name: str
+    group_color: str | None
+    minutes: int
+
+
+class TrendWeekItem(CamelModel):
+    week_start_date: str
+    week_end_date: str
+    total_minutes: int
+    total_minutes_delta: int
+    total_minutes_percent_change: float
+    rolling_average_minutes: float
+    group_minutes: dict[str, int]
+    goals_met: int
+    goal_attainment_percent: float
+
+
+class TrendsResponse(CamelModel):
+    start_date: str
+    end_date: str
+    weeks: int
+    rolling_window: int
+    total_minutes: int
+    average_weekly_minutes: float
+    goals_count: int
+    groups: list[TrendGroupItem]
+    series: list[TrendWeekItem]
+
+
+class HeatmapResponse(CamelModel):
+    start_date: str
+    end_date: str
+    bucket_minutes: int
+    total_minutes: int
+    max_bucket_minutes: float
+    # Occurrences of each weekday (Monday first) in the range.
+    weekday_counts: list[int]
+    # One row per weekday, Monday first; one column per bucket from midnight.
+    minutes: list[list[float]]
+
+
+class GoalWeekItem(CamelModel):
+    week_start_date: str
+    minutes: int
+    status: str
+
+
+class GoalBestWeek(CamelModel):
+    week_start_date: str
+    minutes: int
+
+
+class GoalHistoryItem(CamelModel):
+    category_id: str
+    category_name: str
+    min_weekly_minutes: int
+    target_weekly_minutes: int
+    max_weekly_minutes: int
+    current_streak: int
+    longest_streak: int
+    weeks_met: int
+    attainment_percent: float
+    best_week: GoalBestWeek | None
+    weeks: list[GoalWeekItem]
+
+
+class GoalHistoryResponse(CamelModel):
+    start_date: str
+    end_date: str
+    weeks: int
+    goals: list[GoalHistoryItem]
+
+
+class DurationHistogramBin(CamelModel):
+    min_minutes: int
+    # None for the last, open-ended bin.
+    max_minutes: int | None
+    count: int
+
+
+class DurationStats(CamelModel):
+    activities_count: int
+    average_minutes: float
+    median_minutes: float
+    p90_minutes: float
+    longest_minutes: float
+    histogram: list[DurationHistogramBin]
+
+
+class GroupDurationStats(DurationStats):
+    group_id: str
+    group_name: str
+    group_color: str | None
+
+
+class CategoryDurationStats(GroupDurationStats):
+    category_id: str
+    category_name: str
+
+
+class DurationStatsResponse(CamelModel):
+    start_date: str
+    end_date: str
+    overall: DurationStats
+    groups: list[GroupDurationStats]
+    categories: list[CategoryDurationStats]
+
+
+class CategoryDayItem(CamelModel):
+    date: str
+    minutes: int
+    activities_count: int
+
+
+class CategoryTaskCounts(CamelModel):
+    linked_tasks: int
+    completed_tasks: int
+
+
+class CategoryGoalSummary(CamelModel):
+    min_weekly_minutes: int
+    target_weekly_minutes: int
+    max_weekly_minutes: int
+    weeks_met: int
+    weeks: list[GoalWeekItem]
+
+
+class CategoryInsightsResponse(CamelModel):
+    category_id: str
+    category_name: str
+    group_id: str
+    group_name: str
+    group_color: str | None
+    start_date: str
+    end_date: str
+    total_minutes: int
+    activities_count: int
+    average_daily_minutes: float
+    daily: list[CategoryDayItem]
+    # Minutes per hour of the day, from midnight.
+    hourly_minutes: list[float]
+    tasks: CategoryTaskCounts
+    goal: CategoryGoalSummary | None
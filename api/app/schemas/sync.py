@@ -0,0 +1,38 @@
+from typing import Literal
+from uuid import UUID
+
+from app.schemas.activity import ActivityResponse, CategoryResponse, GroupResponse
+from app.schemas.base import CamelModel
+from app.schemas.task import TaskActivityResponse, TaskListResponse, TaskResponse
+
+
+class SyncDeletion(CamelModel):
+    entity: Literal[
+        "groups",
+        "categories",
+        "activities",
+        "task_lists",
+        "tasks",
+        "task_activities",
+    ]
+    id: UUID
+
+
+class SyncResponse(CamelModel):
+    """Rows created or updated after ``since`` and ids deleted since then.
+
+    Rows are sent as stored: activities carry no task fields and tasks list
+    only their own links, so clients join through ``task_activities``. When
+    ``reset`` is true the payload is a full snapshot and replaces local state.
+    Pass ``cursor`` as ``since`` on the next call.
+    """
+
+    cursor: int
+    reset: bool
+    groups: list[GroupResponse]
+    categories: list[CategoryResponse]
+    activities: list[ActivityResponse]
+    task_lists: list[TaskListResponse]
+    tasks: list[TaskResponse]
+    task_activities: list[TaskActivityResponse]
+    deleted: list[SyncDeletion]
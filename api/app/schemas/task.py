@@ -6,7 +6,7 @@ from datetime import datetime, time
 from typing import Literal
 from uuid import UUID
 
-from pydantic import field_validator
+from pydantic import Field, field_validator
 
 from app.schemas.base import CamelModel
 
@@ -17,7 +17,7 @@ class TaskListCreate(CamelModel):
     name: str
     color: str | None = None
     icon: str | None = None
-    position: int = 0
+    position: float = 0
 
     @field_validator("color")
     @classmethod
@@ -33,7 +33,7 @@ class TaskListUpdate(CamelModel):
     name: str | None = None
     color: str | None = None
     icon: str | None = None
-    position: int | None = None
+    position: float | None = None
 
     @field_validator("color")
     @classmethod
@@ -50,8 +50,11 @@ class TaskListResponse(CamelModel):
     name: str
     color: str | None
     icon: str | None
-    position: int
+    position: float
     task_count: int = 0
+    todo_count: int = 0
+    in_progress_count: int = 0
+    done_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -71,8 +74,8 @@ class TaskCreate(CamelModel):
     scheduled_end_time: time | None = None
     estimated_duration_minutes: int | None = None
     recurrence_rule: str | None = None
-    exception_dates: list[str] | None = None
-    position: int = 0
+    exception_dates: list[date_type] | None = None
+    position: float = 0
 
     @field_validator("scheduled_start_time", "scheduled_end_time", mode="before")
     @classmethod
@@ -119,8 +122,8 @@ class TaskUpdate(CamelModel):
     scheduled_end_time: time | None = None
     estimated_duration_minutes: int | None = None
     recurrence_rule: str | None = None
-    exception_dates: list[str] | None = None
-    position: int | None = None
+    exception_dates: list[date_type] | None = None
+    position: float | None = None
 
     @field_validator("scheduled_start_time", "scheduled_end_time", mode="before")
     @classmethod
@@ -151,8 +154,8 @@ class TaskResponse(CamelModel):
     scheduled_end_time: time | None
     estimated_duration_minutes: int | None
     recurrence_rule: str | None
-    exception_dates: list[str] | None
-    position: int
+    exception_dates: list[date_type] | None
+    position: float
     activity_ids: list[UUID] = []
     created_at: datetime
     updated_at: datetime
@@ -219,6 +222,33 @@ class TaskActivityResponse(CamelModel):
     created_at: datetime
 
 
+# ── Reordering ────────────────────────────────────────────────────────
+
+
+class PositionMove(CamelModel):
+    id: UUID
+    position: float = Field(allow_inf_nan=False)
+
+
+class ReorderRequest(CamelModel):
+    moves: list[PositionMove] = Field(min_length=1, max_length=500)
+
+    @field_validator("moves")
+    @classmethod
+    def validate_unique_ids(cls, v: list[PositionMove]) -> list[PositionMove]:
+        if len({move.id for move in v}) != len(v):
+            raise ValueError("Each item can only be moved once per request")
+        return v
+
+
+# ── Calendar feed ─────────────────────────────────────────────────────
+
+
+class CalendarTokenResponse(CamelModel):
+    token: str
+    feed_path: str
+
+
 class GenerateOccurrencesRequest(CamelModel):
     count: int = 10
-    exception_dates: list[str] | None = None
+    exception_dates: list[date_type] | None = None
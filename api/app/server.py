@@ -0,0 +1,101 @@
+"""Production entry point: ``python -m app.server``.
+
+Runs uvicorn with one worker per CPU the container may actually use, the
+uvloop event loop and the httptools parser. On SIGTERM uvicorn stops accepting
+connections, lets in-flight requests finish for up to
+``GRACEFUL_SHUTDOWN_TIMEOUT`` seconds, then runs the lifespan shutdown that
+disposes the database pool. Development keeps using ``uvicorn --reload``.
+"""
+
+import math
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from app.core.config import settings
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+
+def cpu_quota(cgroup_root: Path = CGROUP_ROOT) -> float | None:
+    """CPUs allowed by the cgroup CPU quota, or None when unlimited."""
+    cpu_max = cgroup_root / "cpu.max"
+    if cpu_max.exists():
+        quota, _, period = cpu_max.read_text().strip().partition(" ")
+        if quota == "max":
+            return None
+        return int(quota) / int(period or 100000)
+
+    quota_file = cgroup_root / "cpu" / "cpu.cfs_quota_us"
+    period_file = cgroup_root / "cpu" / "cpu.cfs_period_us"
+    if quota_file.exists() and period_file.exists():
+        quota = int(quota_file.read_text())
+        if quota <= 0:
+            return None
+        return quota / int(period_file.read_text())
+    return None
+
+
+def worker_count(cgroup_root: Path = CGROUP_ROOT) -> int:
+    if settings.WEB_CONCURRENCY:
+        return settings.WEB_CONCURRENCY
+    cpus = len(os.sched_getaffinity(0))
+    quota = cpu_quota(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
+
+
+def prepare_metrics_dir(workers: int) -> Path | None:
+    """Give the workers an empty, shared directory for metrics snapshots.
+
+    Each worker has its own registry, so with more than one ``/metrics`` must
+    merge what all of them wrote. Snapshots from a previous run are removed.
+    """
+    if workers == 1 and not settings.METRICS_MULTIPROC_DIR:
+        return None
+    directory = Path(
+        settings.METRICS_MULTIPROC_DIR or tempfile.mkdtemp(prefix="metrics-")
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    for stale in directory.glob("*.json"):
+        stale.unlink()
+    # Workers are spawned processes and read their settings from the env.
+    os.environ["METRICS_MULTIPROC_DIR"] = str(directory)
+    return directory
+
+
+def main() -> None:
+    workers = worker_count()
+    if workers > 1:
+        # Every worker would rotate the same files under logs/; stdout is
+        # collected by Docker instead.
+        os.environ["LOG_FILES"] = "false"
+    created_metrics_dir = not settings.METRICS_MULTIPROC_DIR
+    metrics_dir = prepare_metrics_dir(workers)
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=settings.HOST,
+            port=settings.PORT,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            backlog=settings.BACKLOG,
+            timeout_keep_alive=settings.KEEP_ALIVE_TIMEOUT,
+            timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_TIMEOUT,
+            proxy_headers=True,
+            forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+            # LoggingMiddleware already writes one record per request.
+            access_log=False,
+        )
+    finally:
+        if metrics_dir is not None and created_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -48,6 +48,7 @@ class ActivityService:
 
     async def create_group(self, data: GroupCreate, user_id: UUID) -> Group:
         logger.info(f"Creating group '{data.name}' for user_id={user_id}")
+        await self.group_repo.bump_change_version(user_id)
         group = await self.group_repo.create(**data.model_dump(), user_id=user_id)
         logger.success(
             f"Group created: id={group.id}, name='{group.name}', user_id={user_id}"
@@ -57,6 +58,7 @@ class ActivityService:
     async def update_group(self, id: UUID, data: GroupUpdate, user_id: UUID) -> Group:
         logger.info(f"Updating group id={id} for user_id={user_id}")
         group = await self.get_group(id, user_id)
+        await self.group_repo.bump_change_version(user_id)
         updated = await self.group_repo.update(
             group, data.model_dump(exclude_unset=True)
         )
@@ -66,6 +68,7 @@ class ActivityService:
     async def delete_group(self, id: UUID, user_id: UUID) -> None:
         logger.info(f"Deleting group id={id} for user_id={user_id}")
         await self.get_group(id, user_id)
+        await self.group_repo.bump_change_version(user_id)
         try:
             await self.group_repo.delete(id)
             logger.success(f"Group deleted: id={id}")
@@ -96,6 +99,7 @@ class ActivityService:
             f"group_id={data.group_id}"
         )
         await self.get_group(data.group_id, user_id)
+        await self.category_repo.bump_change_version(user_id)
         category = await self.category_repo.create(**data.model_dump(), user_id=user_id)
         logger.success(f"Category created: id={category.id}, name='{category.name}'")
         return category
@@ -107,6 +111,7 @@ class ActivityService:
         category = await self.get_category(id, user_id)
         if data.group_id:
             await self.get_group(data.group_id, user_id)
+        await self.category_repo.bump_change_version(user_id)
         updated = await self.category_repo.update(
             category, data.model_dump(exclude_unset=True)
         )
@@ -116,6 +121,7 @@ class ActivityService:
     async def delete_category(self, id: UUID, user_id: UUID) -> None:
         logger.info(f"Deleting category id={id} for user_id={user_id}")
         await self.get_category(id, user_id)
+        await self.category_repo.bump_change_version(user_id)
         await self.category_repo.delete(id)
         logger.success(f"Category deleted: id={id}")
 
@@ -143,13 +149,18 @@ class ActivityService:
             raise NotFoundError(resource="activity", resource_id=str(id))
         return activity
 
-    async def create_activity(self, data: ActivityCreate, user_id: UUID) -> Activity:
+    async def create_activity(
+        self, data: ActivityCreate, user_id: UUID, commit: bool = True
+    ) -> Activity:
         logger.info(
             f"Creating activity for user_id={user_id}, "
             f"category_id={data.category_id}, date={data.date}"
         )
         await self.get_category(data.category_id, user_id)
-        activity = await self.activity_repo.create(**data.model_dump(), user_id=user_id)
+        await self.activity_repo.bump_change_version(user_id)
+        activity = await self.activity_repo.create(
+            **data.model_dump(), user_id=user_id, commit=commit
+        )
         logger.success(
             f"Activity created: id={activity.id}, date={activity.date}, "
             f"{activity.start_time}-{activity.end_time}"
@@ -163,6 +174,7 @@ class ActivityService:
         activity = await self.get_activity(id, user_id)
         if data.category_id:
             await self.get_category(data.category_id, user_id)
+        await self.activity_repo.bump_change_version(user_id)
         updated = await self.activity_repo.update(
             activity, data.model_dump(exclude_unset=True)
         )
@@ -172,5 +184,6 @@ class ActivityService:
     async def delete_activity(self, id: UUID, user_id: UUID) -> None:
         logger.info(f"Deleting activity id={id} for user_id={user_id}")
         await self.get_activity(id, user_id)
+        await self.activity_repo.bump_change_version(user_id)
         await self.activity_repo.delete(id)
         logger.success(f"Activity deleted: id={id}")
@@ -0,0 +1,161 @@
+import hashlib
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
+from uuid import UUID
+
+from loguru import logger
+
+from app.models.task import Task
+from app.repositories.task_repository import TaskRepository
+
+# Bump when the rendered output changes so existing ETags stop matching.
+FEED_FORMAT_VERSION = "1"
+
+_MAX_LINE_OCTETS = 75
+
+
+def _escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> list[str]:
+    """Split a content line into 75-octet chunks (RFC 5545 section 3.1)."""
+    encoded = line.encode()
+    if len(encoded) <= _MAX_LINE_OCTETS:
+        return [line]
+
+    chunks: list[str] = []
+    current = ""
+    for char in line:
+        if len((current + char).encode()) > _MAX_LINE_OCTETS:
+            chunks.append(current)
+            current = " "
+        current += char
+    chunks.append(current)
+    return chunks
+
+
+def _format_date(value: date) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def _format_datetime(day: date, at: time) -> str:
+    return datetime.combine(day, at).strftime("%Y%m%dT%H%M%S")
+
+
+def _format_utc(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC)
+    return value.strftime("%Y%m%dT%H%M%SZ")
+
+
+def _rrule_lines(recurrence_rule: str) -> list[str]:
+    """Keep RRULE/EXRULE lines; DTSTART comes from the task itself."""
+    lines: list[str] = []
+    for raw_line in recurrence_rule.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        name = line.split(":", 1)[0].split(";", 1)[0].upper()
+        if name in {"RRULE", "EXRULE"}:
+            lines.append(line)
+        elif line.upper().startswith("FREQ="):
+            lines.append(f"RRULE:{line}")
+    return lines
+
+
+class CalendarService:
+    def __init__(self, task_repo: TaskRepository):
+        self.task_repo = task_repo
+
+    async def get_feed_etag(self, user_id: UUID) -> str:
+        count, last_updated_at = await self.task_repo.get_calendar_version(user_id)
+        marker = last_updated_at.isoformat() if last_updated_at else "-"
+        digest = hashlib.sha256(
+            f"{FEED_FORMAT_VERSION}:{user_id}:{count}:{marker}".encode()
+        ).hexdigest()
+        return f'"{digest[:32]}"'
+
+    async def render_feed(self, user_id: UUID) -> str:
+        logger.debug(f"Rendering calendar feed for user_id={user_id}")
+        tasks = await self.task_repo.get_calendar_tasks(user_id)
+
+        # Occurrences materialised by generate_occurrences are exported as
+        # their own events, so the series skips those dates.
+        materialised: dict[tuple[UUID, str], set[date]] = defaultdict(set)
+        for task in tasks:
+            if task.recurrence_rule is None and task.scheduled_date is not None:
+                materialised[(task.task_list_id, task.title)].add(task.scheduled_date)
+
+        lines = [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//ezlife//Tasks//EN",
+            "CALSCALE:GREGORIAN",
+            "X-WR-CALNAME:ezlife tasks",
+        ]
+        for task in tasks:
+            skipped_dates = (
+                materialised.get((task.task_list_id, task.title), set())
+                if task.recurrence_rule
+                else set()
+            )
+            lines.extend(self._render_event(task, skipped_dates))
+        lines.append("END:VCALENDAR")
+
+        logger.info(f"Calendar feed rendered: {len(tasks)} tasks for user_id={user_id}")
+        return "".join(f"{chunk}\r\n" for line in lines for chunk in _fold(line))
+
+    @staticmethod
+    def _render_event(task: Task, skipped_dates: set[date]) -> list[str]:
+        start_date = task.scheduled_date or task.created_at.date()
+        timed = task.scheduled_start_time is not None
+
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{task.id}@ezlife",
+            f"DTSTAMP:{_format_utc(task.updated_at)}",
+            f"LAST-MODIFIED:{_format_utc(task.updated_at)}",
+        ]
+        if timed:
+            lines.append(
+                f"DTSTART:{_format_datetime(start_date, task.scheduled_start_time)}"
+            )
+            if task.scheduled_end_time is not None:
+                lines.append(
+                    f"DTEND:{_format_datetime(start_date, task.scheduled_end_time)}"
+                )
+            elif task.estimated_duration_minutes:
+                lines.append(f"DURATION:PT{task.estimated_duration_minutes}M")
+        else:
+            lines.append(f"DTSTART;VALUE=DATE:{_format_date(start_date)}")
+            lines.append(
+                f"DTEND;VALUE=DATE:{_format_date(start_date + timedelta(days=1))}"
+            )
+
+        lines.append(f"SUMMARY:{_escape_text(task.title)}")
+        if task.description:
+            lines.append(f"DESCRIPTION:{_escape_text(task.description)}")
+
+        if task.recurrence_rule:
+            lines.extend(_rrule_lines(task.recurrence_rule))
+            excluded = sorted(set(task.exception_dates or []) | skipped_dates)
+            if excluded:
+                if timed:
+                    values = ",".join(
+                        _format_datetime(day, task.scheduled_start_time)
+                        for day in excluded
+                    )
+                    lines.append(f"EXDATE:{values}")
+                else:
+                    values = ",".join(_format_date(day) for day in excluded)
+                    lines.append(f"EXDATE;VALUE=DATE:{values}")
+
+        lines.append("END:VEVENT")
+        return lines
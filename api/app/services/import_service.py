@@ -8,6 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.activity import Activity, Category, Group
+from app.repositories.user_repository import UserRepository
 
 
 class ImportService:
@@ -37,6 +38,10 @@ class ImportService:
                 "errors": [f"Failed to load Excel file: {str(e)}"],
             }
 
+        # Before anything is flushed: the sync triggers stamp each row with
+        # the version current when it is inserted.
+        await UserRepository(self.session).bump_change_version(user_id)
+
         if "Paramètre" in workbook.sheetnames:
             logger.info("Processing 'Paramètre' sheet")
             parametre_sheet = workbook["Paramètre"]
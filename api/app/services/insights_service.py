@@ -3,12 +3,35 @@ from uuid import UUID
 
 from loguru import logger
 
-from app.repositories.insights_repository import InsightsRepository
+from app.exceptions import BadRequestError, NotFoundError
+from app.repositories.insights_repository import (
+    DURATION_HISTOGRAM_EDGES,
+    Granularity,
+    InsightsRepository,
+)
+from app.repositories.user_repository import UserRepository
+from app.repositories.weekly_snapshot_repository import WeeklySnapshotRepository
+
+# Two years at day granularity is the largest series a range request returns.
+MAX_RANGE_DAYS = 731
+HEATMAP_BUCKET_MINUTES = (15, 30, 60)
+# Bump when the weekly comparison payload changes shape; stored snapshots of
+# other versions are then recomputed on read.
+WEEKLY_SNAPSHOT_FORMAT = 1
 
 
 class InsightsService:
-    def __init__(self, insights_repo: InsightsRepository):
+    def __init__(
+        self,
+        insights_repo: InsightsRepository,
+        snapshot_repo: WeeklySnapshotRepository | None = None,
+        user_repo: UserRepository | None = None,
+    ):
+        """``snapshot_repo`` (on the primary) and ``user_repo`` (on the same
+        session as ``insights_repo``) enable weekly comparison snapshots."""
         self.insights_repo = insights_repo
+        self.snapshot_repo = snapshot_repo
+        self.user_repo = user_repo
 
     @staticmethod
     def _calculate_percent_change(current: float, previous: float) -> float:
@@ -16,6 +39,37 @@ class InsightsService:
             return 100.0 if current > 0 else 0.0
         return ((current - previous) / previous) * 100
 
+    @staticmethod
+    def _validate_range(start: date, end: date) -> int:
+        """Number of days from ``start`` to ``end`` inclusive."""
+        if end < start:
+            raise BadRequestError(detail="'to' must not be before 'from'")
+        days = (end - start).days + 1
+        if days > MAX_RANGE_DAYS:
+            raise BadRequestError(
+                detail=f"Date range is limited to {MAX_RANGE_DAYS} days"
+            )
+        return days
+
+    @staticmethod
+    def _period_start(any_date: date, granularity: Granularity) -> date:
+        """Same bucket as Postgres ``date_trunc`` (weeks start on Monday)."""
+        if granularity == "week":
+            return any_date - timedelta(days=any_date.weekday())
+        if granularity == "month":
+            return any_date.replace(day=1)
+        return any_date
+
+    @staticmethod
+    def _next_period(period_start: date, granularity: Granularity) -> date:
+        if granularity == "week":
+            return period_start + timedelta(days=7)
+        if granularity == "month":
+            if period_start.month == 12:
+                return period_start.replace(year=period_start.year + 1, month=1)
+            return period_start.replace(month=period_start.month + 1)
+        return period_start + timedelta(days=1)
+
     async def get_weekly_comparison(self, user_id: UUID, any_date: date) -> dict:
         logger.info(f"Generating weekly comparison for user {user_id} on {any_date}")
 
@@ -31,6 +85,23 @@ class InsightsService:
             f"Previous week: {previous_week_start} to {previous_week_end}"
         )
 
+        # An ended week's numbers only change when an activity of that week or
+        # of the week before is written, which deletes its snapshot. Names and
+        # goals stay as they were when the snapshot was taken.
+        week_closed = self.snapshot_repo is not None and current_week_end < date.today()
+        if week_closed:
+            snapshot = await self.snapshot_repo.get(
+                user_id, current_week_start, WEEKLY_SNAPSHOT_FORMAT
+            )
+            if snapshot is not None:
+                logger.info(
+                    f"Weekly comparison of {current_week_start} served from snapshot"
+                )
+                return snapshot
+            # Read before the data, on the same session: the snapshot is only
+            # stored if nothing was written since.
+            change_version = await self.user_repo.get_change_version(user_id)
+
         current_total = await self.insights_repo.get_week_total_minutes(
             user_id, current_week_start, current_week_end
         )
@@ -216,6 +287,15 @@ class InsightsService:
             f"{current_stats['activities_count']} activities"
         )
 
+        if week_closed and change_version is not None:
+            await self.snapshot_repo.save(
+                user_id,
+                current_week_start,
+                WEEKLY_SNAPSHOT_FORMAT,
+                result,
+                change_version,
+            )
+
         return result
 
     async def get_daily_comparison(self, user_id: UUID, target_date: date) -> dict:
@@ -390,3 +470,575 @@ class InsightsService:
         )
 
         return result
+
+    async def get_range_insights(
+        self, user_id: UUID, start: date, end: date, granularity: Granularity
+    ) -> dict:
+        logger.info(
+            f"Generating {granularity} range insights for user {user_id} "
+            f"from {start} to {end}"
+        )
+
+        days = self._validate_range(start, end)
+
+        rollup = await self.insights_repo.get_range_rollup(
+            user_id, start, end, granularity
+        )
+
+        groups: dict[str, dict] = {}
+        categories: dict[str, dict] = {}
+        periods: dict[date, dict] = {}
+        for row in rollup:
+            group = groups.setdefault(
+                row["group_id"],
+                {
+                    "group_id": row["group_id"],
+                    "group_name": row["group_name"],
+                    "group_color": row["group_color"],
+                    "minutes": 0.0,
+                },
+            )
+            group["minutes"] += row["minutes"]
+
+            category = categories.setdefault(
+                row["category_id"],
+                {
+                    "category_id": row["category_id"],
+                    "category_name": row["category_name"],
+                    "group_id": row["group_id"],
+                    "group_name": row["group_name"],
+                    "group_color": row["group_color"],
+                    "minutes": 0.0,
+                    "activities_count": 0,
+                },
+            )
+            category["minutes"] += row["minutes"]
+            category["activities_count"] += row["activities_count"]
+
+            period = periods.setdefault(
+                row["period_start"],
+                {"minutes": 0.0, "activities_count": 0, "group_minutes": {}},
+            )
+            period["minutes"] += row["minutes"]
+            period["activities_count"] += row["activities_count"]
+            period["group_minutes"][row["group_id"]] = (
+                period["group_minutes"].get(row["group_id"], 0.0) + row["minutes"]
+            )
+
+        total = sum(group["minutes"] for group in groups.values())
+        activities_count = sum(c["activities_count"] for c in categories.values())
+
+        def percent_of_total(minutes: float) -> float:
+            return (minutes / total * 100) if total > 0 else 0.0
+
+        group_breakdown = [
+            {
+                **group,
+                "minutes": int(group["minutes"]),
+                "percent_of_total": percent_of_total(group["minutes"]),
+            }
+            for group in sorted(
+                groups.values(), key=lambda item: item["minutes"], reverse=True
+            )
+        ]
+        category_breakdown = [
+            {
+                **category,
+                "minutes": int(category["minutes"]),
+                "percent_of_total": percent_of_total(category["minutes"]),
+            }
+            for category in sorted(
+                categories.values(), key=lambda item: item["minutes"], reverse=True
+            )
+        ]
+
+        # Every period in the range, empty ones included; the first and last
+        # are clipped to the requested dates.
+        series = []
+        period_start = self._period_start(start, granularity)
+        while period_start <= end:
+            next_start = self._next_period(period_start, granularity)
+            period = periods.get(
+                period_start,
+                {"minutes": 0.0, "activities_count": 0, "group_minutes": {}},
+            )
+            series.append(
+                {
+                    "period_start": max(period_start, start).isoformat(),
+                    "period_end": min(next_start - timedelta(days=1), end).isoformat(),
+                    "minutes": int(period["minutes"]),
+                    "activities_count": period["activities_count"],
+                    "group_minutes": {
+                        group_id: int(minutes)
+                        for group_id, minutes in period["group_minutes"].items()
+                    },
+                }
+            )
+            period_start = next_start
+
+        result = {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "granularity": granularity,
+            "total_minutes": int(total),
+            "activities_count": activities_count,
+            "categories_used": len(categories),
+            "average_daily_minutes": total / days,
+            "group_breakdown": group_breakdown,
+            "category_breakdown": category_breakdown,
+            "series": series,
+        }
+
+        logger.info(
+            f"Range insights generated: {total} mins total over {days} days, "
+            f"{len(series)} periods"
+        )
+
+        return result
+
+    async def get_trends(
+        self, user_id: UUID, any_date: date, weeks: int, window: int
+    ) -> dict:
+        """Per-week totals, group minutes and goal attainment for the last N weeks.
+
+        Built from one (week x category) rollup in a single pass. The rollup
+        starts ``window - 1`` weeks early (at least one) so the first weeks
+        still get a full rolling average and a week-over-week delta. Goals are
+        the categories' current ones.
+        """
+        logger.info(
+            f"Generating {weeks}-week trends for user {user_id} up to {any_date}"
+        )
+
+        last_week_start, last_week_end = self.insights_repo._get_week_bounds(any_date)
+        first_week_start = last_week_start - timedelta(weeks=weeks - 1)
+        lead = max(window, 2) - 1
+        rollup_start = first_week_start - timedelta(weeks=lead)
+
+        rollup = await self.insights_repo.get_range_rollup(
+            user_id, rollup_start, last_week_end, "week"
+        )
+        goal_categories = await self.insights_repo.get_goal_categories(user_id)
+
+        # Row per week, column per category.
+        week_count = lead + weeks
+        category_index: dict[str, int] = {}
+        category_groups: list[str] = []
+        groups: dict[str, dict] = {}
+        matrix: list[list[float]] = [[] for _ in range(week_count)]
+        for row in rollup:
+            column = category_index.get(row["category_id"])
+            if column is None:
+                column = category_index[row["category_id"]] = len(category_index)
+                category_groups.append(row["group_id"])
+                for cells in matrix:
+                    cells.append(0.0)
+            matrix[(row["period_start"] - rollup_start).days // 7][column] = row[
+                "minutes"
+            ]
+            group = groups.setdefault(
+                row["group_id"],
+                {
+                    "group_id": row["group_id"],
+                    "group_name": row["group_name"],
+                    "group_color": row["group_color"],
+                    "minutes": 0.0,
+                },
+            )
+            if row["period_start"] >= first_week_start:
+                group["minutes"] += row["minutes"]
+
+        goals = [
+            (
+                category_index.get(str(cat.id)),
+                cat.min_weekly_hours * 60,
+                cat.target_weekly_hours * 60,
+                cat.max_weekly_hours * 60,
+            )
+            for cat in goal_categories
+        ]
+
+        series = []
+        window_sum = 0.0
+        totals: list[float] = []
+        for week, cells in enumerate(matrix):
+            total = sum(cells)
+            totals.append(total)
+            window_sum += total
+            if week >= window:
+                window_sum -= totals[week - window]
+            if week < lead:
+                continue
+
+            group_minutes: dict[str, float] = {}
+            for column, minutes in enumerate(cells):
+                if minutes:
+                    group_id = category_groups[column]
+                    group_minutes[group_id] = group_minutes.get(group_id, 0.0) + minutes
+
+            goals_met = 0
+            for column, min_minutes, target_minutes, max_minutes in goals:
+                minutes = cells[column] if column is not None else 0.0
+                status = self.insights_repo._get_goal_status(
+                    minutes, min_minutes, target_minutes, max_minutes
+                )
+                if status in ("target_met", "over"):
+                    goals_met += 1
+
+            previous_total = totals[week - 1]
+            week_start = rollup_start + timedelta(weeks=week)
+            series.append(
+                {
+                    "week_start_date": week_start.isoformat(),
+                    "week_end_date": (week_start + timedelta(days=6)).isoformat(),
+                    "total_minutes": int(total),
+                    "total_minutes_delta": int(total - previous_total),
+                    "total_minutes_percent_change": self._calculate_percent_change(
+                        total, previous_total
+                    ),
+                    "rolling_average_minutes": window_sum / window,
+                    "group_minutes": {
+                        group_id: int(minutes)
+                        for group_id, minutes in group_minutes.items()
+                    },
+                    "goals_met": goals_met,
+                    "goal_attainment_percent": (
+                        (goals_met / len(goals) * 100) if goals else 0.0
+                    ),
+                }
+            )
+
+        total_minutes = sum(totals[lead:])
+        result = {
+            "start_date": first_week_start.isoformat(),
+            "end_date": last_week_end.isoformat(),
+            "weeks": weeks,
+            "rolling_window": window,
+            "total_minutes": int(total_minutes),
+            "average_weekly_minutes": total_minutes / weeks,
+            "goals_count": len(goals),
+            "groups": [
+                {**group, "minutes": int(group["minutes"])}
+                for group in sorted(
+                    groups.values(), key=lambda item: item["minutes"], reverse=True
+                )
+                if group["minutes"] > 0
+            ],
+            "series": series,
+        }
+
+        logger.info(
+            f"Trends generated: {weeks} weeks, {len(category_index)} categories, "
+            f"{total_minutes} mins total"
+        )
+
+        return result
+
+    async def get_heatmap(
+        self, user_id: UUID, start: date, end: date, bucket_minutes: int
+    ) -> dict:
+        logger.info(
+            f"Generating heatmap for user {user_id} from {start} to {end} "
+            f"({bucket_minutes} minute buckets)"
+        )
+
+        days = self._validate_range(start, end)
+        if bucket_minutes not in HEATMAP_BUCKET_MINUTES:
+            raise BadRequestError(
+                detail=f"bucket_minutes must be one of {HEATMAP_BUCKET_MINUTES}"
+            )
+
+        cells = await self.insights_repo.get_time_of_day_minutes(
+            user_id, start, end, bucket_minutes
+        )
+
+        matrix = [[0.0] * (24 * 60 // bucket_minutes) for _ in range(7)]
+        for cell in cells:
+            matrix[cell["weekday"]][cell["bucket"]] = cell["minutes"]
+
+        # How often each weekday occurs in the range, to turn sums into averages.
+        weekday_counts = [days // 7] * 7
+        for offset in range(days % 7):
+            weekday_counts[(start.weekday() + offset) % 7] += 1
+
+        total = sum(cell["minutes"] for cell in cells)
+        result = {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "bucket_minutes": bucket_minutes,
+            "total_minutes": int(total),
+            "max_bucket_minutes": max((cell["minutes"] for cell in cells), default=0.0),
+            "weekday_counts": weekday_counts,
+            "minutes": matrix,
+        }
+
+        logger.info(
+            f"Heatmap generated: {total} mins in {len(cells)} non-empty buckets"
+        )
+
+        return result
+
+    async def get_goal_history(self, user_id: UUID, any_date: date, weeks: int) -> dict:
+        """Streaks, best week and attainment rate per goal category.
+
+        A week is met when it reaches the target (``target_met`` or ``over``).
+        The week in progress does not break a streak or count against the
+        attainment rate until it is over; once met it counts right away.
+        """
+        logger.info(
+            f"Generating {weeks}-week goal history for user {user_id} up to {any_date}"
+        )
+
+        last_week_start, last_week_end = self.insights_repo._get_week_bounds(any_date)
+        first_week_start = last_week_start - timedelta(weeks=weeks - 1)
+        week_starts = [first_week_start + timedelta(weeks=w) for w in range(weeks)]
+        in_progress = last_week_end >= date.today()
+
+        history = await self.insights_repo.get_goal_history(
+            user_id, first_week_start, last_week_start
+        )
+
+        goals = []
+        for category in history:
+            weekly = []
+            streak = longest_streak = weeks_met = 0
+            for week_start in week_starts:
+                minutes = category["weeks"].get(week_start, 0.0)
+                status = self.insights_repo._get_goal_status(
+                    minutes,
+                    category["min_weekly_minutes"],
+                    category["target_weekly_minutes"],
+                    category["max_weekly_minutes"],
+                )
+                weekly.append(
+                    {
+                        "week_start_date": week_start.isoformat(),
+                        "minutes": int(minutes),
+                        "status": status,
+                    }
+                )
+                if status in ("target_met", "over"):
+                    weeks_met += 1
+                    streak += 1
+                    longest_streak = max(longest_streak, streak)
+                elif not (in_progress and week_start == last_week_start):
+                    streak = 0
+
+            evaluated_weeks = weeks
+            if in_progress and weekly[-1]["status"] not in ("target_met", "over"):
+                evaluated_weeks -= 1
+
+            best = max(weekly, key=lambda week: week["minutes"])
+            goals.append(
+                {
+                    "category_id": category["category_id"],
+                    "category_name": category["category_name"],
+                    "min_weekly_minutes": int(category["min_weekly_minutes"]),
+                    "target_weekly_minutes": int(category["target_weekly_minutes"]),
+                    "max_weekly_minutes": int(category["max_weekly_minutes"]),
+                    "current_streak": streak,
+                    "longest_streak": longest_streak,
+                    "weeks_met": weeks_met,
+                    "attainment_percent": (
+                        (weeks_met / evaluated_weeks * 100) if evaluated_weeks else 0.0
+                    ),
+                    "best_week": (
+                        {
+                            "week_start_date": best["week_start_date"],
+                            "minutes": best["minutes"],
+                        }
+                        if best["minutes"] > 0
+                        else None
+                    ),
+                    "weeks": weekly,
+                }
+            )
+
+        result = {
+            "start_date": first_week_start.isoformat(),
+            "end_date": last_week_end.isoformat(),
+            "weeks": weeks,
+            "goals": goals,
+        }
+
+        logger.info(f"Goal history generated: {len(goals)} categories with goals")
+
+        return result
+
+    async def get_duration_stats(self, user_id: UUID, start: date, end: date) -> dict:
+        logger.info(
+            f"Generating duration statistics for user {user_id} from {start} to {end}"
+        )
+
+        self._validate_range(start, end)
+
+        rows = await self.insights_repo.get_duration_distribution(user_id, start, end)
+
+        bounds = list(
+            zip(
+                (0, *DURATION_HISTOGRAM_EDGES),
+                (*DURATION_HISTOGRAM_EDGES, None),
+                strict=True,
+            )
+        )
+
+        def stats(row: dict) -> dict:
+            return {
+                "activities_count": row["activities_count"],
+                "average_minutes": row["average_minutes"],
+                "median_minutes": row["median_minutes"],
+                "p90_minutes": row["p90_minutes"],
+                "longest_minutes": row["longest_minutes"],
+                "histogram": [
+                    {"min_minutes": lower, "max_minutes": upper, "count": count}
+                    for (lower, upper), count in zip(
+                        bounds, row["histogram"], strict=True
+                    )
+                ],
+            }
+
+        overall = None
+        groups = []
+        categories = []
+        for row in sorted(
+            rows, key=lambda item: item["activities_count"], reverse=True
+        ):
+            if row["level"] == "overall":
+                overall = stats(row)
+                continue
+            item = {
+                "group_id": row["group_id"],
+                "group_name": row["group_name"],
+                "group_color": row["group_color"],
+                **stats(row),
+            }
+            if row["level"] == "group":
+                groups.append(item)
+            else:
+                categories.append(
+                    {
+                        "category_id": row["category_id"],
+                        "category_name": row["category_name"],
+                        **item,
+                    }
+                )
+
+        result = {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "overall": overall,
+            "groups": groups,
+            "categories": categories,
+        }
+
+        logger.info(
+            f"Duration statistics generated: {overall['activities_count']} "
+            f"activities, {len(categories)} categories"
+        )
+
+        return result
+
+    async def get_category_insights(
+        self, user_id: UUID, category_id: UUID, start: date, end: date
+    ) -> dict:
+        """Drill-down for one category: daily series, hours of the day, linked
+        tasks and, when it has a target, goal status of the weeks in range.
+
+        Goal weeks are whole Monday-Sunday weeks, including the days of the
+        first and last week that fall outside the range.
+        """
+        logger.info(
+            f"Generating insights for category {category_id} of user {user_id} "
+            f"from {start} to {end}"
+        )
+
+        days = self._validate_range(start, end)
+        first_week_start, _ = self.insights_repo._get_week_bounds(start)
+        last_week_start, _ = self.insights_repo._get_week_bounds(end)
+
+        overview = await self.insights_repo.get_category_overview(
+            user_id, category_id, first_week_start, last_week_start
+        )
+        if overview is None:
+            raise NotFoundError(resource="category", resource_id=str(category_id))
+
+        rollup = await self.insights_repo.get_range_rollup(
+            user_id, start, end, "day", category_id=category_id
+        )
+        cells = await self.insights_repo.get_time_of_day_minutes(
+            user_id, start, end, 60, category_id=category_id
+        )
+        task_counts = await self.insights_repo.get_category_task_counts(
+            user_id, category_id, start, end
+        )
+
+        by_day = {row["period_start"]: row for row in rollup}
+        daily = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            row = by_day.get(day)
+            daily.append(
+                {
+                    "date": day.isoformat(),
+                    "minutes": int(row["minutes"]) if row else 0,
+                    "activities_count": row["activities_count"] if row else 0,
+                }
+            )
+
+        hourly_minutes = [0.0] * 24
+        for cell in cells:
+            hourly_minutes[cell["bucket"]] += cell["minutes"]
+
+        goal = None
+        if overview["target_weekly_minutes"] > 0:
+            weeks = []
+            week_start = first_week_start
+            while week_start <= last_week_start:
+                minutes = overview["weeks"].get(week_start, 0.0)
+                weeks.append(
+                    {
+                        "week_start_date": week_start.isoformat(),
+                        "minutes": int(minutes),
+                        "status": self.insights_repo._get_goal_status(
+                            minutes,
+                            overview["min_weekly_minutes"],
+                            overview["target_weekly_minutes"],
+                            overview["max_weekly_minutes"],
+                        ),
+                    }
+                )
+                week_start += timedelta(weeks=1)
+            goal = {
+                "min_weekly_minutes": int(overview["min_weekly_minutes"]),
+                "target_weekly_minutes": int(overview["target_weekly_minutes"]),
+                "max_weekly_minutes": int(overview["max_weekly_minutes"]),
+                "weeks_met": sum(
+                    week["status"] in ("target_met", "over") for week in weeks
+                ),
+                "weeks": weeks,
+            }
+
+        total = sum(row["minutes"] for row in rollup)
+        result = {
+            "category_id": overview["category_id"],
+            "category_name": overview["category_name"],
+            "group_id": overview["group_id"],
+            "group_name": overview["group_name"],
+            "group_color": overview["group_color"],
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "total_minutes": int(total),
+            "activities_count": sum(row["activities_count"] for row in rollup),
+            "average_daily_minutes": total / days,
+            "daily": daily,
+            "hourly_minutes": hourly_minutes,
+            "tasks": task_counts,
+            "goal": goal,
+        }
+
+        logger.info(
+            f"Category insights generated: {total} mins over {days} days, "
+            f"{task_counts['linked_tasks']} linked tasks"
+        )
+
+        return result
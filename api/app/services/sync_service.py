@@ -0,0 +1,83 @@
+from uuid import UUID
+
+from loguru import logger
+
+from app.models.activity import Activity, Category, Group
+from app.repositories.sync_repository import SyncRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.sync import SyncDeletion, SyncResponse
+from app.schemas.task import TaskResponse
+
+
+class SyncService:
+    def __init__(self, sync_repo: SyncRepository, user_repo: UserRepository):
+        self.sync_repo = sync_repo
+        self.user_repo = user_repo
+
+    async def get_changes(self, user_id: UUID, since: int | None) -> SyncResponse:
+        """Everything written after ``since``, up to the user's current version.
+
+        Every write transaction bumps the version while holding the user's row
+        lock and rows are stamped with it, so all rows at or below the version
+        read here are committed; later ones are above it and go out on the
+        next call. The cursor therefore never skips a row, whatever order
+        concurrent transactions commit in.
+        """
+        cursor = await self.user_repo.get_change_version(user_id) or 0
+        reset = since is None or since > cursor
+        if since is not None and since > cursor:
+            logger.warning(
+                f"Sync cursor {since} is ahead of version {cursor} for "
+                f"user_id={user_id}; sending a full snapshot"
+            )
+        window_start = None if reset else since
+        logger.debug(
+            f"Syncing user_id={user_id} from {window_start} to version {cursor}"
+        )
+
+        groups = await self.sync_repo.get_changed(Group, user_id, window_start, cursor)
+        categories = await self.sync_repo.get_changed(
+            Category, user_id, window_start, cursor
+        )
+        activities = await self.sync_repo.get_changed(
+            Activity, user_id, window_start, cursor
+        )
+        task_lists = await self.sync_repo.get_changed_task_lists(
+            user_id, window_start, cursor
+        )
+        tasks = await self.sync_repo.get_changed_tasks(user_id, window_start, cursor)
+        task_activities = await self.sync_repo.get_changed_task_activities(
+            user_id, window_start, cursor
+        )
+        tombstones = (
+            []
+            if window_start is None
+            else await self.sync_repo.get_tombstones(user_id, window_start, cursor)
+        )
+
+        task_responses = []
+        for task in tasks:
+            task_response = TaskResponse.model_validate(task)
+            task_response.activity_ids = [ta.activity_id for ta in task.task_activities]
+            task_responses.append(task_response)
+
+        logger.info(
+            f"Sync for user_id={user_id}: {len(groups)} groups, "
+            f"{len(categories)} categories, {len(activities)} activities, "
+            f"{len(task_lists)} task lists, {len(tasks)} tasks, "
+            f"{len(task_activities)} links, {len(tombstones)} deletions"
+        )
+        return SyncResponse(
+            cursor=cursor,
+            reset=reset,
+            groups=groups,
+            categories=categories,
+            activities=activities,
+            task_lists=task_lists,
+            tasks=task_responses,
+            task_activities=task_activities,
+            deleted=[
+                SyncDeletion(entity=tombstone.entity, id=tombstone.entity_id)
+                for tombstone in tombstones
+            ],
+        )
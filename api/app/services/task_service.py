@@ -16,6 +16,7 @@ from app.repositories.task_repository import (
 from app.schemas.activity import ActivityCreate
 from app.schemas.task import (
     ConvertToActivityRequest,
+    ReorderRequest,
     TaskCompleteRequest,
     TaskCreate,
     TaskListCreate,
@@ -54,6 +55,7 @@ class TaskService:
 
     async def create_task_list(self, data: TaskListCreate, user_id: UUID) -> TaskList:
         logger.info(f"Creating task list '{data.name}' for user_id={user_id}")
+        await self.task_list_repo.bump_change_version(user_id)
         task_list = await self.task_list_repo.create(
             **data.model_dump(),
             user_id=user_id,
@@ -69,6 +71,7 @@ class TaskService:
     ) -> TaskList:
         logger.info(f"Updating task list id={id} for user_id={user_id}")
         task_list = await self.get_task_list(id, user_id)
+        await self.task_list_repo.bump_change_version(user_id)
         updated = await self.task_list_repo.update(
             task_list, data.model_dump(exclude_unset=True)
         )
@@ -78,6 +81,7 @@ class TaskService:
     async def delete_task_list(self, id: UUID, user_id: UUID) -> None:
         logger.info(f"Deleting task list id={id} for user_id={user_id}")
         await self.get_task_list(id, user_id)
+        await self.task_list_repo.bump_change_version(user_id)
         try:
             await self.task_list_repo.delete(id)
             logger.success(f"Task list deleted: id={id}")
@@ -88,6 +92,22 @@ class TaskService:
                 detail="Cannot delete task list because it has associated tasks",
             ) from e
 
+    async def reorder_task_lists(self, data: ReorderRequest, user_id: UUID) -> None:
+        logger.info(f"Reordering {len(data.moves)} task lists for user_id={user_id}")
+        moves = {move.id: move.position for move in data.moves}
+        await self.task_list_repo.bump_change_version(user_id)
+        updated_ids = await self.task_list_repo.reorder(user_id, moves)
+        missing_ids = moves.keys() - updated_ids
+        if missing_ids:
+            logger.warning(
+                f"Task list reorder rejected for user_id={user_id}: "
+                f"unknown ids={sorted(map(str, missing_ids))}"
+            )
+            raise NotFoundError(
+                resource="task list", resource_id=str(next(iter(missing_ids)))
+            )
+        logger.success(f"Task lists reordered: count={len(moves)}")
+
     async def get_tasks(
         self,
         user_id: UUID,
@@ -136,6 +156,14 @@ class TaskService:
             raise NotFoundError(resource="task", resource_id=str(id))
         return task
 
+    async def get_tasks_skipped_on(self, user_id: UUID, day: date) -> list[Task]:
+        logger.debug(f"Fetching recurring tasks skipped on {day} for user_id={user_id}")
+        tasks = await self.task_repo.get_skipped_on(day, user_id=user_id)
+        logger.info(
+            f"Found {len(tasks)} recurring tasks skipped on {day} for user_id={user_id}"
+        )
+        return tasks
+
     async def create_task(self, data: TaskCreate, user_id: UUID) -> Task:
         logger.info(
             f"Creating task '{data.title}' for user_id={user_id}, "
@@ -144,6 +172,7 @@ class TaskService:
         await self.get_task_list(data.task_list_id, user_id)
         if data.category_id:
             await self.activity_service.get_category(data.category_id, user_id)
+        await self.task_repo.bump_change_version(user_id)
         task = await self.task_repo.create(**data.model_dump(), user_id=user_id)
         logger.success(f"Task created: id={task.id}, title='{task.title}'")
         return task
@@ -161,6 +190,7 @@ class TaskService:
                 user_id,
             )
 
+        await self.task_repo.bump_change_version(user_id)
         updated = await self.task_repo.update(task, update_data)
         logger.success(f"Task updated: id={id}")
         return updated
@@ -168,6 +198,7 @@ class TaskService:
     async def delete_task(self, id: UUID, user_id: UUID) -> None:
         logger.info(f"Deleting task id={id} for user_id={user_id}")
         await self.get_task(id, user_id)
+        await self.task_repo.bump_change_version(user_id)
         try:
             await self.task_repo.delete(id)
             logger.success(f"Task deleted: id={id}")
@@ -178,6 +209,22 @@ class TaskService:
                 detail="Cannot delete task because it has associated dependencies",
             ) from e
 
+    async def reorder_tasks(self, data: ReorderRequest, user_id: UUID) -> None:
+        logger.info(f"Reordering {len(data.moves)} tasks for user_id={user_id}")
+        moves = {move.id: move.position for move in data.moves}
+        await self.task_repo.bump_change_version(user_id)
+        updated_ids = await self.task_repo.reorder(user_id, moves)
+        missing_ids = moves.keys() - updated_ids
+        if missing_ids:
+            logger.warning(
+                f"Task reorder rejected for user_id={user_id}: "
+                f"unknown ids={sorted(map(str, missing_ids))}"
+            )
+            raise NotFoundError(
+                resource="task", resource_id=str(next(iter(missing_ids)))
+            )
+        logger.success(f"Tasks reordered: count={len(moves)}")
+
     async def generate_occurrences(
         self,
         id: UUID,
@@ -215,35 +262,23 @@ class TaskService:
 
         rule = cast(rrule | rruleset, parsed_rule)
 
-        excluded_dates = set(task.exception_dates or [])
-        all_user_tasks = await self.task_repo.get_by_user(user_id)
-        existing_occurrence_dates = {
-            existing_task.scheduled_date.isoformat()
-            for existing_task in all_user_tasks
-            if existing_task.id != task.id
-            and existing_task.task_list_id == task.task_list_id
-            and existing_task.title == task.title
-            and existing_task.scheduled_date is not None
-            and not existing_task.recurrence_rule
-        }
+        excluded_dates = await self.task_repo.get_excluded_dates(task)
 
         current_occurrence = rule.after(
             datetime.combine(task_start_date, datetime.min.time()),
             inc=True,
         )
 
+        # Discarded with the transaction when nothing is created.
+        await self.task_repo.bump_change_version(user_id)
         created_tasks: list[Task] = []
         while current_occurrence and len(created_tasks) < count:
             occurrence_date = current_occurrence.date()
-            occurrence_date_str = occurrence_date.isoformat()
             if occurrence_date <= task_start_date:
                 current_occurrence = rule.after(current_occurrence, inc=False)
                 continue
 
-            if (
-                occurrence_date_str in excluded_dates
-                or occurrence_date_str in existing_occurrence_dates
-            ):
+            if occurrence_date in excluded_dates:
                 current_occurrence = rule.after(current_occurrence, inc=False)
                 continue
 
@@ -261,11 +296,15 @@ class TaskService:
                 scheduled_end_time=task.scheduled_end_time,
                 estimated_duration_minutes=task.estimated_duration_minutes,
                 position=task.position,
+                commit=False,
             )
             created_tasks.append(new_task)
-            existing_occurrence_dates.add(occurrence_date_str)
+            excluded_dates.add(occurrence_date)
             current_occurrence = rule.after(current_occurrence, inc=False)
 
+        if created_tasks:
+            await self.task_repo.commit()
+
         logger.success(
             f"Generated {len(created_tasks)} occurrences for task "
             f"id={id}, user_id={user_id}"
@@ -326,10 +365,9 @@ class TaskService:
     ) -> Task:
         logger.info(f"Completing task id={id} for user_id={user_id}")
         task = await self.get_task(id, user_id)
-        updated_task = await self.task_repo.update(task, {"status": "done"})
 
+        activity_data: ActivityCreate | None = None
         if data.add_to_tracker:
-            logger.info(f"Creating activity from completed task id={id}")
             category_id = data.category_id or task.category_id
             if not category_id:
                 logger.error(
@@ -353,27 +391,37 @@ class TaskService:
                     )
                 )
 
-            activity = await self.activity_service.create_activity(
-                ActivityCreate(
-                    date=activity_date,
-                    start_time=start_time,
-                    end_time=end_time,
-                    category_id=category_id,
-                    notes=data.notes or task.description,
-                ),
-                user_id,
+            activity_data = ActivityCreate(
+                date=activity_date,
+                start_time=start_time,
+                end_time=end_time,
+                category_id=category_id,
+                notes=data.notes or task.description,
             )
 
+        await self.task_repo.bump_change_version(user_id)
+        updated_task = await self.task_repo.update(
+            task, {"status": "done"}, commit=False
+        )
+
+        if activity_data is not None:
+            logger.info(f"Creating activity from completed task id={id}")
+            activity = await self.activity_service.create_activity(
+                activity_data, user_id, commit=False
+            )
+            # Linking through the relationship keeps updated_task.task_activities
+            # current without reloading the task.
             await self.task_activity_repo.create(
-                task_id=task.id,
+                task=updated_task,
                 activity_id=activity.id,
+                commit=False,
             )
             logger.success(
                 f"Task id={id} linked to activity id={activity.id} "
                 f"for user_id={user_id}"
             )
-            updated_task = await self.get_task(id, user_id)
 
+        await self.task_repo.commit()
         logger.success(f"Task completed: id={id}")
         return updated_task
 
@@ -399,17 +447,21 @@ class TaskService:
                 notes=data.notes or task.description,
             ),
             user_id,
+            commit=False,
         )
 
         task_activity = await self.task_activity_repo.create(
-            task_id=task.id,
+            task=task,
             activity_id=activity.id,
+            commit=False,
         )
 
         if task.status != "done":
-            await self.task_repo.update(task, {"status": "done"})
+            await self.task_repo.update(task, {"status": "done"}, commit=False)
             logger.info(f"Task id={id} marked as done after conversion")
 
+        await self.task_repo.commit()
+
         logger.success(
             f"Task converted to activity: task_id={id}, activity_id={activity.id}"
         )
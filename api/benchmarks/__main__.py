@@ -0,0 +1,83 @@
+"""Benchmark command line.
+
+    python -m benchmarks run --scale medium --output results.json
+    python -m benchmarks compare before.json after.json
+
+``run`` DROPS AND RECREATES every table in the target database, so point
+``--database-url`` (or ``BENCH_DATABASE_URL``) at a dedicated benchmark
+database, never at the application's.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from benchmarks.datagen import SCALES
+from benchmarks.runner import compare, run
+from benchmarks.scenarios import SCENARIOS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed a database and time scenarios")
+    run_parser.add_argument(
+        "--database-url", default=os.environ.get("BENCH_DATABASE_URL")
+    )
+    run_parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--iterations", type=int, default=30)
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--import-rows", type=int, default=500)
+    run_parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="run a subset of scenarios",
+    )
+    run_parser.add_argument("--output", type=Path)
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("candidate", type=Path)
+    compare_parser.add_argument("--metric", default="p50_ms")
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text())
+        candidate = json.loads(args.candidate.read_text())
+        print("\n".join(compare(baseline, candidate, args.metric)))
+        return
+
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+    if make_url(args.database_url) == make_url(settings.DATABASE_URL):
+        parser.error("refusing to benchmark against the application database")
+
+    report = asyncio.run(
+        run(
+            database_url=args.database_url,
+            scale_name=args.scale,
+            seed=args.seed,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            import_rows=args.import_rows,
+            only=args.only,
+            output=args.output,
+        )
+    )
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Seeded synthetic data for benchmarks.
+
+The same ``seed`` and ``Scale`` always produce the same rows, ids included, so
+runs on different commits measure identical databases. Rows are written with
+multi-row ``INSERT`` statements to keep seeding fast at large scales.
+"""
+
+import random
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, date, datetime, time, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.tokens import hash_token
+from app.models.activity import Activity, Category, Group
+from app.models.refresh_token import RefreshToken
+from app.models.task import Task, TaskList
+from app.models.user import User
+
+_INSERT_CHUNK = 2000
+
+GROUP_NAMES = ["Work", "Health", "Learning", "Family", "Admin", "Leisure"]
+CATEGORY_NAMES = [
+    "Deep work",
+    "Meetings",
+    "Email",
+    "Running",
+    "Gym",
+    "Reading",
+    "Course",
+    "Kids",
+    "Groceries",
+    "Paperwork",
+    "Music",
+    "Gaming",
+]
+COLORS = ["#EF4444", "#F59E0B", "#10B981", "#3B82F6", "#8B5CF6", "#EC4899"]
+RECURRENCE_RULES = [
+    "FREQ=DAILY",
+    "FREQ=WEEKLY;BYDAY=MO,WE,FR",
+    "FREQ=WEEKLY;BYDAY=SA",
+    "FREQ=MONTHLY;BYMONTHDAY=1",
+]
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int = 5
+    groups_per_user: int = 4
+    categories_per_group: int = 3
+    years: float = 1.0
+    activities_per_day: int = 6
+    task_lists_per_user: int = 4
+    tasks_per_list: int = 40
+    recurring_ratio: float = 0.15
+    refresh_tokens_per_user: int = 3
+
+
+SCALES = {
+    "small": Scale(users=2, years=0.25, tasks_per_list=15),
+    "medium": Scale(),
+    "large": Scale(users=20, years=3.0, activities_per_day=8, tasks_per_list=120),
+}
+
+
+@dataclass
+class SeededUser:
+    id: uuid.UUID
+    email: str
+    category_ids: list[uuid.UUID] = field(default_factory=list)
+    category_names: list[str] = field(default_factory=list)
+    task_list_ids: list[uuid.UUID] = field(default_factory=list)
+    refresh_tokens: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Dataset:
+    seed: int
+    scale: Scale
+    end_date: date
+    users: list[SeededUser]
+    row_counts: dict[str, int]
+
+    def describe(self) -> dict:
+        return {
+            "seed": self.seed,
+            "scale": asdict(self.scale),
+            "end_date": self.end_date.isoformat(),
+            "row_counts": self.row_counts,
+        }
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _day_activities(
+    rng: random.Random, count: int, category_ids: list[uuid.UUID]
+) -> list[tuple[time, time, uuid.UUID]]:
+    """Non-overlapping blocks between 07:00 and 22:00, weighted to few categories."""
+    slots = sorted(rng.sample(range(7 * 4, 22 * 4 - 1), k=min(count, 40)))
+    blocks = []
+    for index, slot in enumerate(slots):
+        next_slot = slots[index + 1] if index + 1 < len(slots) else 22 * 4
+        length = rng.randint(1, max(1, min(8, next_slot - slot)))
+        end_slot = min(slot + length, 24 * 4 - 1)
+        weights = [1 / (rank + 1) for rank in range(len(category_ids))]
+        category_id = rng.choices(category_ids, weights=weights)[0]
+        blocks.append(
+            (
+                time(slot // 4, (slot % 4) * 15),
+                time(end_slot // 4, (end_slot % 4) * 15),
+                category_id,
+            )
+        )
+    return blocks
+
+
+async def _insert(conn: AsyncConnection, model, rows: list[dict]) -> None:
+    for start in range(0, len(rows), _INSERT_CHUNK):
+        await conn.execute(insert(model), rows[start : start + _INSERT_CHUNK])
+
+
+async def generate(
+    conn: AsyncConnection,
+    scale: Scale,
+    seed: int = 42,
+    end_date: date = date(2026, 3, 1),
+) -> Dataset:
+    rng = random.Random(seed)
+    now = datetime.combine(end_date, time(12, 0), tzinfo=UTC)
+    days = max(1, int(scale.years * 365))
+    rows: dict[str, list[dict]] = {
+        "users": [],
+        "groups": [],
+        "categories": [],
+        "activities": [],
+        "task_lists": [],
+        "tasks": [],
+        "refresh_tokens": [],
+    }
+    users: list[SeededUser] = []
+
+    for user_index in range(scale.users):
+        user = SeededUser(id=_uuid(rng), email=f"bench{user_index}@example.com")
+        users.append(user)
+        rows["users"].append(
+            {"id": user.id, "email": user.email, "full_name": f"Bench {user_index}"}
+        )
+
+        for group_index in range(scale.groups_per_user):
+            group_id = _uuid(rng)
+            rows["groups"].append(
+                {
+                    "id": group_id,
+                    "user_id": user.id,
+                    "name": GROUP_NAMES[group_index % len(GROUP_NAMES)],
+                    "color": COLORS[group_index % len(COLORS)],
+                }
+            )
+            for category_index in range(scale.categories_per_group):
+                category_id = _uuid(rng)
+                name = CATEGORY_NAMES[
+                    (group_index * scale.categories_per_group + category_index)
+                    % len(CATEGORY_NAMES)
+                ]
+                name = f"{name} {group_index}.{category_index}"
+                user.category_ids.append(category_id)
+                user.category_names.append(name)
+                target = rng.choice([0, 2, 5, 10, 20])
+                rows["categories"].append(
+                    {
+                        "id": category_id,
+                        "user_id": user.id,
+                        "group_id": group_id,
+                        "name": name,
+                        "priority": rng.randint(1, 5),
+                        "min_weekly_hours": target / 2,
+                        "target_weekly_hours": target,
+                        "max_weekly_hours": target * 1.5,
+                        "unit": "hours",
+                        "mandatory": rng.random() < 0.3,
+                    }
+                )
+
+        for offset in range(days):
+            day = end_date - timedelta(days=offset)
+            count = max(0, round(rng.gauss(scale.activities_per_day, 2)))
+            for start, end, category_id in _day_activities(
+                rng, count, user.category_ids
+            ):
+                rows["activities"].append(
+                    {
+                        "id": _uuid(rng),
+                        "user_id": user.id,
+                        "category_id": category_id,
+                        "date": day,
+                        "start_time": start,
+                        "end_time": end,
+                        "notes": None,
+                    }
+                )
+
+        for list_index in range(scale.task_lists_per_user):
+            task_list_id = _uuid(rng)
+            user.task_list_ids.append(task_list_id)
+            rows["task_lists"].append(
+                {
+                    "id": task_list_id,
+                    "user_id": user.id,
+                    "name": f"List {list_index}",
+                    "color": COLORS[list_index % len(COLORS)],
+                    "position": float(list_index),
+                }
+            )
+            for task_index in range(scale.tasks_per_list):
+                recurring = rng.random() < scale.recurring_ratio
+                scheduled = end_date + timedelta(days=rng.randint(-60, 30))
+                start_hour = rng.randint(7, 19)
+                rows["tasks"].append(
+                    {
+                        "id": _uuid(rng),
+                        "user_id": user.id,
+                        "task_list_id": task_list_id,
+                        "category_id": rng.choice(user.category_ids),
+                        "title": f"Task {list_index}.{task_index}",
+                        "description": None,
+                        "status": rng.choices(
+                            ["todo", "in_progress", "done"], weights=[5, 1, 4]
+                        )[0],
+                        "priority": rng.choice(["low", "medium", "high"]),
+                        "scheduled_date": scheduled,
+                        "scheduled_start_time": time(start_hour, 0),
+                        "scheduled_end_time": time(start_hour + 1, 0),
+                        "recurrence_rule": (
+                            rng.choice(RECURRENCE_RULES) if recurring else None
+                        ),
+                        "exception_dates": (
+                            [scheduled + timedelta(days=7)] if recurring else []
+                        ),
+                        "position": float(task_index),
+                    }
+                )
+
+        for _ in range(scale.refresh_tokens_per_user):
+            raw_token = f"bench-{rng.getrandbits(256):064x}"
+            user.refresh_tokens.append(raw_token)
+            rows["refresh_tokens"].append(
+                {
+                    "token": hash_token(raw_token),
+                    "user_id": user.id,
+                    "expires_at": now + timedelta(days=3650),
+                    "revoked": False,
+                }
+            )
+
+    for table, model in (
+        ("users", User),
+        ("groups", Group),
+        ("categories", Category),
+        ("activities", Activity),
+        ("task_lists", TaskList),
+        ("tasks", Task),
+        ("refresh_tokens", RefreshToken),
+    ):
+        await _insert(conn, model, rows[table])
+
+    return Dataset(
+        seed=seed,
+        scale=scale,
+        end_date=end_date,
+        users=users,
+        row_counts={table: len(table_rows) for table, table_rows in rows.items()},
+    )
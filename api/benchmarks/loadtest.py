@@ -0,0 +1,452 @@
+"""Closed-loop load test of ``app.main:app`` over real HTTP.
+
+Virtual users replay a dashboard session mix (token refresh, insights, timer
+polling, activity CRUD, task views): each sends a request, waits for the
+answer, thinks, and picks the next action. Users are started linearly over
+``--ramp`` seconds and only the steady-state window after the ramp is
+measured. The server's ``/metrics`` endpoint is scraped every second to
+capture connection pool saturation.
+
+    python -m benchmarks.loadtest --users 50 --ramp 10 --duration 60 \\
+        --workers 2 --output load.json
+
+By default the database named by ``--database-url``/``BENCH_DATABASE_URL`` is
+reseeded and a uvicorn server is spawned against it; pass ``--base-url`` to
+target a server that is already running on that database instead.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+from loguru import logger
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from benchmarks.datagen import SCALES, Dataset, SeededUser
+from benchmarks.runner import _prepare_database, summarize
+
+API = settings.API_V1_STR
+POOL_GAUGES = ("db_pool_size", "db_pool_checked_out", "db_pool_overflow")
+IN_FLIGHT_GAUGE = "http_requests_in_flight"
+
+
+@dataclass
+class VirtualUser:
+    user: SeededUser
+    today: date
+    rng: random.Random
+    headers: dict[str, str] = field(default_factory=dict)
+    created_activity_ids: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.headers = {"Authorization": f"Bearer {create_access_token(self.user.id)}"}
+
+
+@dataclass
+class Recorder:
+    measuring: bool = False
+    latencies_ms: dict[str, list[float]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    async def request(
+        self,
+        client: httpx.AsyncClient,
+        action: str,
+        method: str,
+        url: str,
+        expected: tuple[int, ...] = (200,),
+        **kwargs,
+    ) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.measuring:
+            self.latencies_ms[action].append(elapsed_ms)
+            if response is None or response.status_code not in expected:
+                self.errors[action] += 1
+        return response
+
+
+async def refresh_session(client, vu: VirtualUser, recorder: Recorder) -> None:
+    await recorder.request(
+        client,
+        "refresh",
+        "POST",
+        f"{API}/auth/refresh",
+        headers={"Cookie": f"refresh_token={vu.user.refresh_tokens[0]}"},
+    )
+
+
+async def dashboard(client, vu: VirtualUser, recorder: Recorder) -> None:
+    params = {"date": vu.today.isoformat()}
+    await recorder.request(
+        client,
+        "weekly_insights",
+        "GET",
+        f"{API}/insights/weekly-comparison",
+        params=params,
+        headers=vu.headers,
+    )
+    await recorder.request(
+        client,
+        "daily_insights",
+        "GET",
+        f"{API}/insights/daily-comparison",
+        params=params,
+        headers=vu.headers,
+    )
+
+
+async def poll_timer(client, vu: VirtualUser, recorder: Recorder) -> None:
+    await recorder.request(
+        client,
+        "timer_poll",
+        "GET",
+        f"{API}/timer/active",
+        expected=(200, 404),
+        headers=vu.headers,
+    )
+
+
+async def activity_crud(client, vu: VirtualUser, recorder: Recorder) -> None:
+    if vu.created_activity_ids and vu.rng.random() < 0.5:
+        activity_id = vu.created_activity_ids.pop()
+        await recorder.request(
+            client,
+            "activity_update",
+            "PUT",
+            f"{API}/activities/{activity_id}",
+            json={"notes": "edited under load"},
+            headers=vu.headers,
+        )
+        await recorder.request(
+            client,
+            "activity_delete",
+            "DELETE",
+            f"{API}/activities/{activity_id}",
+            expected=(204,),
+            headers=vu.headers,
+        )
+        return
+
+    hour = vu.rng.randint(6, 21)
+    response = await recorder.request(
+        client,
+        "activity_create",
+        "POST",
+        f"{API}/activities",
+        expected=(201,),
+        json={
+            "date": (vu.today - timedelta(days=vu.rng.randint(0, 6))).isoformat(),
+            "startTime": f"{hour:02d}:00",
+            "endTime": f"{hour:02d}:45",
+            "categoryId": str(vu.rng.choice(vu.user.category_ids)),
+        },
+        headers=vu.headers,
+    )
+    if response is not None and response.status_code == 201:
+        vu.created_activity_ids.append(response.json()["id"])
+
+
+async def task_views(client, vu: VirtualUser, recorder: Recorder) -> None:
+    await recorder.request(
+        client, "task_lists", "GET", f"{API}/task-lists", headers=vu.headers
+    )
+    await recorder.request(
+        client,
+        "tasks",
+        "GET",
+        f"{API}/tasks",
+        params={"list_id": str(vu.rng.choice(vu.user.task_list_ids))},
+        headers=vu.headers,
+    )
+
+
+Action = Callable[[httpx.AsyncClient, VirtualUser, Recorder], Awaitable[None]]
+
+SESSION_MIX: list[tuple[Action, int]] = [
+    (refresh_session, 1),
+    (dashboard, 3),
+    (poll_timer, 6),
+    (activity_crud, 2),
+    (task_views, 3),
+]
+
+
+def parse_gauges(text: str, names: tuple[str, ...]) -> dict[str, float]:
+    """Read gauges from an exposition, summing their label sets (e.g. pools)."""
+    values: dict[str, float] = {}
+    for line in text.splitlines():
+        series, _, value = line.rpartition(" ")
+        name = series.partition("{")[0]
+        if name in names:
+            values[name] = values.get(name, 0.0) + float(value)
+    return values
+
+
+async def scrape_metrics(
+    client: httpx.AsyncClient, stop: asyncio.Event, samples: list[dict]
+) -> None:
+    while not stop.is_set():
+        try:
+            response = await client.get("/metrics")
+            samples.append(parse_gauges(response.text, (*POOL_GAUGES, IN_FLIGHT_GAUGE)))
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1.0)
+        except TimeoutError:
+            pass
+
+
+async def run_virtual_user(
+    client: httpx.AsyncClient,
+    vu: VirtualUser,
+    recorder: Recorder,
+    start_delay: float,
+    think_time: float,
+    stop: asyncio.Event,
+) -> None:
+    await asyncio.sleep(start_delay)
+    actions = [action for action, _ in SESSION_MIX]
+    weights = [weight for _, weight in SESSION_MIX]
+    while not stop.is_set():
+        action = vu.rng.choices(actions, weights=weights)[0]
+        await action(client, vu, recorder)
+        if think_time > 0:
+            await asyncio.sleep(vu.rng.expovariate(1 / think_time))
+
+
+async def run_load(
+    base_url: str,
+    dataset: Dataset,
+    users: int,
+    ramp: float,
+    duration: float,
+    think_time: float,
+    seed: int,
+) -> dict:
+    recorder = Recorder()
+    stop = asyncio.Event()
+    pool_samples: list[dict] = []
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30.0
+    ) as client:
+        virtual_users = [
+            VirtualUser(
+                user=dataset.users[index % len(dataset.users)],
+                today=dataset.end_date,
+                rng=random.Random(seed + index),
+            )
+            for index in range(users)
+        ]
+        tasks = [
+            asyncio.create_task(
+                run_virtual_user(
+                    client, vu, recorder, index * ramp / users, think_time, stop
+                )
+            )
+            for index, vu in enumerate(virtual_users)
+        ]
+        await asyncio.sleep(ramp)
+        recorder.measuring = True
+        scraper = asyncio.create_task(scrape_metrics(client, stop, pool_samples))
+        measured_from = time.perf_counter()
+        await asyncio.sleep(duration)
+        recorder.measuring = False
+        measured_seconds = time.perf_counter() - measured_from
+        stop.set()
+        await asyncio.gather(*tasks, scraper)
+
+    actions = {}
+    total_requests = total_errors = 0
+    all_latencies: list[float] = []
+    for action, latencies in sorted(recorder.latencies_ms.items()):
+        errors = recorder.errors.get(action, 0)
+        total_requests += len(latencies)
+        total_errors += errors
+        all_latencies.extend(latencies)
+        actions[action] = {
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / measured_seconds, 2),
+            "error_rate": round(errors / len(latencies), 4),
+            **summarize(latencies),
+        }
+
+    def peak(name: str) -> float | None:
+        values = [sample[name] for sample in pool_samples if name in sample]
+        return max(values) if values else None
+
+    return {
+        "measured_seconds": round(measured_seconds, 2),
+        "requests": total_requests,
+        "throughput_rps": round(total_requests / measured_seconds, 2),
+        "error_rate": round(total_errors / total_requests, 4) if total_requests else 0,
+        "latency": summarize(all_latencies) if all_latencies else {},
+        "actions": actions,
+        "server": {
+            "pool_size": peak("db_pool_size"),
+            "peak_pool_checked_out": peak("db_pool_checked_out"),
+            "peak_pool_overflow": peak("db_pool_overflow"),
+            "peak_in_flight": peak(IN_FLIGHT_GAUGE),
+            "samples": len(pool_samples),
+        },
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(
+    database_url: str, workers: int, metrics_dir: str
+) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {**os.environ, "DATABASE_URL": database_url, "LOG_LEVEL": "ERROR"}
+    if workers > 1:
+        # Without it each scrape would only see the worker that answered it.
+        env["METRICS_MULTIPROC_DIR"] = metrics_dir
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30s")
+
+
+async def seed(database_url: str, scale: str, seed_value: int) -> Dataset:
+    engine = create_async_engine(database_url)
+    try:
+        dataset, _, _ = await _prepare_database(engine, scale, seed_value)
+    finally:
+        await engine.dispose()
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL"))
+    parser.add_argument("--base-url", help="use a running server instead of spawning")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--scale", choices=sorted(SCALES), default="medium")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--ramp", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--think-time", type=float, default=0.5, help="mean seconds between actions"
+    )
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or BENCH_DATABASE_URL is required")
+    if make_url(args.database_url) == make_url(settings.DATABASE_URL):
+        parser.error("refusing to load-test against the application database")
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    dataset = asyncio.run(seed(args.database_url, args.scale, args.seed))
+    process = None
+    base_url = args.base_url
+    metrics_dir = tempfile.mkdtemp(prefix="loadtest-metrics-")
+    if base_url is None:
+        process, base_url = start_server(args.database_url, args.workers, metrics_dir)
+    try:
+        report = asyncio.run(
+            run_load(
+                base_url,
+                dataset,
+                users=args.users,
+                ramp=args.ramp,
+                duration=args.duration,
+                think_time=args.think_time,
+                seed=args.seed,
+            )
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    report["settings"] = {
+        "users": args.users,
+        "ramp": args.ramp,
+        "duration": args.duration,
+        "think_time": args.think_time,
+        "workers": args.workers if args.base_url is None else None,
+        "scale": args.scale,
+        "seed": args.seed,
+    }
+    for action, result in report["actions"].items():
+        print(
+            f"{action:<18} {result['throughput_rps']:>8.1f} rps"
+            f"  p50 {result['p50_ms']:>8.2f}ms  p99 {result['p99_ms']:>8.2f}ms"
+            f"  errors {result['error_rate']:.2%}",
+            file=sys.stderr,
+        )
+    print(
+        f"{'total':<18} {report['throughput_rps']:>8.1f} rps"
+        f"  errors {report['error_rate']:.2%}  server {report['server']}",
+        file=sys.stderr,
+    )
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Request throughput on a no-op endpoint with the old and new access logging.
+
+``legacy`` reproduces the previous ``BaseHTTPMiddleware`` with its multi-line
+f-strings and synchronous sinks; ``asgi`` is ``LoggingMiddleware`` with the
+enqueued sinks from ``LoggerConfig``. Both write to ``os.devnull`` so disk
+speed does not skew the comparison.
+
+    python -m benchmarks.middleware_throughput --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from collections.abc import Callable
+
+from fastapi import FastAPI, Request, Response
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.logging import COLOR_FORMAT, _add_request_id, _json_format
+from app.core.middleware import LoggingMiddleware
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        request_id = id(request)
+        start_time = time.time()
+        client_host = request.client.host if request.client else "Unknown"
+        query_params = dict(request.query_params) if request.query_params else {}
+        logger.info(
+            f"🔵 Incoming Request\n"
+            f"  ID: {request_id}\n"
+            f"  Method: {request.method}\n"
+            f"  Path: {request.url.path}\n"
+            f"  Client: {client_host}\n"
+            f"  Query Params: {query_params if query_params else 'None'}"
+        )
+        response = await call_next(request)
+        process_time = (time.time() - start_time) * 1000
+        logger.log(
+            "SUCCESS",
+            f"🟢 Request Completed\n"
+            f"  ID: {request_id}\n"
+            f"  Method: {request.method}\n"
+            f"  Path: {request.url.path}\n"
+            f"  Status: {response.status_code}\n"
+            f"  Duration: {process_time:.2f}ms\n"
+            f"  Client: {client_host}",
+        )
+        return response
+
+
+def build_app(variant: str) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(
+        LegacyLoggingMiddleware if variant == "legacy" else LoggingMiddleware
+    )
+
+    @app.get("/noop")
+    async def noop():
+        return {"ok": True}
+
+    return app
+
+
+def configure_sinks(variant: str, sink) -> None:
+    logger.remove()
+    if variant == "legacy":
+        logger.add(
+            sink,
+            format=COLOR_FORMAT.replace(
+                " | <magenta>{extra[request_id]}</magenta>", ""
+            ),
+            level="DEBUG",
+            colorize=True,
+            backtrace=True,
+            diagnose=True,
+        )
+    else:
+        logger.configure(patcher=_add_request_id)
+        logger.add(sink, format=_json_format, level="INFO", enqueue=True)
+
+
+async def run(variant: str, requests: int, concurrency: int) -> float:
+    app = build_app(variant)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get("/noop")
+                response.raise_for_status()
+
+        for _ in range(min(200, requests)):
+            await one()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    await logger.complete()
+    return requests / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        for variant in ("legacy", "asgi"):
+            configure_sinks(variant, devnull)
+            rates = [
+                asyncio.run(run(variant, args.requests, args.concurrency))
+                for _ in range(args.rounds)
+            ]
+            best = max(rates)
+            print(f"{variant:>6}: {best:8.0f} req/s (best of {args.rounds})")
+        logger.remove()
+
+
+if __name__ == "__main__":
+    main()
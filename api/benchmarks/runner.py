@@ -0,0 +1,199 @@
+"""Runs scenarios in-process against a seeded database and writes JSON results."""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import (  # noqa: F401
+    activity,
+    insights,
+    refresh_token,
+    sync,
+    task,
+    user,
+)
+from benchmarks.datagen import SCALES, generate
+from benchmarks.scenarios import SCENARIOS, BenchContext, Scenario
+
+RESULTS_FORMAT_VERSION = 1
+
+_statement_count: ContextVar[list[int] | None] = ContextVar(
+    "bench_statement_count", default=None
+)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = _statement_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def summarize(samples_ms: list[float]) -> dict[str, float]:
+    ordered = sorted(samples_ms)
+    if len(ordered) > 1:
+        cuts = statistics.quantiles(ordered, n=100, method="inclusive")
+        p50, p90, p95, p99 = cuts[49], cuts[89], cuts[94], cuts[98]
+    else:
+        p50 = p90 = p95 = p99 = ordered[0]
+    return {
+        "min_ms": round(ordered[0], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(p50, 3),
+        "p90_ms": round(p90, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def _git_revision() -> dict[str, str | bool | None]:
+    def git(*args: str) -> str | None:
+        try:
+            return subprocess.run(
+                ["git", *args], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status)}
+
+
+async def _run_scenario(
+    client: AsyncClient,
+    ctx: BenchContext,
+    scenario: Scenario,
+    iterations: int,
+    warmup: int,
+) -> dict:
+    for _ in range(warmup):
+        await scenario.run(client, ctx)
+
+    samples_ms: list[float] = []
+    statements: list[int] = []
+    for _ in range(iterations):
+        counter = [0]
+        token = _statement_count.set(counter)
+        start = time.perf_counter()
+        try:
+            await scenario.run(client, ctx)
+        finally:
+            samples_ms.append((time.perf_counter() - start) * 1000)
+            _statement_count.reset(token)
+        statements.append(counter[0])
+
+    return {
+        "description": scenario.description,
+        "iterations": iterations,
+        "statements_per_iteration": statistics.median(statements),
+        **summarize(samples_ms),
+    }
+
+
+async def _prepare_database(engine: AsyncEngine, scale_name: str, seed: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        started = time.perf_counter()
+        dataset = await generate(conn, SCALES[scale_name], seed=seed)
+        seed_seconds = time.perf_counter() - started
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+        server_version = (await conn.execute(text("SHOW server_version"))).scalar()
+    return dataset, seed_seconds, server_version
+
+
+async def run(
+    database_url: str,
+    scale_name: str,
+    seed: int,
+    iterations: int,
+    warmup: int,
+    import_rows: int,
+    only: list[str] | None,
+    output: Path | None,
+) -> dict:
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    engine = create_async_engine(database_url)
+    dataset, seed_seconds, server_version = await _prepare_database(
+        engine, scale_name, seed
+    )
+    event.listen(engine.sync_engine, "after_cursor_execute", _count_statement)
+
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def bench_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = bench_get_db
+    ctx = BenchContext(dataset=dataset, import_rows=import_rows)
+    scenarios = [s for s in SCENARIOS if not only or s.name in only]
+    results: dict[str, dict] = {}
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://bench"
+        ) as client:
+            for scenario in scenarios:
+                result = await _run_scenario(client, ctx, scenario, iterations, warmup)
+                results[scenario.name] = result
+                print(
+                    f"{scenario.name:<20} p50 {result['p50_ms']:>9.2f}ms"
+                    f"  p95 {result['p95_ms']:>9.2f}ms"
+                    f"  stmts {result['statements_per_iteration']}",
+                    file=sys.stderr,
+                )
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+
+    report = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(),
+        "git": _git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "postgres": server_version,
+        },
+        "dataset": {**dataset.describe(), "seed_seconds": round(seed_seconds, 2)},
+        "settings": {
+            "scale": scale_name,
+            "iterations": iterations,
+            "warmup": warmup,
+            "import_rows": import_rows,
+        },
+        "scenarios": results,
+    }
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+    return report
+
+
+def compare(baseline: dict, candidate: dict, metric: str = "p50_ms") -> list[str]:
+    """One line per scenario with the relative change of ``metric``."""
+    lines = [f"{'scenario':<20} {'baseline':>10} {'candidate':>10} {'change':>8}"]
+    for name, result in candidate["scenarios"].items():
+        before = baseline["scenarios"].get(name, {}).get(metric)
+        after = result[metric]
+        if before:
+            change = f"{(after - before) / before * 100:+.1f}%"
+            lines.append(f"{name:<20} {before:>10.2f} {after:>10.2f} {change:>8}")
+        else:
+            lines.append(f"{name:<20} {'-':>10} {after:>10.2f} {'new':>8}")
+    return lines
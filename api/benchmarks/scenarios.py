@@ -0,0 +1,152 @@
+"""Hot-endpoint scenarios. Each call of ``run`` is one timed iteration."""
+
+import io
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from httpx import AsyncClient
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from benchmarks.datagen import Dataset, SeededUser
+
+API = settings.API_V1_STR
+
+
+@dataclass
+class BenchContext:
+    dataset: Dataset
+    import_rows: int
+    _workbook: bytes | None = field(default=None, repr=False)
+
+    @property
+    def reader(self) -> SeededUser:
+        return self.dataset.users[0]
+
+    @property
+    def writer(self) -> SeededUser:
+        """Write scenarios use their own user so reads see a stable dataset."""
+        return self.dataset.users[-1]
+
+    def auth(self, user: SeededUser) -> dict[str, str]:
+        return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+    def journal_workbook(self) -> bytes:
+        if self._workbook is None:
+            self._workbook = build_journal_workbook(
+                self.writer.category_names,
+                self.import_rows,
+                datetime.combine(self.dataset.end_date, datetime.min.time()),
+            )
+        return self._workbook
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    run: Callable[[AsyncClient, BenchContext], Awaitable[None]]
+
+
+def build_journal_workbook(
+    category_names: list[str], rows: int, start: datetime
+) -> bytes:
+    """A 'Journal' sheet laid out like the import expects, with ``rows`` entries."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Journal"
+    sheet.append(["Date", "", "Start h", "Start m", "End h", "End m"] + [""] * 6)
+    for index in range(rows):
+        start_hour = 7 + index % 12
+        sheet.append(
+            [
+                start - timedelta(days=index // 12),
+                None,
+                start_hour,
+                0,
+                start_hour,
+                45,
+                None,
+                None,
+                None,
+                category_names[index % len(category_names)],
+                None,
+                f"Imported row {index}",
+            ]
+        )
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+async def weekly_insights(client: AsyncClient, ctx: BenchContext) -> None:
+    response = await client.get(
+        f"{API}/insights/weekly-comparison",
+        params={"date": ctx.dataset.end_date.isoformat()},
+        headers=ctx.auth(ctx.reader),
+    )
+    response.raise_for_status()
+
+
+async def daily_insights(client: AsyncClient, ctx: BenchContext) -> None:
+    response = await client.get(
+        f"{API}/insights/daily-comparison",
+        params={"date": ctx.dataset.end_date.isoformat()},
+        headers=ctx.auth(ctx.reader),
+    )
+    response.raise_for_status()
+
+
+async def activities_by_date(client: AsyncClient, ctx: BenchContext) -> None:
+    response = await client.get(
+        f"{API}/activities/date/{ctx.dataset.end_date.isoformat()}",
+        headers=ctx.auth(ctx.reader),
+    )
+    response.raise_for_status()
+
+
+async def list_tasks(client: AsyncClient, ctx: BenchContext) -> None:
+    response = await client.get(f"{API}/tasks", headers=ctx.auth(ctx.reader))
+    response.raise_for_status()
+
+
+async def timer_start_stop(client: AsyncClient, ctx: BenchContext) -> None:
+    headers = ctx.auth(ctx.writer)
+    response = await client.post(
+        f"{API}/timer/start",
+        json={"categoryId": str(ctx.writer.category_ids[0])},
+        headers=headers,
+    )
+    response.raise_for_status()
+    response = await client.post(f"{API}/timer/stop", headers=headers)
+    response.raise_for_status()
+
+
+async def excel_import(client: AsyncClient, ctx: BenchContext) -> None:
+    response = await client.post(
+        f"{API}/import/excel",
+        files={"file": ("journal.xlsx", ctx.journal_workbook())},
+        headers=ctx.auth(ctx.writer),
+    )
+    response.raise_for_status()
+
+
+async def token_refresh(client: AsyncClient, ctx: BenchContext) -> None:
+    response = await client.post(
+        f"{API}/auth/refresh",
+        headers={"Cookie": f"refresh_token={ctx.reader.refresh_tokens[0]}"},
+    )
+    response.raise_for_status()
+
+
+SCENARIOS = [
+    Scenario("weekly_insights", "GET /insights/weekly-comparison", weekly_insights),
+    Scenario("daily_insights", "GET /insights/daily-comparison", daily_insights),
+    Scenario("activities_by_date", "GET /activities/date/{date}", activities_by_date),
+    Scenario("list_tasks", "GET /tasks", list_tasks),
+    Scenario("timer_start_stop", "POST /timer/start + /timer/stop", timer_start_stop),
+    Scenario("excel_import", "POST /import/excel (Journal rows)", excel_import),
+    Scenario("token_refresh", "POST /auth/refresh", token_refresh),
+]
@@ -0,0 +1,138 @@
+"""Response encoding cost of 1k-item list endpoints.
+
+``default`` is how the routers return lists: models plus ``response_model``,
+which FastAPI (0.130+) checks and dumps to bytes with pydantic-core.
+``direct`` skips FastAPI's response handling and dumps with a
+``TypeAdapter``; ``json_class`` forces the older dict + ``json.dumps`` path by
+setting ``response_class``.
+All three produce the same JSON. Items are built once up front so only the
+framework's share of the request is measured.
+
+    python -m benchmarks.serialization --items 1000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as time_of_day
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+from httpx import ASGITransport, AsyncClient
+from pydantic import TypeAdapter
+
+from app.schemas.activity import ActivityResponse
+from app.schemas.task import TaskResponse
+
+
+def build_items(count: int) -> tuple[list[ActivityResponse], list[TaskResponse]]:
+    now = datetime(2026, 3, 1, 12, tzinfo=UTC)
+    activities = [
+        ActivityResponse(
+            id=uuid.uuid4(),
+            category_id=uuid.uuid4(),
+            date=date(2026, 3, 1) - timedelta(days=index // 8),
+            start_time=time_of_day(8 + index % 8, 0),
+            end_time=time_of_day(8 + index % 8, 45),
+            notes=f"Activity {index}",
+            created_at=now,
+            updated_at=now,
+            task_name=f"Task {index}" if index % 3 == 0 else None,
+            task_id=str(uuid.uuid4()) if index % 3 == 0 else None,
+            is_from_task=index % 3 == 0,
+        )
+        for index in range(count)
+    ]
+    tasks = [
+        TaskResponse(
+            id=uuid.uuid4(),
+            task_list_id=uuid.uuid4(),
+            category_id=uuid.uuid4(),
+            title=f"Task {index}",
+            description=None,
+            status="todo",
+            priority="medium",
+            due_date=None,
+            scheduled_date=date(2026, 3, 1) + timedelta(days=index % 30),
+            scheduled_start_time=time_of_day(9, 0),
+            scheduled_end_time=time_of_day(10, 0),
+            estimated_duration_minutes=60,
+            recurrence_rule="FREQ=WEEKLY;BYDAY=MO" if index % 5 == 0 else None,
+            exception_dates=[],
+            position=float(index),
+            activity_ids=[uuid.uuid4()],
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(count)
+    ]
+    return activities, tasks
+
+
+VARIANTS = ("default", "direct", "json_class")
+
+
+def _endpoints(content: list, model: type):
+    adapter = TypeAdapter(list[model])
+
+    async def default():
+        return content
+
+    async def direct():
+        return Response(
+            adapter.dump_json(content, by_alias=True), media_type="application/json"
+        )
+
+    return default, direct
+
+
+def build_app(items: int) -> FastAPI:
+    app = FastAPI()
+    for resource, model, content in zip(
+        ("activities", "tasks"),
+        (ActivityResponse, TaskResponse),
+        build_items(items),
+        strict=True,
+    ):
+        default, direct = _endpoints(content, model)
+        app.get(f"/default/{resource}", response_model=list[model])(default)
+        app.get(f"/direct/{resource}", response_model=list[model])(direct)
+        app.get(
+            f"/json_class/{resource}",
+            response_model=list[model],
+            response_class=JSONResponse,
+        )(default)
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int) -> float:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+        for _ in range(10):
+            (await client.get(path)).raise_for_status()
+        start = time.perf_counter()
+        for _ in range(requests):
+            (await client.get(path)).raise_for_status()
+        return (time.perf_counter() - start) * 1000 / requests
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = build_app(args.items)
+    for resource in ("activities", "tasks"):
+        timings = []
+        for variant in VARIANTS:
+            ms = asyncio.run(run(app, f"/{variant}/{resource}", args.requests))
+            timings.append(f"{variant} {ms:7.2f}ms")
+        print(f"{resource:>10}: " + "  ".join(timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from tests.query_budget import (  # noqa: F401
+    api_client,
+    api_user,
+    db_engine,
+    db_session,
+    pytest_configure,
+)
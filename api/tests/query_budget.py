@@ -0,0 +1,144 @@
+"""Pytest plugin that enforces per-request SQL statement budgets.
+
+Repository mocks hide query-count regressions, so endpoint tests marked with
+``@query_budget(n)`` run through ``api_client`` against the real Postgres
+database named by ``TEST_DATABASE_URL``. Every request made during the test
+may execute at most ``n`` statements; savepoint bookkeeping from the test
+transaction is not counted. Without ``TEST_DATABASE_URL`` the tests are skipped.
+"""
+
+import os
+import re
+from contextvars import ContextVar
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient, Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.security import create_access_token
+from app.db.session import Base, get_db
+from app.main import app
+from app.models import activity, insights, refresh_token, sync, task  # noqa: F401
+from app.models.user import User
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+query_budget = pytest.mark.query_budget
+
+_SAVEPOINT_STATEMENT = re.compile(
+    r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE
+)
+_statements_ctx: ContextVar[list[str] | None] = ContextVar(
+    "budget_statements", default=None
+)
+_schema_ready = False
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "query_budget(n): fail when a request made through api_client "
+        "executes more than n SQL statements",
+    )
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements_ctx.get()
+    if statements is not None and not _SAVEPOINT_STATEMENT.match(statement):
+        statements.append(statement)
+
+
+class BudgetedTransport(ASGITransport):
+    """Counts the statements executed while each request is being served."""
+
+    def __init__(self, budget: int | None, **kwargs):
+        super().__init__(**kwargs)
+        self.budget = budget
+
+    async def handle_async_request(self, request: Request) -> Response:
+        statements: list[str] = []
+        token = _statements_ctx.set(statements)
+        try:
+            response = await super().handle_async_request(request)
+        finally:
+            _statements_ctx.reset(token)
+
+        if self.budget is not None and len(statements) > self.budget:
+            listing = "\n".join(
+                f"  {index}. {' '.join(statement.split())[:200]}"
+                for index, statement in enumerate(statements, start=1)
+            )
+            pytest.fail(
+                f"{request.method} {request.url.path} executed "
+                f"{len(statements)} SQL statements, budget is {self.budget}:\n"
+                f"{listing}",
+                pytrace=False,
+            )
+        return response
+
+
+@pytest_asyncio.fixture
+async def db_engine() -> AsyncEngine:
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    global _schema_ready
+    # NullPool: every test runs on its own event loop, so connections must not
+    # outlive it.
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    if not _schema_ready:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        _schema_ready = True
+
+    event.listen(engine.sync_engine, "after_cursor_execute", _record_statement)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(db_engine: AsyncEngine) -> AsyncSession:
+    """A session whose commits become savepoints, rolled back after the test."""
+    async with db_engine.connect() as conn:
+        transaction = await conn.begin()
+        session = AsyncSession(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
+
+
+@pytest_asyncio.fixture
+async def api_user(db_session: AsyncSession) -> User:
+    user = User(email="budget@example.com", full_name="Budget Tester")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+@pytest_asyncio.fixture
+async def api_client(request, db_session: AsyncSession, api_user: User):
+    async def override_get_db():
+        yield db_session
+
+    marker = request.node.get_closest_marker("query_budget")
+    transport = BudgetedTransport(budget=marker.args[0] if marker else None, app=app)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(
+            transport=transport,
+            base_url="http://test",
+            headers={"Authorization": f"Bearer {create_access_token(api_user.id)}"},
+        ) as client:
+            yield client
+    finally:
+        del app.dependency_overrides[get_db]
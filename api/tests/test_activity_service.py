@@ -344,6 +344,7 @@ async def test_create_activity_creates_activity(
         category_id=category_id,
         notes="Focus block",
         user_id=user_id,
+        commit=True,
     )
 
 
@@ -0,0 +1,44 @@
+from benchmarks.loadtest import parse_gauges
+from benchmarks.runner import compare, summarize
+
+
+def test_summarize_reports_percentiles():
+    summary = summarize([float(value) for value in range(1, 101)])
+
+    assert summary["min_ms"] == 1.0
+    assert summary["max_ms"] == 100.0
+    assert summary["p50_ms"] == 50.5
+    assert 95 <= summary["p95_ms"] <= 96
+
+
+def test_compare_shows_relative_change_and_new_scenarios():
+    baseline = {"scenarios": {"list_tasks": {"p50_ms": 10.0}}}
+    candidate = {
+        "scenarios": {
+            "list_tasks": {"p50_ms": 7.5},
+            "token_refresh": {"p50_ms": 2.0},
+        }
+    }
+
+    lines = compare(baseline, candidate)
+
+    assert "-25.0%" in lines[1]
+    assert lines[2].split()[-1] == "new"
+
+
+def test_parse_gauges_sums_label_sets():
+    text = "\n".join(
+        [
+            "# HELP db_pool_checked_out Connections currently checked out.",
+            "# TYPE db_pool_checked_out gauge",
+            'db_pool_checked_out{pool="primary"} 7.0',
+            'db_pool_checked_out{pool="replica"} 3.0',
+            'db_queries_total{method="GET"} 12.0',
+            "http_requests_in_flight 2.0",
+        ]
+    )
+
+    assert parse_gauges(text, ("db_pool_checked_out", "http_requests_in_flight")) == {
+        "db_pool_checked_out": 10.0,
+        "http_requests_in_flight": 2.0,
+    }
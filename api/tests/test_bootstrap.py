@@ -0,0 +1,102 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import patch
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import conditional_get, get_current_user
+from app.api.v1.endpoints import bootstrap
+from app.core.config import settings
+from app.db.session import get_read_session_factory
+from app.exceptions import NotFoundError
+from app.main import app
+
+API = settings.API_V1_STR
+
+
+@asynccontextmanager
+async def shared_session(db_session):
+    yield db_session
+
+
+async def test_bootstrap_returns_every_section(api_client, db_session):
+    group = (await api_client.post(f"{API}/groups", json={"name": "Work"})).json()
+    await api_client.post(
+        f"{API}/categories", json={"name": "Deep work", "groupId": group["id"]}
+    )
+
+    # The test data lives in one uncommitted transaction, so every section has
+    # to read through the test session, one at a time.
+    app.dependency_overrides[get_read_session_factory] = lambda: (
+        lambda: shared_session(db_session)
+    )
+    try:
+        with patch.object(settings, "BOOTSTRAP_CONCURRENCY", 1):
+            response = await api_client.get(
+                f"{API}/bootstrap", params={"date": "2026-03-02"}
+            )
+    finally:
+        del app.dependency_overrides[get_read_session_factory]
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["me"]["user"]["email"] == "budget@example.com"
+    assert [g["name"] for g in body["groups"]] == ["Work"]
+    assert [c["name"] for c in body["categories"]] == ["Deep work"]
+    assert body["activities"] == []
+    assert body["activeTimer"] is None
+    assert body["taskLists"] == body["tasks"] == []
+    assert body["dailyComparison"]["date"] == "2026-03-02"
+    assert body["errors"] == {}
+
+
+async def test_failing_section_does_not_fail_the_payload():
+    running = 0
+    peak = 0
+
+    async def section(db, user, today):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    async def missing(db, user, today):
+        raise NotFoundError(resource="group")
+
+    async def broken(db, user, today):
+        raise RuntimeError("boom")
+
+    sections = dict.fromkeys(bootstrap.SECTIONS, section)
+    sections["groups"] = missing
+    sections["task_lists"] = broken
+
+    user = SimpleNamespace(
+        id=uuid4(), email="me@example.com", full_name=None, created_at=None
+    )
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[conditional_get] = lambda: None
+    app.dependency_overrides[get_read_session_factory] = lambda: (
+        lambda: shared_session(None)
+    )
+    try:
+        with patch.dict(bootstrap.SECTIONS, sections):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as client:
+                response = await client.get(f"{API}/bootstrap")
+    finally:
+        for dependency in (get_current_user, conditional_get, get_read_session_factory):
+            del app.dependency_overrides[dependency]
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["groups"] is None
+    assert body["taskLists"] is None
+    assert body["errors"]["groups"]["code"] == "RESOURCE_001"
+    assert body["errors"]["taskLists"]["code"] == "SERVER_001"
+    assert body["tasks"] is None
+    assert set(body["errors"]) == {"groups", "taskLists"}
+    assert peak == min(settings.BOOTSTRAP_CONCURRENCY, len(sections) - 2)
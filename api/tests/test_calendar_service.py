@@ -0,0 +1,204 @@
+import uuid
+from datetime import UTC, date, datetime, time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import get_current_user
+from app.api.v1.endpoints.task import get_calendar_service
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.core.tokens import create_calendar_token, decode_calendar_token
+from app.db.session import get_db
+from app.main import app
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.services.calendar_service import CalendarService
+
+
+def make_task(**overrides):
+    defaults = {
+        "id": uuid.uuid4(),
+        "task_list_id": uuid.uuid4(),
+        "title": "Weekly review",
+        "description": None,
+        "scheduled_date": date(2026, 3, 2),
+        "scheduled_start_time": time(9, 0),
+        "scheduled_end_time": time(10, 0),
+        "estimated_duration_minutes": None,
+        "recurrence_rule": None,
+        "exception_dates": [],
+        "created_at": datetime(2026, 3, 1, 8, 0, tzinfo=UTC),
+        "updated_at": datetime(2026, 3, 1, 8, 30, tzinfo=UTC),
+    }
+    defaults.update(overrides)
+    return SimpleNamespace(**defaults)
+
+
+@pytest.fixture
+def task_repo():
+    return AsyncMock(spec=TaskRepository)
+
+
+@pytest.fixture
+def calendar_service(task_repo):
+    return CalendarService(task_repo)
+
+
+@pytest.mark.asyncio
+async def test_render_feed_emits_rrule_and_exdate(calendar_service, task_repo):
+    recurring = make_task(
+        recurrence_rule="DTSTART:20260302T090000Z\nRRULE:FREQ=WEEKLY;BYDAY=MO",
+        exception_dates=[date(2026, 3, 16)],
+    )
+    materialised = make_task(
+        task_list_id=recurring.task_list_id,
+        scheduled_date=date(2026, 3, 9),
+    )
+    task_repo.get_calendar_tasks.return_value = [recurring, materialised]
+
+    feed = await calendar_service.render_feed(uuid.uuid4())
+
+    assert feed.startswith("BEGIN:VCALENDAR\r\n")
+    assert feed.endswith("END:VCALENDAR\r\n")
+    assert feed.count("BEGIN:VEVENT") == 2
+    assert "RRULE:FREQ=WEEKLY;BYDAY=MO\r\n" in feed
+    assert "DTSTART:20260302T090000Z" not in feed
+    assert "EXDATE:20260309T090000,20260316T090000\r\n" in feed
+    assert f"UID:{recurring.id}@ezlife\r\n" in feed
+
+
+@pytest.mark.asyncio
+async def test_render_feed_uses_all_day_events_without_time(
+    calendar_service, task_repo
+):
+    task = make_task(
+        scheduled_start_time=None,
+        scheduled_end_time=None,
+        recurrence_rule="FREQ=DAILY",
+        exception_dates=[date(2026, 3, 3)],
+        description="Line one\nwith, commas; and more " + "x" * 80,
+    )
+    task_repo.get_calendar_tasks.return_value = [task]
+
+    feed = await calendar_service.render_feed(uuid.uuid4())
+
+    assert "DTSTART;VALUE=DATE:20260302\r\n" in feed
+    assert "DTEND;VALUE=DATE:20260303\r\n" in feed
+    assert "RRULE:FREQ=DAILY\r\n" in feed
+    assert "EXDATE;VALUE=DATE:20260303\r\n" in feed
+    assert "DESCRIPTION:Line one\\nwith\\, commas\\; and more" in feed
+    assert all(len(line.encode()) <= 75 for line in feed.split("\r\n"))
+
+
+@pytest.mark.asyncio
+async def test_feed_etag_changes_with_task_version(calendar_service, task_repo):
+    user_id = uuid.uuid4()
+    updated_at = datetime(2026, 3, 1, 8, 30, tzinfo=UTC)
+    task_repo.get_calendar_version.side_effect = [
+        (3, updated_at),
+        (3, updated_at),
+        (2, updated_at),
+    ]
+
+    first = await calendar_service.get_feed_etag(user_id)
+    second = await calendar_service.get_feed_etag(user_id)
+    after_delete = await calendar_service.get_feed_etag(user_id)
+
+    assert first == second
+    assert first.startswith('"') and not first.startswith("W/")
+    assert after_delete != first
+
+
+def test_calendar_token_is_not_an_access_token():
+    user_id = uuid.uuid4()
+
+    token = create_calendar_token(user_id, 3)
+
+    assert decode_calendar_token(token) == (user_id, 3)
+    assert decode_calendar_token(create_access_token(user_id)) is None
+
+
+async def _get_feed(service, token_version: int, current_version: int | None):
+    app.dependency_overrides[get_calendar_service] = lambda: service
+    app.dependency_overrides[get_db] = lambda: None
+    token = create_calendar_token(uuid.uuid4(), token_version)
+
+    try:
+        with patch.object(
+            UserRepository,
+            "get_calendar_token_version",
+            AsyncMock(return_value=current_version),
+        ):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as ac:
+                return await ac.get(
+                    f"{settings.API_V1_STR}/tasks/calendar.ics",
+                    params={"token": token},
+                    headers={"If-None-Match": '"abc"'},
+                )
+    finally:
+        del app.dependency_overrides[get_calendar_service]
+        del app.dependency_overrides[get_db]
+
+
+@pytest.mark.asyncio
+async def test_calendar_feed_endpoint_answers_304_without_rendering():
+    service = AsyncMock(spec=CalendarService)
+    service.get_feed_etag.return_value = '"abc"'
+
+    response = await _get_feed(service, token_version=2, current_version=2)
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"abc"'
+    service.render_feed.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_calendar_feed_rejects_rotated_and_unknown_tokens():
+    service = AsyncMock(spec=CalendarService)
+
+    rotated = await _get_feed(service, token_version=1, current_version=2)
+    unknown_user = await _get_feed(service, token_version=0, current_version=None)
+
+    assert rotated.status_code == 401
+    assert unknown_user.status_code == 401
+    service.get_feed_etag.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_issuing_a_calendar_token_rotates_the_version():
+    user = SimpleNamespace(id=uuid.uuid4())
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_db] = lambda: None
+    rotate = AsyncMock(return_value=5)
+
+    try:
+        with patch.object(UserRepository, "rotate_calendar_token_version", rotate):
+            async with AsyncClient(
+                transport=ASGITransport(app=app), base_url="http://test"
+            ) as ac:
+                response = await ac.post(f"{settings.API_V1_STR}/tasks/calendar-token")
+    finally:
+        del app.dependency_overrides[get_current_user]
+        del app.dependency_overrides[get_db]
+
+    assert response.status_code == 200
+    rotate.assert_awaited_once_with(user.id)
+    assert decode_calendar_token(response.json()["token"]) == (user.id, 5)
+
+
+@pytest.mark.asyncio
+async def test_calendar_feed_endpoint_rejects_access_tokens():
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        response = await ac.get(
+            f"{settings.API_V1_STR}/tasks/calendar.ics",
+            params={"token": create_access_token(uuid.uuid4())},
+        )
+
+    assert response.status_code == 401
@@ -0,0 +1,119 @@
+from types import SimpleNamespace
+from typing import Annotated
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.deps import conditional_get, etag_matches, get_current_user
+from app.core.exception_handlers import register_exception_handlers
+from app.db.session import get_db, get_read_db
+from app.repositories.user_repository import (
+    UserRepository,
+    _forget_change_version_bumps,
+)
+
+
+def make_app(user, primary, replica=None) -> tuple[FastAPI, list[str]]:
+    app = FastAPI()
+    register_exception_handlers(app)
+    calls: list[str] = []
+
+    @app.get("/items", dependencies=[Depends(conditional_get)])
+    async def items(db: Annotated[object, Depends(get_read_db)]):
+        calls.append("items")
+        return []
+
+    async def override_db():
+        yield primary
+
+    async def override_read_db():
+        yield replica if replica is not None else primary
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_read_db
+    return app, calls
+
+
+async def test_unchanged_version_answers_304_without_running_the_endpoint():
+    user = SimpleNamespace(id=uuid4(), change_version=3)
+    app, calls = make_app(user, primary=object())
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.get("/items")
+        etag = first.headers["etag"]
+        revalidated = await client.get("/items", headers={"If-None-Match": etag})
+        user.change_version = 4
+        changed = await client.get("/items", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert etag.startswith('W/"')
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert first.headers["vary"] == "Authorization"
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert calls == ["items", "items"]
+
+
+async def test_etags_differ_between_users_with_the_same_version():
+    first_app, _ = make_app(SimpleNamespace(id=uuid4(), change_version=1), object())
+    second_app, _ = make_app(SimpleNamespace(id=uuid4(), change_version=1), object())
+    etags = []
+    for app in (first_app, second_app):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            etags.append((await client.get("/items")).headers["etag"])
+
+    assert etags[0] != etags[1]
+
+
+async def test_replica_reads_take_the_version_from_the_replica():
+    user = SimpleNamespace(id=uuid4(), change_version=5)
+    app, _ = make_app(user, primary=object(), replica=object())
+    with patch.object(
+        UserRepository, "get_change_version", AsyncMock(return_value=4)
+    ) as get_change_version:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            from_replica = (await client.get("/items")).headers["etag"]
+
+    primary_app, _ = make_app(user, primary=object())
+    async with AsyncClient(
+        transport=ASGITransport(app=primary_app), base_url="http://test"
+    ) as client:
+        from_primary = (await client.get("/items")).headers["etag"]
+
+    get_change_version.assert_awaited_once()
+    assert from_replica != from_primary
+
+
+def test_etag_matches_uses_weak_comparison():
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('W/"other", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('"other"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+
+async def test_bump_change_version_updates_once_per_transaction():
+    session = MagicMock()
+    session.info = {}
+    session.execute = AsyncMock()
+    repo = UserRepository(session)
+    user_id = uuid4()
+
+    await repo.bump_change_version(user_id)
+    await repo.bump_change_version(user_id)
+    assert session.execute.await_count == 1
+
+    _forget_change_version_bumps(session, SimpleNamespace(parent=None))
+    await repo.bump_change_version(user_id)
+    assert session.execute.await_count == 2
@@ -0,0 +1,78 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi import Depends
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.db.health import pool_status
+from app.main import app
+
+
+def test_pool_status_reports_utilization():
+    pool = QueuePool(MagicMock, pool_size=4, max_overflow=4)
+    connections = [pool.connect() for _ in range(2)]
+
+    status = pool_status(pool)
+
+    assert status["size"] == 4
+    assert status["checked_out"] == 2
+    assert status["utilization"] == 0.25
+    for connection in connections:
+        connection.close()
+
+
+async def test_readiness_reports_database():
+    database = {"round_trip_ms": 0.8, "max_connections": 100, "pool": {}}
+    with patch("app.main.check_database", AsyncMock(return_value=database)):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["database"]["max_connections"] == 100
+
+
+async def test_readiness_is_unavailable_when_database_times_out():
+    with patch("app.main.check_database", AsyncMock(side_effect=TimeoutError)):
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "TimeoutError"
+    assert "pool" in response.json()["database"]
+
+
+async def test_database_timeouts_map_to_service_unavailable():
+    class QueryCanceled(Exception):
+        sqlstate = "57014"
+
+    errors = {
+        "statement": DBAPIError("SELECT 1", {}, QueryCanceled()),
+        "pool": PoolTimeoutError("QueuePool limit reached"),
+    }
+
+    async def fail(kind: str):
+        raise errors[kind]
+
+    @app.get("/_test/database-timeout/{kind}")
+    async def database_timeout(_: None = Depends(fail)):
+        return {}
+
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://test",
+        ) as client:
+            for kind in errors:
+                response = await client.get(f"/_test/database-timeout/{kind}")
+
+                assert response.status_code == 503
+                assert response.json()["code"] == "SERVER_002"
+                assert response.headers["retry-after"] == "1"
+    finally:
+        app.router.routes.pop()
@@ -0,0 +1,105 @@
+"""Goal history against Postgres, where the category_week_minutes trigger
+runs; needs TEST_DATABASE_URL (see query_budget)."""
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.insights import CategoryWeekMinutes
+
+API = settings.API_V1_STR
+
+
+async def rollup(db_session) -> dict:
+    result = await db_session.execute(select(CategoryWeekMinutes))
+    return {
+        (str(row.category_id), row.week_start.isoformat()): (
+            row.minutes,
+            row.activities_count,
+        )
+        for row in result.scalars().all()
+    }
+
+
+async def test_activity_writes_keep_the_weekly_rollup_current(api_client, db_session):
+    group = (await api_client.post(f"{API}/groups", json={"name": "Work"})).json()
+    first, second = [
+        (
+            await api_client.post(
+                f"{API}/categories", json={"name": name, "groupId": group["id"]}
+            )
+        ).json()
+        for name in ("Deep work", "Meetings")
+    ]
+
+    activity = (
+        await api_client.post(
+            f"{API}/activities",
+            json={
+                "date": "2026-03-04",
+                "startTime": "09:00",
+                "endTime": "10:30",
+                "categoryId": first["id"],
+            },
+        )
+    ).json()
+    assert await rollup(db_session) == {(first["id"], "2026-03-02"): (90.0, 1)}
+
+    await api_client.put(
+        f"{API}/activities/{activity['id']}",
+        json={"date": "2026-03-10", "categoryId": second["id"]},
+    )
+    assert await rollup(db_session) == {
+        (first["id"], "2026-03-02"): (0.0, 0),
+        (second["id"], "2026-03-09"): (90.0, 1),
+    }
+
+    await api_client.delete(f"{API}/activities/{activity['id']}")
+    assert (await rollup(db_session))[(second["id"], "2026-03-09")] == (0.0, 0)
+
+
+async def test_goal_history_reports_streaks_from_the_rollup(api_client):
+    group = (await api_client.post(f"{API}/groups", json={"name": "Work"})).json()
+    category = (
+        await api_client.post(
+            f"{API}/categories",
+            json={
+                "name": "Deep work",
+                "groupId": group["id"],
+                "minWeeklyHours": 1,
+                "targetWeeklyHours": 2,
+                "maxWeeklyHours": 4,
+            },
+        )
+    ).json()
+    # Two hours in each of the weeks of Feb 16 and Feb 23, one in Mar 2.
+    for day, end_time in (
+        ("2026-02-17", "11:00"),
+        ("2026-02-24", "11:00"),
+        ("2026-03-03", "10:00"),
+    ):
+        await api_client.post(
+            f"{API}/activities",
+            json={
+                "date": day,
+                "startTime": "09:00",
+                "endTime": end_time,
+                "categoryId": category["id"],
+            },
+        )
+
+    response = await api_client.get(
+        f"{API}/insights/goals", params={"weeks": 4, "date": "2026-03-04"}
+    )
+
+    assert response.status_code == 200
+    [goal] = response.json()["goals"]
+    assert [week["status"] for week in goal["weeks"]] == [
+        "under",
+        "target_met",
+        "target_met",
+        "on_track",
+    ]
+    assert goal["currentStreak"] == 0
+    assert goal["longestStreak"] == 2
+    assert goal["attainmentPercent"] == 50.0
+    assert goal["bestWeek"] == {"weekStartDate": "2026-02-16", "minutes": 120}
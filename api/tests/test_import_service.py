@@ -97,6 +97,7 @@ async def test_import_excel_success_with_parametre_and_journal_sheets(
     )
 
     session.execute.side_effect = [
+        _make_execute_result(),
         _make_execute_result(first=None),
         _make_execute_result(all_items=[category_for_lookup]),
     ]
@@ -110,6 +111,8 @@ async def test_import_excel_success_with_parametre_and_journal_sheets(
     assert result["errors"] == []
     assert session.flush.await_count == 1
     session.commit.assert_awaited_once()
+    first_statement = session.execute.await_args_list[0].args[0]
+    assert str(first_statement).startswith("UPDATE users SET change_version")
 
 
 @pytest.mark.asyncio
@@ -136,6 +139,7 @@ async def test_parametre_sheet_creates_groups_and_categories(service, session, u
     workbook = _make_workbook(["Paramètre"], {"Paramètre": parametre_sheet})
 
     session.execute.side_effect = [
+        _make_execute_result(),
         _make_execute_result(first=None),
         _make_execute_result(first=None),
     ]
@@ -362,6 +366,7 @@ async def test_empty_rows_are_skipped_in_parametre_and_journal(
     writing_category.name = "Writing"
 
     session.execute.side_effect = [
+        _make_execute_result(),
         _make_execute_result(first=None),
         _make_execute_result(all_items=[writing_category]),
     ]
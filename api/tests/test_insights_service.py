@@ -1,10 +1,13 @@
 from datetime import date, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 
-from app.services.insights_service import InsightsService
+from app.exceptions import BadRequestError, NotFoundError
+from app.repositories.insights_repository import InsightsRepository
+from app.services.insights_service import WEEKLY_SNAPSHOT_FORMAT, InsightsService
 
 
 @pytest.fixture
@@ -475,3 +478,290 @@ async def test_get_weekly_comparison_handles_none_most_productive_day(
 
     assert result["stats"]["most_productive_day"] is None
     assert result["stats"]["least_productive_day"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_range_insights_fills_and_clips_periods(user_id):
+    repo = MagicMock()
+    repo.get_range_rollup = AsyncMock(
+        return_value=[
+            {
+                "period_start": date(2026, 1, 1),
+                "category_id": "c1",
+                "category_name": "Coding",
+                "group_id": "g1",
+                "group_name": "Work",
+                "group_color": "#123456",
+                "minutes": 90.0,
+                "activities_count": 2,
+            },
+            {
+                "period_start": date(2026, 3, 1),
+                "category_id": "c2",
+                "category_name": "Running",
+                "group_id": "g2",
+                "group_name": "Life",
+                "group_color": None,
+                "minutes": 30.0,
+                "activities_count": 1,
+            },
+        ]
+    )
+    service = InsightsService(repo)
+
+    result = await service.get_range_insights(
+        user_id, date(2026, 1, 15), date(2026, 3, 10), "month"
+    )
+
+    repo.get_range_rollup.assert_awaited_once_with(
+        user_id, date(2026, 1, 15), date(2026, 3, 10), "month"
+    )
+    assert result["total_minutes"] == 120
+    assert result["activities_count"] == 3
+    assert [g["group_name"] for g in result["group_breakdown"]] == ["Work", "Life"]
+    assert result["category_breakdown"][0]["percent_of_total"] == 75.0
+    assert [(p["period_start"], p["period_end"]) for p in result["series"]] == [
+        ("2026-01-15", "2026-01-31"),
+        ("2026-02-01", "2026-02-28"),
+        ("2026-03-01", "2026-03-10"),
+    ]
+    assert [p["minutes"] for p in result["series"]] == [90, 0, 30]
+    assert result["series"][2]["group_minutes"] == {"g2": 30}
+
+
+@pytest.mark.asyncio
+async def test_get_range_insights_rejects_reversed_range(user_id):
+    service = InsightsService(MagicMock())
+
+    with pytest.raises(BadRequestError):
+        await service.get_range_insights(
+            user_id, date(2026, 2, 1), date(2026, 1, 1), "day"
+        )
+
+
+@pytest.mark.asyncio
+async def test_get_trends_computes_rolling_average_deltas_and_goals(
+    user_id, target_date
+):
+    def row(period_start, category_id, group_id, minutes):
+        return {
+            "period_start": period_start,
+            "category_id": category_id,
+            "category_name": category_id,
+            "group_id": group_id,
+            "group_name": group_id,
+            "group_color": None,
+            "minutes": minutes,
+            "activities_count": 1,
+        }
+
+    repo = MagicMock()
+    repo._get_week_bounds = InsightsRepository._get_week_bounds
+    repo._get_goal_status = InsightsRepository._get_goal_status
+    # The week before the first one only feeds its delta and rolling average.
+    repo.get_range_rollup = AsyncMock(
+        return_value=[
+            row(date(2025, 12, 22), "c1", "g1", 60.0),
+            row(date(2025, 12, 29), "c1", "g1", 120.0),
+            row(date(2026, 1, 5), "c2", "g2", 30.0),
+            row(date(2026, 1, 12), "c1", "g1", 90.0),
+        ]
+    )
+    repo.get_goal_categories = AsyncMock(
+        return_value=[
+            SimpleNamespace(
+                id="c1",
+                min_weekly_hours=1,
+                target_weekly_hours=2,
+                max_weekly_hours=3,
+            )
+        ]
+    )
+    service = InsightsService(repo)
+
+    result = await service.get_trends(user_id, target_date, weeks=3, window=2)
+
+    repo.get_range_rollup.assert_awaited_once_with(
+        user_id, date(2025, 12, 22), date(2026, 1, 18), "week"
+    )
+    series = result["series"]
+    assert [week["week_start_date"] for week in series] == [
+        "2025-12-29",
+        "2026-01-05",
+        "2026-01-12",
+    ]
+    assert [week["total_minutes"] for week in series] == [120, 30, 90]
+    assert [week["total_minutes_delta"] for week in series] == [60, -90, 60]
+    assert [week["rolling_average_minutes"] for week in series] == [90.0, 75.0, 60.0]
+    assert [week["goals_met"] for week in series] == [1, 0, 0]
+    assert series[1]["group_minutes"] == {"g2": 30}
+    assert result["total_minutes"] == 240
+    assert [g["group_id"] for g in result["groups"]] == ["g1", "g2"]
+
+
+@pytest.mark.asyncio
+async def test_get_heatmap_builds_a_fixed_size_matrix(user_id):
+    repo = MagicMock()
+    repo.get_time_of_day_minutes = AsyncMock(
+        return_value=[
+            {"weekday": 0, "bucket": 9, "minutes": 50.0},
+            {"weekday": 6, "bucket": 23, "minutes": 10.0},
+        ]
+    )
+    service = InsightsService(repo)
+
+    # Wednesday to the Tuesday two weeks later: 13 days.
+    result = await service.get_heatmap(
+        user_id, date(2026, 1, 14), date(2026, 1, 26), 60
+    )
+
+    assert len(result["minutes"]) == 7
+    assert {len(row) for row in result["minutes"]} == {24}
+    assert result["minutes"][0][9] == 50.0
+    assert result["minutes"][6][23] == 10.0
+    assert result["total_minutes"] == 60
+    assert result["max_bucket_minutes"] == 50.0
+    assert result["weekday_counts"] == [2, 1, 2, 2, 2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_get_goal_history_week_in_progress_does_not_break_streak(user_id):
+    this_week = date.today() - timedelta(days=date.today().weekday())
+    repo = MagicMock()
+    repo._get_week_bounds = InsightsRepository._get_week_bounds
+    repo._get_goal_status = InsightsRepository._get_goal_status
+    repo.get_goal_history = AsyncMock(
+        return_value=[
+            {
+                "category_id": "c1",
+                "category_name": "Coding",
+                "min_weekly_minutes": 60.0,
+                "target_weekly_minutes": 120.0,
+                "max_weekly_minutes": 240.0,
+                "weeks": {
+                    this_week - timedelta(weeks=2): 150.0,
+                    this_week - timedelta(weeks=1): 300.0,
+                    this_week: 30.0,
+                },
+            }
+        ]
+    )
+    service = InsightsService(repo)
+
+    result = await service.get_goal_history(user_id, date.today(), weeks=4)
+
+    repo.get_goal_history.assert_awaited_once_with(
+        user_id, this_week - timedelta(weeks=3), this_week
+    )
+    [goal] = result["goals"]
+    assert [week["status"] for week in goal["weeks"]] == [
+        "under",
+        "target_met",
+        "over",
+        "under",
+    ]
+    assert goal["current_streak"] == 2
+    assert goal["weeks_met"] == 2
+    # The unfinished week is left out until it meets the target.
+    assert goal["attainment_percent"] == pytest.approx(200 / 3)
+    assert goal["best_week"]["minutes"] == 300
+
+
+@pytest.mark.asyncio
+async def test_get_duration_stats_splits_levels(user_id):
+    def row(level, **ids):
+        return {
+            "level": level,
+            "category_id": None,
+            "category_name": None,
+            "group_id": None,
+            "group_name": None,
+            "group_color": None,
+            "activities_count": 4,
+            "average_minutes": 50.0,
+            "median_minutes": 45.0,
+            "p90_minutes": 90.0,
+            "longest_minutes": 100.0,
+            "histogram": [0, 1, 2, 1, 0, 0],
+            **ids,
+        }
+
+    repo = MagicMock()
+    repo.get_duration_distribution = AsyncMock(
+        return_value=[
+            row("category", category_id="c1", category_name="Coding", group_id="g1"),
+            row("group", group_id="g1", group_name="Work"),
+            row("overall"),
+        ]
+    )
+    service = InsightsService(repo)
+
+    result = await service.get_duration_stats(
+        user_id, date(2026, 1, 1), date(2026, 1, 31)
+    )
+
+    assert result["overall"]["median_minutes"] == 45.0
+    assert result["overall"]["histogram"][0] == {
+        "min_minutes": 0,
+        "max_minutes": 15,
+        "count": 0,
+    }
+    assert result["overall"]["histogram"][-1]["max_minutes"] is None
+    assert [g["group_name"] for g in result["groups"]] == ["Work"]
+    assert result["categories"][0]["category_id"] == "c1"
+    assert "category_id" not in result["groups"][0]
+
+
+@pytest.mark.asyncio
+async def test_get_category_insights_unknown_category_raises_not_found(user_id):
+    repo = MagicMock()
+    repo._get_week_bounds = InsightsRepository._get_week_bounds
+    repo.get_category_overview = AsyncMock(return_value=None)
+    repo.get_range_rollup = AsyncMock()
+    service = InsightsService(repo)
+
+    with pytest.raises(NotFoundError):
+        await service.get_category_insights(
+            user_id, uuid4(), date(2026, 1, 1), date(2026, 1, 31)
+        )
+
+    repo.get_range_rollup.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_weekly_comparison_snapshots_only_ended_weeks(user_id):
+    snapshot_repo = MagicMock()
+    snapshot_repo.get = AsyncMock(return_value=None)
+    snapshot_repo.save = AsyncMock(return_value=True)
+    user_repo = MagicMock()
+    user_repo.get_change_version = AsyncMock(return_value=7)
+
+    past = date(2026, 1, 14)
+    service = InsightsService(_build_weekly_repo_mock(past), snapshot_repo, user_repo)
+    result = await service.get_weekly_comparison(user_id, past)
+
+    snapshot_repo.save.assert_awaited_once_with(
+        user_id, date(2026, 1, 12), WEEKLY_SNAPSHOT_FORMAT, result, 7
+    )
+
+    snapshot_repo.reset_mock()
+    service = InsightsService(
+        _build_weekly_repo_mock(date.today()), snapshot_repo, user_repo
+    )
+    await service.get_weekly_comparison(user_id, date.today())
+
+    snapshot_repo.get.assert_not_awaited()
+    snapshot_repo.save.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_weekly_comparison_returns_stored_snapshot(user_id):
+    repo = _build_weekly_repo_mock(date(2026, 1, 14))
+    snapshot_repo = MagicMock()
+    snapshot_repo.get = AsyncMock(return_value={"total_minutes": 42})
+    service = InsightsService(repo, snapshot_repo, MagicMock())
+
+    result = await service.get_weekly_comparison(user_id, date(2026, 1, 14))
+
+    assert result == {"total_minutes": 42}
+    repo.get_week_total_minutes.assert_not_awaited()
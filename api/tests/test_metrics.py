@@ -0,0 +1,117 @@
+import json
+import os
+import subprocess
+import sys
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.metrics import (
+    HTTP_REQUEST_DURATION,
+    REPOSITORY_CALL_DURATION,
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    repository_method_ctx,
+)
+from app.main import app
+from app.repositories.task_repository import TaskRepository
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(
+        Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    )
+    counter = registry.register(Counter("hits_total", "Hits.", ("cache",)))
+
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(3.0, "/a")
+    counter.inc('we"ird')
+
+    text = registry.render()
+
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'latency_seconds_sum{route="/a"} 3.55' in text
+    assert 'hits_total{cache="we\\"ird"} 1' in text
+
+
+@pytest.mark.asyncio
+async def test_repository_methods_are_timed_and_tagged():
+    session = AsyncMock()
+    seen: list[str | None] = []
+
+    async def execute(*args, **kwargs):
+        seen.append(repository_method_ctx.get())
+        return MagicMock()
+
+    session.execute = execute
+    repo = TaskRepository(session)
+    before = REPOSITORY_CALL_DURATION.count("TaskRepository.get")
+
+    await repo.get(uuid.uuid4())
+
+    assert seen == ["TaskRepository.get"]
+    assert REPOSITORY_CALL_DURATION.count("TaskRepository.get") == before + 1
+    assert repository_method_ctx.get() is None
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_labels_requests_by_route_template():
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as ac:
+        before = HTTP_REQUEST_DURATION.count("GET", "/health", "200")
+        await ac.get("/health")
+        await ac.get("/does-not-exist")
+        response = await ac.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert HTTP_REQUEST_DURATION.count("GET", "/health", "200") == before + 1
+    assert 'route="unmatched"' in response.text
+    assert 'db_pool_checked_out{pool="primary"} 0' in response.text
+    assert 'db_pool_overflow{pool="primary"} 0' in response.text
+    assert "http_requests_in_flight 1" in response.text
+
+
+def test_multiprocess_render_merges_worker_snapshots(tmp_path):
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("requests_total", "Requests.", ("route",)))
+    in_flight = registry.register(Gauge("in_flight", "In flight."))
+    latency = registry.register(
+        Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    )
+    requests.inc("/a")
+    in_flight.set(1)
+    latency.observe(0.05)
+
+    exited_pid = int(
+        subprocess.check_output([sys.executable, "-c", "import os; print(os.getpid())"])
+    )
+    other_worker = {
+        "requests_total": [[["/a"], 2], [["/b"], 5]],
+        "in_flight": [[[], 3]],
+        "latency_seconds": [[[], [0, 1, 0, 0.5]]],
+    }
+    (tmp_path / f"{os.getppid()}-live.json").write_text(json.dumps(other_worker))
+    (tmp_path / f"{exited_pid}-gone.json").write_text(json.dumps(other_worker))
+
+    text = registry.render_multiprocess(tmp_path)
+
+    assert 'requests_total{route="/a"} 5' in text
+    assert 'requests_total{route="/b"} 10' in text
+    # Gauges of an exited worker no longer describe anything.
+    assert "in_flight 4" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert len(list(tmp_path.glob("*.json"))) == 3
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+
+from app.core.logging import _add_request_id, _json_format
+from app.core.middleware import LoggingMiddleware, get_request_id
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"requestId": get_request_id()}
+
+    @app.get("/missing")
+    async def missing():
+        raise HTTPException(status_code=404)
+
+    return app
+
+
+@pytest.fixture
+def records():
+    captured: list[dict] = []
+    handler_id = logger.add(
+        lambda message: captured.append(message.record), level="DEBUG"
+    )
+    yield captured
+    logger.remove(handler_id)
+
+
+@pytest.mark.asyncio
+async def test_generates_request_id_and_logs_single_record(records):
+    async with AsyncClient(
+        transport=ASGITransport(app=make_app()), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/ping", params={"token": "secret"})
+
+    request_id = response.headers["x-request-id"]
+    assert response.json() == {"requestId": request_id}
+    access = [r for r in records if "status" in r["extra"]]
+    assert len(access) == 1
+    extra = access[0]["extra"]
+    assert extra["path"] == "/ping"
+    assert extra["status"] == 200
+    assert extra["response_bytes"] == len(response.content)
+    assert extra["db_queries"] == 0
+    assert "secret" not in access[0]["message"]
+    assert get_request_id() is None
+
+
+@pytest.mark.asyncio
+async def test_reuses_incoming_request_id_and_warns_on_client_errors(records):
+    async with AsyncClient(
+        transport=ASGITransport(app=make_app()), base_url="http://test"
+    ) as ac:
+        response = await ac.get("/missing", headers={"X-Request-ID": "abc-123"})
+
+    assert response.headers["x-request-id"] == "abc-123"
+    access = [r for r in records if "status" in r["extra"]]
+    assert access[0]["level"].name == "WARNING"
+    assert access[0]["extra"]["status"] == 404
+
+
+def test_json_format_includes_request_id_and_fields():
+    captured: list[str] = []
+    handler_id = logger.add(captured.append, format=_json_format, level="DEBUG")
+    try:
+        logger.patch(_add_request_id).bind(status=200).info("done")
+    finally:
+        logger.remove(handler_id)
+
+    payload = json.loads(captured[0])
+    assert payload["message"] == "done"
+    assert payload["level"] == "INFO"
+    assert payload["status"] == 200
+    assert payload["request_id"] == "-"
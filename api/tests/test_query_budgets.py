@@ -0,0 +1,228 @@
+"""Query budgets for the hot endpoints; needs TEST_DATABASE_URL (see query_budget)."""
+
+from datetime import date, time
+
+import pytest
+
+from app.core.config import settings
+from app.models.activity import Activity, Category, Group
+from app.models.task import Task, TaskActivity, TaskList
+from tests.query_budget import query_budget
+
+API = settings.API_V1_STR
+
+
+@pytest.fixture
+async def seeded(db_session, api_user):
+    group = Group(user_id=api_user.id, name="Work", color="#336699")
+    db_session.add(group)
+    await db_session.flush()
+    category = Category(user_id=api_user.id, group_id=group.id, name="Deep work")
+    task_list = TaskList(user_id=api_user.id, name="Inbox", color="#FF5733")
+    db_session.add_all([category, task_list])
+    await db_session.flush()
+
+    tasks = [
+        Task(
+            user_id=api_user.id,
+            task_list_id=task_list.id,
+            category_id=category.id,
+            title=f"Task {index}",
+            scheduled_date=date(2026, 3, 2),
+            scheduled_start_time=time(9 + index % 8, 0),
+            scheduled_end_time=time(10 + index % 8, 0),
+            position=float(index),
+        )
+        for index in range(20)
+    ]
+    activities = [
+        Activity(
+            user_id=api_user.id,
+            category_id=category.id,
+            date=date(2026, 3, day),
+            start_time=time(9, 0),
+            end_time=time(11, 0),
+        )
+        for day in range(1, 15)
+    ]
+    db_session.add_all(tasks + activities)
+    await db_session.flush()
+    db_session.add_all(
+        TaskActivity(task_id=task.id, activity_id=activity.id)
+        for task, activity in zip(tasks, activities, strict=False)
+    )
+    await db_session.commit()
+    return {"category": category, "tasks": tasks}
+
+
+@query_budget(5)
+async def test_list_activities_budget(api_client, seeded):
+    response = await api_client.get(f"{API}/activities")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 14
+
+
+@query_budget(3)
+async def test_list_tasks_budget(api_client, seeded):
+    response = await api_client.get(f"{API}/tasks")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 20
+
+
+# An ended week with no snapshot yet: the snapshot lookup, the version read
+# and the snapshot insert come on top of the 13 aggregate queries.
+@query_budget(17)
+async def test_get_weekly_comparison_budget(api_client, seeded):
+    response = await api_client.get(
+        f"{API}/insights/weekly-comparison", params={"date": "2026-03-11"}
+    )
+
+    assert response.status_code == 200
+
+
+@query_budget(2)
+async def test_get_range_insights_budget(api_client, seeded):
+    response = await api_client.get(
+        f"{API}/insights/range",
+        params={"from": "2026-01-01", "to": "2026-12-31", "granularity": "week"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["totalMinutes"] == 14 * 120
+    assert len(body["series"]) == 53
+    assert body["series"][9] == {
+        "periodStart": "2026-03-02",
+        "periodEnd": "2026-03-08",
+        "minutes": 7 * 120,
+        "activitiesCount": 7,
+        "groupMinutes": {str(seeded["category"].group_id): 7 * 120},
+    }
+
+
+@query_budget(3)
+async def test_get_trends_budget(api_client, seeded):
+    response = await api_client.get(
+        f"{API}/insights/trends", params={"weeks": 260, "date": "2026-03-11"}
+    )
+
+    assert response.status_code == 200
+    series = response.json()["series"]
+    assert len(series) == 260
+    assert [week["totalMinutes"] for week in series[-3:]] == [120, 840, 720]
+
+
+@query_budget(2)
+async def test_get_heatmap_budget(api_client, db_session, api_user, seeded):
+    db_session.add(
+        Activity(
+            user_id=api_user.id,
+            category_id=seeded["category"].id,
+            date=date(2026, 3, 2),
+            start_time=time(13, 50),
+            end_time=time(14, 20),
+        )
+    )
+    await db_session.commit()
+
+    response = await api_client.get(
+        f"{API}/insights/heatmap",
+        params={"from": "2026-03-02", "to": "2026-03-08", "bucket_minutes": 15},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    monday = body["minutes"][0]
+    assert len(body["minutes"]) == 7 and len(monday) == 96
+    assert monday[36:44] == [15.0] * 8
+    # 13:50-14:20 is split across the 13:45, 14:00 and 14:15 buckets.
+    assert monday[55:58] == [10.0, 15.0, 5.0]
+    assert body["totalMinutes"] == 7 * 120 + 30
+    assert body["weekdayCounts"] == [1] * 7
+
+
+@query_budget(2)
+async def test_get_goal_history_budget(api_client, seeded):
+    response = await api_client.get(
+        f"{API}/insights/goals", params={"weeks": 260, "date": "2026-03-11"}
+    )
+
+    assert response.status_code == 200
+
+
+@query_budget(2)
+async def test_get_duration_stats_budget(api_client, db_session, api_user, seeded):
+    db_session.add(
+        Activity(
+            user_id=api_user.id,
+            category_id=seeded["category"].id,
+            date=date(2026, 3, 2),
+            start_time=time(14, 0),
+            end_time=time(14, 30),
+        )
+    )
+    await db_session.commit()
+
+    response = await api_client.get(
+        f"{API}/insights/durations", params={"from": "2026-03-01", "to": "2026-03-31"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["overall"]["activitiesCount"] == 15
+    assert body["overall"]["medianMinutes"] == 120.0
+    assert body["overall"]["longestMinutes"] == 120.0
+    assert [b["count"] for b in body["overall"]["histogram"]] == [0, 0, 1, 0, 14, 0]
+    assert [g["groupName"] for g in body["groups"]] == ["Work"]
+    [category] = body["categories"]
+    assert category["categoryName"] == "Deep work"
+    assert category["groupName"] == "Work"
+    assert category["p90Minutes"] == 120.0
+
+
+@query_budget(5)
+async def test_get_category_insights_budget(api_client, db_session, seeded):
+    category = seeded["category"]
+    category.target_weekly_hours = 10
+    seeded["tasks"][1].status = "done"
+    await db_session.commit()
+
+    response = await api_client.get(
+        f"{API}/insights/categories/{category.id}",
+        params={"from": "2026-03-02", "to": "2026-03-15"},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["totalMinutes"] == 13 * 120
+    assert [day["minutes"] for day in body["daily"]] == [120] * 13 + [0]
+    assert body["hourlyMinutes"][9:11] == [13 * 60.0] * 2
+    assert body["tasks"] == {"linkedTasks": 13, "completedTasks": 1}
+    assert [week["status"] for week in body["goal"]["weeks"]] == [
+        "over",
+        "over",
+    ]
+
+
+# Includes the single users.change_version UPDATE shared by all writes.
+@query_budget(8)
+async def test_complete_task_budget(api_client, seeded):
+    task = seeded["tasks"][-1]
+
+    response = await api_client.post(
+        f"{API}/tasks/{task.id}/complete", json={"addToTracker": True}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "done"
+    assert len(response.json()["activityIds"]) == 1
+
+
+@query_budget(9)
+async def test_sync_budget(api_client, seeded):
+    response = await api_client.get(f"{API}/sync")
+
+    assert response.status_code == 200
+    assert len(response.json()["tasks"]) == 20
@@ -0,0 +1,105 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.core.metrics import DB_QUERIES, repository_method_ctx
+from app.db.instrumentation import (
+    QueryStats,
+    _after_cursor_execute,
+    _before_cursor_execute,
+    instrument_queries,
+    parameter_shape,
+    query_stats_ctx,
+)
+
+
+@pytest.fixture
+def records():
+    captured: list[dict] = []
+    handler_id = logger.add(
+        lambda message: captured.append(message.record), level="DEBUG"
+    )
+    yield captured
+    logger.remove(handler_id)
+
+
+def run_statement(statement: str, parameters, seconds: float = 0.0) -> None:
+    context = SimpleNamespace()
+    _before_cursor_execute(None, None, statement, parameters, context, False)
+    context._query_start_time -= seconds
+    _after_cursor_execute(None, None, statement, parameters, context, False)
+
+
+def test_statements_are_attributed_to_request_and_repository(records):
+    stats = QueryStats()
+    stats_token = query_stats_ctx.set(stats)
+    method_token = repository_method_ctx.set("TaskRepository.get")
+    before = DB_QUERIES.value("TaskRepository.get")
+    try:
+        run_statement("SELECT 1", ())
+        run_statement("SELECT 2", ())
+    finally:
+        repository_method_ctx.reset(method_token)
+        query_stats_ctx.reset(stats_token)
+
+    assert stats.count == 2
+    assert DB_QUERIES.value("TaskRepository.get") == before + 2
+    assert not [r for r in records if "Slow query" in r["message"]]
+
+
+def test_slow_statements_are_logged_without_parameter_values(records, monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 50.0)
+    secret_id = uuid.uuid4()
+
+    run_statement(
+        "SELECT *\n  FROM tasks WHERE id = $1 AND title = $2",
+        (secret_id, "private title"),
+        seconds=0.1,
+    )
+
+    slow = [r for r in records if "Slow query" in r["message"]]
+    assert len(slow) == 1
+    extra = slow[0]["extra"]
+    assert extra["repository_method"] == "-"
+    assert extra["statement"] == "SELECT * FROM tasks WHERE id = $1 AND title = $2"
+    assert extra["parameters"] == "(UUID, str[13])"
+    assert str(secret_id) not in str(extra)
+
+
+def test_parameter_shape_describes_batches_and_named_params():
+    assert parameter_shape([(1, "a"), (2, "b")], True) == "2 x (int, str[1])"
+    assert (
+        parameter_shape({"day": date(2026, 1, 1), "ids": [1, 2]}, False)
+        == "{day: date, ids: list[2]}"
+    )
+
+
+def test_query_stats_reports_milliseconds():
+    stats = QueryStats(count=3, total_seconds=0.012345)
+
+    assert stats.total_ms == 12.35
+
+
+async def test_failed_statements_leave_nothing_on_the_connection(db_engine):
+    instrument_queries(db_engine)
+    stats = QueryStats()
+    token = query_stats_ctx.set(stats)
+    try:
+        async with db_engine.connect() as conn:
+            with pytest.raises(DBAPIError):
+                await conn.execute(text("SELECT 1 / 0"))
+            await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+            info = conn.sync_connection.info
+    finally:
+        query_stats_ctx.reset(token)
+
+    assert "query_start_time" not in info
+    assert stats.count == 1
+    assert stats.total_seconds < 1
@@ -0,0 +1,99 @@
+import time
+from contextlib import asynccontextmanager
+from typing import Annotated
+from unittest.mock import AsyncMock, call, patch
+
+from fastapi import Depends, FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from app import main
+from app.core.middleware import ReadYourWritesMiddleware
+from app.db import session as db_session
+from app.db.session import PRIMARY_UNTIL_COOKIE, get_db, get_read_db
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=5)
+
+    @app.get("/api/v1/reads")
+    async def reads(db: Annotated[str, Depends(get_read_db)]):
+        return {"db": db}
+
+    @app.post("/api/v1/writes")
+    async def writes():
+        return {}
+
+    @app.post("/api/v1/rejected")
+    async def rejected():
+        raise HTTPException(status_code=400)
+
+    async def primary():
+        yield "primary"
+
+    app.dependency_overrides[get_db] = primary
+    return app
+
+
+@asynccontextmanager
+async def replica_session():
+    yield "replica"
+
+
+async def test_successful_writes_pin_the_client_to_the_primary():
+    async with AsyncClient(
+        transport=ASGITransport(app=make_app()), base_url="http://test"
+    ) as client:
+        read = await client.get("/api/v1/reads")
+        rejected = await client.post("/api/v1/rejected")
+        write = await client.post("/api/v1/writes")
+
+    assert PRIMARY_UNTIL_COOKIE not in read.cookies
+    assert PRIMARY_UNTIL_COOKIE not in rejected.cookies
+    until = int(write.cookies[PRIMARY_UNTIL_COOKIE])
+    assert time.time() < until <= time.time() + 5
+    assert "Max-Age=5" in write.headers["set-cookie"]
+
+
+async def test_reads_go_to_the_replica_outside_the_window():
+    with patch.object(db_session, "AsyncReadSessionLocal", replica_session):
+        async with AsyncClient(
+            transport=ASGITransport(app=make_app()), base_url="http://test"
+        ) as client:
+            before = await client.get("/api/v1/reads")
+            await client.post("/api/v1/writes")
+            after = await client.get("/api/v1/reads")
+            client.cookies.set(PRIMARY_UNTIL_COOKIE, str(int(time.time()) - 1))
+            expired = await client.get("/api/v1/reads")
+
+    assert before.json() == {"db": "replica"}
+    assert after.json() == {"db": "primary"}
+    assert expired.json() == {"db": "replica"}
+
+
+async def test_reads_use_the_primary_without_a_replica():
+    async with AsyncClient(
+        transport=ASGITransport(app=make_app()), base_url="http://test"
+    ) as client:
+        response = await client.get("/api/v1/reads")
+
+    assert response.json() == {"db": "primary"}
+
+
+async def test_lifespan_warms_up_and_disposes_the_replica_pool():
+    primary, replica = AsyncMock(), AsyncMock()
+    warm_up = AsyncMock()
+
+    with (
+        patch.object(main, "engine", primary),
+        patch.object(main, "read_engine", replica),
+        patch.object(main, "warm_up_pool", warm_up),
+        patch.object(main.LoggerConfig, "setup"),
+        patch.object(main.settings, "LOG_FILES", False),
+        patch.object(main.settings, "METRICS_MULTIPROC_DIR", None),
+    ):
+        async with main.lifespan(main.app):
+            assert warm_up.await_args_list == [call(primary), call(replica)]
+
+    primary.dispose.assert_awaited_once()
+    replica.dispose.assert_awaited_once()
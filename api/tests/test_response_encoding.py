@@ -0,0 +1,55 @@
+from unittest.mock import patch
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from benchmarks.serialization import VARIANTS, build_app
+
+
+def test_model_routes_keep_pydantic_json_path():
+    # An explicit response_class makes FastAPI dump to a dict and re-encode it
+    # with json.dumps, about twice as slow for 1k-item lists.
+    slow = [
+        route.path
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.response_model is not None
+        and not isinstance(route.response_class, DefaultPlaceholder)
+    ]
+
+    assert slow == []
+
+
+async def test_serialization_variants_encode_identically():
+    bench_app = build_app(items=5)
+
+    async with AsyncClient(
+        transport=ASGITransport(app=bench_app), base_url="http://test"
+    ) as client:
+        for resource in ("activities", "tasks"):
+            bodies = {
+                (await client.get(f"/{variant}/{resource}")).content
+                for variant in VARIANTS
+            }
+
+            assert len(bodies) == 1
+
+
+async def test_response_model_is_dumped_without_json_response():
+    # FastAPI before 0.130 validated, dumped to a dict and then ran
+    # JSONResponse.render (json.dumps) even without a response_class.
+    bench_app = build_app(items=5)
+
+    with patch.object(
+        JSONResponse, "render", autospec=True, side_effect=JSONResponse.render
+    ) as render:
+        async with AsyncClient(
+            transport=ASGITransport(app=bench_app), base_url="http://test"
+        ) as client:
+            response = await client.get("/default/tasks")
+
+    render.assert_not_called()
+    assert len(response.json()) == 5
@@ -0,0 +1,65 @@
+import os
+from unittest.mock import patch
+
+from app import server
+
+
+def test_cpu_quota_reads_cgroup_v2(tmp_path):
+    (tmp_path / "cpu.max").write_text("250000 100000\n")
+
+    assert server.cpu_quota(tmp_path) == 2.5
+
+
+def test_cpu_quota_unlimited_cgroup_v2(tmp_path):
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+
+    assert server.cpu_quota(tmp_path) is None
+
+
+def test_cpu_quota_reads_cgroup_v1(tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("150000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+
+    assert server.cpu_quota(tmp_path) == 1.5
+
+
+def test_worker_count_rounds_quota_up_and_caps_at_affinity(tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+
+    with patch("os.sched_getaffinity", return_value=set(range(8))):
+        assert server.worker_count(tmp_path) == 2
+    with patch("os.sched_getaffinity", return_value={0}):
+        assert server.worker_count(tmp_path) == 1
+
+
+def test_worker_count_prefers_web_concurrency(tmp_path):
+    with patch.object(server.settings, "WEB_CONCURRENCY", 3):
+        assert server.worker_count(tmp_path) == 3
+
+
+def test_prepare_metrics_dir_only_for_several_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv("METRICS_MULTIPROC_DIR", "")
+    (tmp_path / "123-stale.json").write_text("{}")
+
+    assert server.prepare_metrics_dir(1) is None
+    with patch.object(server.settings, "METRICS_MULTIPROC_DIR", str(tmp_path)):
+        assert server.prepare_metrics_dir(4) == tmp_path
+
+    assert list(tmp_path.iterdir()) == []
+    assert os.environ["METRICS_MULTIPROC_DIR"] == str(tmp_path)
+
+
+def test_several_workers_log_to_stdout_only(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOG_FILES", "true")
+    monkeypatch.setenv("METRICS_MULTIPROC_DIR", str(tmp_path))
+
+    with (
+        patch.object(server.settings, "WEB_CONCURRENCY", 2),
+        patch.object(server.settings, "METRICS_MULTIPROC_DIR", str(tmp_path)),
+        patch.object(server.uvicorn, "run") as run,
+    ):
+        server.main()
+
+    assert run.call_args.kwargs["workers"] == 2
+    assert os.environ["LOG_FILES"] == "false"
@@ -0,0 +1,147 @@
+"""GET /sync against Postgres, where the change-tracking triggers run; needs
+TEST_DATABASE_URL (see query_budget)."""
+
+from datetime import datetime
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from openpyxl import Workbook
+
+from app.core.config import settings
+from app.services.sync_service import SyncService
+
+API = settings.API_V1_STR
+
+
+async def create_category(api_client) -> tuple[dict, dict]:
+    group = (await api_client.post(f"{API}/groups", json={"name": "Work"})).json()
+    category = (
+        await api_client.post(
+            f"{API}/categories", json={"name": "Deep work", "groupId": group["id"]}
+        )
+    ).json()
+    return group, category
+
+
+async def test_sync_returns_only_rows_written_after_the_cursor(api_client):
+    group, category = await create_category(api_client)
+
+    full = (await api_client.get(f"{API}/sync")).json()
+    assert full["reset"] is True
+    assert [g["id"] for g in full["groups"]] == [group["id"]]
+    assert [c["id"] for c in full["categories"]] == [category["id"]]
+
+    activity = (
+        await api_client.post(
+            f"{API}/activities",
+            json={
+                "date": "2026-03-02",
+                "startTime": "09:00",
+                "endTime": "10:00",
+                "categoryId": category["id"],
+            },
+        )
+    ).json()
+    await api_client.patch(f"{API}/groups/{group['id']}", json={"name": "Office"})
+
+    delta = (
+        await api_client.get(f"{API}/sync", params={"since": full["cursor"]})
+    ).json()
+    assert delta["reset"] is False
+    assert delta["cursor"] > full["cursor"]
+    assert [g["name"] for g in delta["groups"]] == ["Office"]
+    assert delta["categories"] == []
+    assert [a["id"] for a in delta["activities"]] == [activity["id"]]
+    assert delta["deleted"] == []
+
+    unchanged = (
+        await api_client.get(f"{API}/sync", params={"since": delta["cursor"]})
+    ).json()
+    assert unchanged["cursor"] == delta["cursor"]
+    assert unchanged["groups"] == unchanged["activities"] == []
+
+
+async def test_sync_reports_deletions_including_cascades(api_client):
+    _, category = await create_category(api_client)
+    task_list = (
+        await api_client.post(f"{API}/task-lists", json={"name": "Inbox"})
+    ).json()
+    task = (
+        await api_client.post(
+            f"{API}/tasks",
+            json={
+                "taskListId": task_list["id"],
+                "title": "Write report",
+                "categoryId": category["id"],
+                "scheduledDate": "2026-03-02",
+                "scheduledStartTime": "09:00",
+                "scheduledEndTime": "10:00",
+            },
+        )
+    ).json()
+    await api_client.post(
+        f"{API}/tasks/{task['id']}/complete", json={"addToTracker": True}
+    )
+    cursor = (await api_client.get(f"{API}/sync")).json()["cursor"]
+
+    await api_client.delete(f"{API}/task-lists/{task_list['id']}")
+
+    delta = (await api_client.get(f"{API}/sync", params={"since": cursor})).json()
+    deleted = {(d["entity"], d["id"]) for d in delta["deleted"]}
+    assert ("task_lists", task_list["id"]) in deleted
+    assert ("tasks", task["id"]) in deleted
+    assert {entity for entity, _ in deleted} == {
+        "task_lists",
+        "tasks",
+        "task_activities",
+    }
+    assert delta["tasks"] == delta["taskLists"] == []
+
+
+async def test_sync_returns_rows_written_by_an_excel_import(api_client):
+    cursor = (await api_client.get(f"{API}/sync")).json()["cursor"]
+    workbook = Workbook()
+    parametre = workbook.active
+    parametre.title = "Paramètre"
+    parametre.append(["Catégorie", "Groupe"])
+    parametre.append(["Deep work", "Work", 1, 0, 5, 10, "hours", "oui"])
+    journal = workbook.create_sheet("Journal")
+    journal.append(["Date"])
+    journal.append(
+        [datetime(2026, 3, 2), None, 9, 0, 10, 0, None, None, None, "Deep work"]
+    )
+    file = BytesIO()
+    workbook.save(file)
+
+    imported = await api_client.post(
+        f"{API}/import/excel", files={"file": ("journal.xlsx", file.getvalue())}
+    )
+    assert imported.json()["activitiesCreated"] == 1
+
+    delta = (await api_client.get(f"{API}/sync", params={"since": cursor})).json()
+    assert [g["name"] for g in delta["groups"]] == ["Work"]
+    assert [c["name"] for c in delta["categories"]] == ["Deep work"]
+    assert [a["startTime"] for a in delta["activities"]] == ["09:00:00"]
+
+
+async def test_cursor_ahead_of_the_version_gets_a_full_snapshot():
+    sync_repo = MagicMock()
+    for name in (
+        "get_changed",
+        "get_changed_task_lists",
+        "get_changed_tasks",
+        "get_changed_task_activities",
+        "get_tombstones",
+    ):
+        setattr(sync_repo, name, AsyncMock(return_value=[]))
+    user_repo = MagicMock()
+    user_repo.get_change_version = AsyncMock(return_value=3)
+    user_id = uuid4()
+
+    response = await SyncService(sync_repo, user_repo).get_changes(user_id, 10)
+
+    assert response.reset is True
+    assert response.cursor == 3
+    sync_repo.get_changed_tasks.assert_awaited_once_with(user_id, None, 3)
+    sync_repo.get_tombstones.assert_not_awaited()
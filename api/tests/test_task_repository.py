@@ -0,0 +1,176 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import app.models.refresh_token  # noqa: F401
+from app.models.task import Task, TaskList
+from app.repositories.task_repository import TaskListRepository, TaskRepository
+from app.schemas.task import TaskListResponse
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def session():
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    return session
+
+
+@pytest.mark.asyncio
+async def test_get_task_lists_counts_tasks_in_single_query(session):
+    repo = TaskListRepository(session)
+
+    await repo.get_by_user(uuid.uuid4())
+
+    session.execute.assert_awaited_once()
+    sql = _compile(session.execute.await_args.args[0])
+    assert "LEFT OUTER JOIN tasks" in sql
+    assert "GROUP BY task_lists.id" in sql
+    assert sql.count("count(tasks.id) FILTER (WHERE tasks.status") == 3
+
+
+@pytest.mark.asyncio
+async def test_update_task_list_reloads_counts(session):
+    repo = TaskListRepository(session)
+    task_list = TaskList(id=uuid.uuid4(), user_id=uuid.uuid4(), name="Inbox")
+
+    await repo.update(task_list, {"name": "Work"})
+
+    session.commit.assert_awaited_once()
+    sql = _compile(session.execute.await_args.args[0])
+    assert "LEFT OUTER JOIN tasks" in sql
+
+
+@pytest.mark.asyncio
+async def test_single_task_list_reads_load_counts(session):
+    repo = TaskListRepository(session)
+
+    await repo.get_by_id_and_user(uuid.uuid4(), uuid.uuid4())
+    await repo.create(user_id=uuid.uuid4(), name="Inbox")
+
+    session.commit.assert_awaited_once()
+    session.refresh.assert_not_awaited()
+    for call in session.execute.await_args_list:
+        sql = _compile(call.args[0])
+        assert "LEFT OUTER JOIN tasks" in sql
+        assert "GROUP BY task_lists.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_reorder_tasks_uses_single_update_from_values(session):
+    repo = TaskRepository(session)
+    moved_ids = [uuid.uuid4(), uuid.uuid4()]
+    session.execute.return_value.scalars.return_value.all.return_value = moved_ids
+
+    updated = await repo.reorder(uuid.uuid4(), dict.fromkeys(moved_ids, 1.5))
+
+    assert updated == set(moved_ids)
+    session.execute.assert_awaited_once()
+    session.commit.assert_awaited_once()
+    sql = _compile(session.execute.await_args.args[0])
+    assert sql.startswith("UPDATE tasks SET position=moves.position")
+    assert "FROM (VALUES" in sql
+
+
+@pytest.mark.asyncio
+async def test_reorder_rolls_back_when_an_id_is_not_owned(session):
+    repo = TaskListRepository(session)
+    owned_id = uuid.uuid4()
+    session.execute.return_value.scalars.return_value.all.return_value = [owned_id]
+
+    updated = await repo.reorder(uuid.uuid4(), {owned_id: 1.0, uuid.uuid4(): 2.0})
+
+    assert updated == {owned_id}
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_create_task_does_not_reselect(session):
+    session.add = MagicMock()
+    repo = TaskRepository(session)
+
+    task = await repo.create(
+        user_id=uuid.uuid4(), task_list_id=uuid.uuid4(), title="Write report"
+    )
+
+    assert isinstance(task, Task)
+    assert task.task_activities == []
+    session.commit.assert_awaited_once()
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_task_without_commit_only_flushes(session):
+    session.add = MagicMock()
+    repo = TaskRepository(session)
+    task = Task(id=uuid.uuid4(), title="Write report", status="todo")
+
+    updated = await repo.update(task, {"status": "done"}, commit=False)
+
+    assert updated is task
+    assert task.status == "done"
+    session.flush.assert_awaited_once()
+    session.commit.assert_not_awaited()
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_skipped_on_uses_array_containment(session):
+    repo = TaskRepository(session)
+
+    await repo.get_skipped_on(date(2026, 2, 1))
+
+    sql = _compile(session.execute.await_args.args[0])
+    assert "tasks.exception_dates @> " in sql
+    assert "tasks.user_id" not in sql.split("WHERE", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_get_excluded_dates_unions_exceptions_and_occurrences(session):
+    repo = TaskRepository(session)
+    task = Task(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        task_list_id=uuid.uuid4(),
+        title="Stand-up",
+    )
+    session.execute.return_value.scalars.return_value.all.return_value = [
+        date(2026, 2, 1)
+    ]
+
+    assert await repo.get_excluded_dates(task) == {date(2026, 2, 1)}
+    session.execute.assert_awaited_once()
+    sql = _compile(session.execute.await_args.args[0])
+    assert "UNION" in sql
+    assert "unnest(tasks.exception_dates)" in sql
+
+
+def test_task_list_response_exposes_status_counts():
+    task_list = SimpleNamespace(
+        id=uuid.uuid4(),
+        name="Inbox",
+        color=None,
+        icon=None,
+        position=0,
+        task_count=5,
+        todo_count=2,
+        in_progress_count=1,
+        done_count=2,
+        created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-01T00:00:00Z",
+    )
+
+    response = TaskListResponse.model_validate(task_list).model_dump(by_alias=True)
+
+    assert response["taskCount"] == 5
+    assert response["todoCount"] == 2
+    assert response["inProgressCount"] == 1
+    assert response["doneCount"] == 2
@@ -3,8 +3,13 @@ from datetime import date, time
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.exc import IntegrityError
 
+from app.api.deps import get_current_user
+from app.api.v1.endpoints import task as task_endpoints
+from app.core.exception_handlers import register_exception_handlers
 from app.exceptions import BadRequestError, DependencyConflictError, NotFoundError
 from app.repositories.task_repository import (
     TaskActivityRepository,
@@ -13,6 +18,8 @@ from app.repositories.task_repository import (
 )
 from app.schemas.task import (
     ConvertToActivityRequest,
+    PositionMove,
+    ReorderRequest,
     TaskCompleteRequest,
     TaskCreate,
     TaskListCreate,
@@ -382,6 +389,90 @@ async def test_delete_task_raises_dependency_conflict_on_integrity_error(
         await task_service.delete_task(task_id, user_id)
 
 
+@pytest.mark.asyncio
+async def test_reorder_tasks_applies_moves_in_one_batch(task_service, task_repo):
+    user_id = uuid.uuid4()
+    first_id = uuid.uuid4()
+    second_id = uuid.uuid4()
+    data = ReorderRequest(
+        moves=[
+            PositionMove(id=first_id, position=1.5),
+            PositionMove(id=second_id, position=0.25),
+        ]
+    )
+    task_repo.reorder.return_value = {first_id, second_id}
+
+    await task_service.reorder_tasks(data, user_id)
+
+    task_repo.reorder.assert_awaited_once_with(
+        user_id, {first_id: 1.5, second_id: 0.25}
+    )
+
+
+@pytest.mark.asyncio
+async def test_reorder_tasks_raises_not_found_for_foreign_ids(task_service, task_repo):
+    user_id = uuid.uuid4()
+    own_id = uuid.uuid4()
+    foreign_id = uuid.uuid4()
+    data = ReorderRequest(
+        moves=[
+            PositionMove(id=own_id, position=1.0),
+            PositionMove(id=foreign_id, position=2.0),
+        ]
+    )
+    task_repo.reorder.return_value = {own_id}
+
+    with pytest.raises(NotFoundError):
+        await task_service.reorder_tasks(data, user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/tasks/reorder", "/task-lists/reorder"])
+@pytest.mark.parametrize("position", ["NaN", "Infinity", "-Infinity", "1e999"])
+async def test_reorder_rejects_non_finite_positions(path, position, task_service):
+    app = FastAPI()
+    register_exception_handlers(app)
+    app.include_router(task_endpoints.router)
+    app.dependency_overrides[get_current_user] = lambda: MagicMock(id=uuid.uuid4())
+    app.dependency_overrides[task_endpoints.get_task_service] = lambda: task_service
+    body = f'{{"moves": [{{"id": "{uuid.uuid4()}", "position": {position}}}]}}'
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post(
+            path, content=body, headers={"Content-Type": "application/json"}
+        )
+
+    assert response.status_code == 422
+    task_service.task_repo.reorder.assert_not_awaited()
+    task_service.task_list_repo.reorder.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_reorder_task_lists_applies_moves(task_service, task_list_repo):
+    user_id = uuid.uuid4()
+    list_id = uuid.uuid4()
+    data = ReorderRequest(moves=[PositionMove(id=list_id, position=3.0)])
+    task_list_repo.reorder.return_value = {list_id}
+
+    await task_service.reorder_task_lists(data, user_id)
+
+    task_list_repo.reorder.assert_awaited_once_with(user_id, {list_id: 3.0})
+
+
+def test_reorder_request_rejects_duplicate_ids():
+    move_id = uuid.uuid4()
+
+    with pytest.raises(ValueError):
+        ReorderRequest(
+            moves=[
+                PositionMove(id=move_id, position=1.0),
+                PositionMove(id=move_id, position=2.0),
+            ]
+        )
+
+
 @pytest.mark.asyncio
 async def test_generate_occurrences_success(task_service, task_repo):
     task_id = uuid.uuid4()
@@ -392,7 +483,7 @@ async def test_generate_occurrences_success(task_service, task_repo):
         scheduled_date=date(2026, 1, 10),
     )
     task_repo.get_by_id_and_user.return_value = task
-    task_repo.get_by_user.return_value = []
+    task_repo.get_excluded_dates.return_value = set()
     task_repo.create.side_effect = [
         make_task_mock(id=uuid.uuid4(), scheduled_date=date(2026, 1, 11)),
         make_task_mock(id=uuid.uuid4(), scheduled_date=date(2026, 1, 12)),
@@ -403,6 +494,10 @@ async def test_generate_occurrences_success(task_service, task_repo):
 
     assert len(result) == 3
     assert task_repo.create.await_count == 3
+    assert all(
+        call.kwargs["commit"] is False for call in task_repo.create.await_args_list
+    )
+    task_repo.commit.assert_awaited_once()
     first_call = task_repo.create.await_args_list[0].kwargs
     second_call = task_repo.create.await_args_list[1].kwargs
     assert first_call["scheduled_date"] == date(2026, 1, 11)
@@ -417,10 +512,10 @@ async def test_generate_occurrences_skips_exception_dates(task_service, task_rep
         id=task_id,
         recurrence_rule="FREQ=DAILY",
         scheduled_date=date(2026, 1, 10),
-        exception_dates=["2026-01-11"],
+        exception_dates=[date(2026, 1, 11)],
     )
     task_repo.get_by_id_and_user.return_value = task
-    task_repo.get_by_user.return_value = []
+    task_repo.get_excluded_dates.return_value = {date(2026, 1, 11)}
     task_repo.create.side_effect = [
         make_task_mock(id=uuid.uuid4(), scheduled_date=date(2026, 1, 12)),
         make_task_mock(id=uuid.uuid4(), scheduled_date=date(2026, 1, 13)),
@@ -435,6 +530,37 @@ async def test_generate_occurrences_skips_exception_dates(task_service, task_rep
     assert second_call["scheduled_date"] == date(2026, 1, 13)
 
 
+@pytest.mark.asyncio
+async def test_generate_occurrences_skips_existing_occurrences(task_service, task_repo):
+    task_id = uuid.uuid4()
+    user_id = uuid.uuid4()
+    task = make_task_mock(
+        id=task_id,
+        recurrence_rule="FREQ=DAILY",
+        scheduled_date=date(2026, 1, 10),
+    )
+    task_repo.get_by_id_and_user.return_value = task
+    task_repo.get_excluded_dates.return_value = {date(2026, 1, 11)}
+    task_repo.create.return_value = make_task_mock(id=uuid.uuid4())
+
+    await task_service.generate_occurrences(task_id, user_id, count=1)
+
+    task_repo.get_excluded_dates.assert_awaited_once_with(task)
+    assert task_repo.create.await_args.kwargs["scheduled_date"] == date(2026, 1, 12)
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_skipped_on_filters_by_user(task_service, task_repo):
+    user_id = uuid.uuid4()
+    skipped = [make_task_mock(exception_dates=[date(2026, 2, 1)])]
+    task_repo.get_skipped_on.return_value = skipped
+
+    result = await task_service.get_tasks_skipped_on(user_id, date(2026, 2, 1))
+
+    assert result == skipped
+    task_repo.get_skipped_on.assert_awaited_once_with(date(2026, 2, 1), user_id=user_id)
+
+
 @pytest.mark.asyncio
 async def test_generate_occurrences_no_rule(task_service, task_repo):
     task_id = uuid.uuid4()
@@ -506,7 +632,8 @@ async def test_complete_task_marks_done_without_tracker(task_service, task_repo)
     result = await task_service.complete_task(task_id, user_id, data)
 
     assert result == updated
-    task_repo.update.assert_awaited_once_with(task, {"status": "done"})
+    task_repo.update.assert_awaited_once_with(task, {"status": "done"}, commit=False)
+    task_repo.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -524,19 +651,20 @@ async def test_complete_task_with_tracker_creates_activity_and_link(
         scheduled_end_time=time(15, 0),
         description="Original notes",
     )
-    refreshed = make_task_mock(id=task_id, status="done")
+    updated = make_task_mock(id=task_id, status="done")
     activity = MagicMock(id=uuid.uuid4())
     task_activity = MagicMock(id=uuid.uuid4(), task_id=task_id, activity_id=activity.id)
-    task_repo.get_by_id_and_user.side_effect = [task, refreshed]
-    task_repo.update.return_value = make_task_mock(id=task_id, status="done")
+    task_repo.get_by_id_and_user.return_value = task
+    task_repo.update.return_value = updated
     activity_service.create_activity.return_value = activity
     task_activity_repo.create.return_value = task_activity
     data = TaskCompleteRequest(add_to_tracker=True)
 
     result = await task_service.complete_task(task_id, user_id, data)
 
-    assert result == refreshed
-    task_repo.update.assert_awaited_once_with(task, {"status": "done"})
+    assert result == updated
+    task_repo.get_by_id_and_user.assert_awaited_once_with(task_id, user_id)
+    task_repo.update.assert_awaited_once_with(task, {"status": "done"}, commit=False)
     activity_service.create_activity.assert_awaited_once()
     call_args = activity_service.create_activity.await_args.args
     activity_data = call_args[0]
@@ -546,10 +674,13 @@ async def test_complete_task_with_tracker_creates_activity_and_link(
     assert activity_data.end_time == time(15, 0)
     assert activity_data.notes == "Original notes"
     assert call_args[1] == user_id
+    assert activity_service.create_activity.await_args.kwargs == {"commit": False}
     task_activity_repo.create.assert_awaited_once_with(
-        task_id=task_id,
+        task=updated,
         activity_id=activity.id,
+        commit=False,
     )
+    task_repo.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -566,6 +697,9 @@ async def test_complete_task_add_to_tracker_raises_when_category_missing(
     with pytest.raises(BadRequestError):
         await task_service.complete_task(task_id, user_id, data)
 
+    task_repo.update.assert_not_awaited()
+    task_repo.commit.assert_not_awaited()
+
 
 @pytest.mark.asyncio
 async def test_complete_task_add_to_tracker_raises_when_date_or_time_missing(
@@ -587,6 +721,9 @@ async def test_complete_task_add_to_tracker_raises_when_date_or_time_missing(
     with pytest.raises(BadRequestError):
         await task_service.complete_task(task_id, user_id, data)
 
+    task_repo.update.assert_not_awaited()
+    task_repo.commit.assert_not_awaited()
+
 
 @pytest.mark.asyncio
 async def test_convert_task_to_activity_uses_data_category_id_when_provided(
@@ -614,7 +751,11 @@ async def test_convert_task_to_activity_uses_data_category_id_when_provided(
     activity_service.create_activity.assert_awaited_once()
     activity_data = activity_service.create_activity.await_args.args[0]
     assert activity_data.category_id == provided_category_id
-    task_repo.update.assert_awaited_once_with(task, {"status": "done"})
+    task_repo.update.assert_awaited_once_with(task, {"status": "done"}, commit=False)
+    task_activity_repo.create.assert_awaited_once_with(
+        task=task, activity_id=activity.id, commit=False
+    )
+    task_repo.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -686,7 +827,7 @@ async def test_convert_task_to_activity_auto_marks_done_when_not_done(
 
     await task_service.convert_task_to_activity(task_id, user_id, data)
 
-    task_repo.update.assert_awaited_once_with(task, {"status": "done"})
+    task_repo.update.assert_awaited_once_with(task, {"status": "done"}, commit=False)
 
 
 @pytest.mark.asyncio
@@ -25,6 +25,7 @@ def mock_db():
     db.add = MagicMock()
     db.commit = AsyncMock()
     db.refresh = AsyncMock()
+    db.info = {}
     return db
 
 
@@ -80,6 +81,7 @@ async def test_start_timer_creates_activity(mock_db, mock_user):
     mock_db.execute.side_effect = [
         mock_query_result(None),
         mock_query_result(category),
+        MagicMock(),
     ]
 
     async def refresh_side_effect(activity):
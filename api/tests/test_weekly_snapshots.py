@@ -0,0 +1,111 @@
+"""Weekly comparison snapshots against Postgres, where the invalidation
+trigger runs; needs TEST_DATABASE_URL (see query_budget)."""
+
+from datetime import date, time
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.activity import Activity, Category, Group
+from app.models.insights import WeeklyComparisonSnapshot
+from app.repositories.insights_repository import InsightsRepository
+from app.repositories.weekly_snapshot_repository import WeeklySnapshotRepository
+from app.services.insights_service import WEEKLY_SNAPSHOT_FORMAT, InsightsService
+from tests.query_budget import query_budget
+
+API = settings.API_V1_STR
+
+
+async def snapshot_weeks(db_session) -> list[str]:
+    result = await db_session.execute(
+        select(WeeklyComparisonSnapshot.week_start).order_by(
+            WeeklyComparisonSnapshot.week_start
+        )
+    )
+    return [week.isoformat() for week in result.scalars().all()]
+
+
+async def log_activity(db_session, user, category, day: date) -> Activity:
+    activity = Activity(
+        user_id=user.id,
+        category_id=category.id,
+        date=day,
+        start_time=time(9, 0),
+        end_time=time(10, 0),
+    )
+    db_session.add(activity)
+    await db_session.commit()
+    return activity
+
+
+async def create_category(db_session, user) -> Category:
+    group = Group(user_id=user.id, name="Work")
+    db_session.add(group)
+    await db_session.flush()
+    category = Category(user_id=user.id, group_id=group.id, name="Deep work")
+    db_session.add(category)
+    await db_session.commit()
+    return category
+
+
+async def get_week(api_client, day: str) -> dict:
+    response = await api_client.get(
+        f"{API}/insights/weekly-comparison", params={"date": day}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@query_budget(2)
+async def test_ended_week_is_served_from_its_snapshot(api_client, db_session, api_user):
+    payload = await InsightsService(
+        InsightsRepository(db_session)
+    ).get_weekly_comparison(api_user.id, date(2026, 3, 4))
+    await WeeklySnapshotRepository(db_session).save(
+        api_user.id,
+        date(2026, 3, 2),
+        WEEKLY_SNAPSHOT_FORMAT,
+        {**payload, "total_minutes": 42},
+        api_user.change_version,
+    )
+
+    week = await get_week(api_client, "2026-03-04")
+
+    assert week["totalMinutes"] == 42
+
+
+async def test_activity_writes_delete_their_week_and_the_next(
+    api_client, db_session, api_user
+):
+    category = await create_category(db_session, api_user)
+    await log_activity(db_session, api_user, category, date(2026, 3, 3))
+    for day in ("2026-03-04", "2026-03-11", "2026-03-25"):
+        await get_week(api_client, day)
+    assert await snapshot_weeks(db_session) == [
+        "2026-03-02",
+        "2026-03-09",
+        "2026-03-23",
+    ]
+
+    # Back-dated into the week of Mar 2, which the week of Mar 9 compares to.
+    await log_activity(db_session, api_user, category, date(2026, 3, 5))
+
+    assert await snapshot_weeks(db_session) == ["2026-03-23"]
+    week = await get_week(api_client, "2026-03-04")
+    assert week["totalMinutes"] == 120
+    assert (await get_week(api_client, "2026-03-11"))["previousTotalMinutes"] == 120
+
+
+async def test_snapshot_is_not_saved_when_data_changed_since(db_session, api_user):
+    repo = WeeklySnapshotRepository(db_session)
+
+    saved = await repo.save(
+        api_user.id,
+        date(2026, 3, 2),
+        WEEKLY_SNAPSHOT_FORMAT,
+        {},
+        api_user.change_version - 1,
+    )
+
+    assert saved is False
+    assert await snapshot_weeks(db_session) == []
@@ -28,6 +28,9 @@ export const TaskListSchema = z.object({
   icon: z.string().nullable().optional(),
   position: z.number(),
   taskCount: z.number().default(0),
+  todoCount: z.number().default(0),
+  inProgressCount: z.number().default(0),
+  doneCount: z.number().default(0),
   createdAt: z.string().datetime(),
   updatedAt: z.string().datetime(),
 })
@@ -106,6 +109,17 @@ export const TaskActivitySchema = z.object({
   createdAt: z.string().datetime(),
 })
 
+export const ReorderSchema = z.object({
+  moves: z
+    .array(
+      z.object({
+        id: z.string().uuid(),
+        position: z.number(),
+      }),
+    )
+    .min(1),
+})
+
 export type TaskList = z.infer<typeof TaskListSchema>
 export type CreateTaskList = z.infer<typeof CreateTaskListSchema>
 export type UpdateTaskList = z.infer<typeof UpdateTaskListSchema>
@@ -115,3 +129,4 @@ export type UpdateTask = z.infer<typeof UpdateTaskSchema>
 export type TaskComplete = z.infer<typeof TaskCompleteSchema>
 export type ConvertToActivity = z.infer<typeof ConvertToActivitySchema>
 export type TaskActivity = z.infer<typeof TaskActivitySchema>
+export type Reorder = z.infer<typeof ReorderSchema>
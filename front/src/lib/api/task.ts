@@ -11,6 +11,7 @@ import {
   TaskCompleteSchema,
   ConvertToActivitySchema,
   TaskActivitySchema,
+  ReorderSchema,
   type TaskList,
   type CreateTaskList,
   type UpdateTaskList,
@@ -20,6 +21,7 @@ import {
   type TaskComplete,
   type ConvertToActivity,
   type TaskActivity,
+  type Reorder,
 } from './schemas/task'
 
 export const taskListApi = {
@@ -40,6 +42,11 @@ export const taskListApi = {
   async delete(id: string): Promise<void> {
     await api.delete(`api/v1/task-lists/${id}`)
   },
+
+  async reorder(data: Reorder): Promise<void> {
+    const validated = ReorderSchema.parse(data)
+    await api.post('api/v1/task-lists/reorder', { json: validated })
+  },
 }
 
 export const taskApi = {
@@ -68,6 +75,11 @@ export const taskApi = {
     await api.delete(`api/v1/tasks/${id}`)
   },
 
+  async reorder(data: Reorder): Promise<void> {
+    const validated = ReorderSchema.parse(data)
+    await api.post('api/v1/tasks/reorder', { json: validated })
+  },
+
   async complete(id: string, data: TaskComplete): Promise<Task> {
     const validated = TaskCompleteSchema.parse(data)
     return fetcher(api.post(`api/v1/tasks/${id}/complete`, { json: validated }), TaskSchema)
@@ -96,4 +108,11 @@ export const taskApi = {
       z.object({ createdCount: z.number(), recurringTasksChecked: z.number() }),
     )
   },
+
+  async createCalendarToken(): Promise<{ token: string; feedPath: string }> {
+    return fetcher(
+      api.post('api/v1/tasks/calendar-token'),
+      z.object({ token: z.string(), feedPath: z.string() }),
+    )
+  },
 }